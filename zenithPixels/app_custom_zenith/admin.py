@@ -1,7 +1,26 @@
 from django.contrib import admin
-from .models import PostCategory, DevlogPost, PostLike, PostComment
+from .models import PostCategory, DevlogPost, PostLike, PostComment, BackgroundTask, StudioMember, Game, LoreProgress
 
 admin.site.register(PostCategory)
 admin.site.register(DevlogPost)
 admin.site.register(PostLike)
-admin.site.register(PostComment)
\ No newline at end of file
+admin.site.register(PostComment)
+admin.site.register(BackgroundTask)
+admin.site.register(StudioMember)
+admin.site.register(LoreProgress)
+
+
+@admin.register(Game)
+class GameAdmin(admin.ModelAdmin):
+    list_display = ('title', 'slug', 'position', 'is_active')
+    prepopulated_fields = {'slug': ('title',)}
+
+    def get_readonly_fields(self, request, obj=None):
+        # As páginas dos jogos (chama_espiral_page, lilith_view) buscam pelo
+        # slug fixo; renomear um jogo existente não pode quebrar a rota
+        if obj is not None:
+            return ('slug',)
+        return ()
+
+    def get_prepopulated_fields(self, request, obj=None):
+        return {} if obj is not None else self.prepopulated_fields
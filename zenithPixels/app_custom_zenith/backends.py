@@ -0,0 +1,101 @@
+# app_custom_zenith/backends.py
+import time
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+
+from .invalidation import USERS, invalidation_bus
+from .models import CustomUser
+
+USER_CACHE_VERSION_KEY = 'auth:user:version'
+
+# Com LocMem cada worker tem o seu cache de usuários: apagar a entrada só
+# vale para o worker atual, então as mudanças passam pelo barramento
+_local_cache = isinstance(caches['default'], LocMemCache)
+
+
+def get_user_cache_version():
+    """Versão das entradas de usuário; trocá-la descarta todas de uma vez"""
+    version = cache.get(USER_CACHE_VERSION_KEY)
+    if version is None:
+        cache.add(USER_CACHE_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(USER_CACHE_VERSION_KEY)
+    return version
+
+
+def bump_user_cache_version():
+    try:
+        return cache.incr(USER_CACHE_VERSION_KEY)
+    except ValueError:
+        get_user_cache_version()
+        return cache.incr(USER_CACHE_VERSION_KEY)
+
+
+def user_cache_key(user_id):
+    return f'auth:user:{get_user_cache_version()}:{user_id}'
+
+
+# Campos que mudam quem consegue se autenticar (ou com que permissões)
+AUTH_FIELDS = ('password', 'is_active', 'is_staff', 'is_superuser')
+
+
+def auth_fields_changed(user, update_fields=None):
+    """
+    Indica se o save do usuário altera algum de AUTH_FIELDS. Com
+    update_fields basta olhar os nomes; num save completo compara com o
+    banco (uma consulta pequena, só em edições de conta).
+    """
+    if user._state.adding:
+        return False
+    if update_fields is not None:
+        return not set(update_fields).isdisjoint(AUTH_FIELDS)
+    stored = CustomUser._default_manager.filter(pk=user.pk).values_list(*AUTH_FIELDS).first()
+    return stored != tuple(getattr(user, field) for field in AUTH_FIELDS)
+
+
+def invalidate_cached_user(user_id, propagate=False):
+    """
+    Remove do cache o usuário (e o perfil carregado junto com ele). Com
+    cache local, e se propagate for verdadeiro, avisa os outros workers pelo
+    barramento de invalidação: eles descartam os usuários em cache no
+    próximo check(), então senha trocada ou conta desativada param de
+    autenticar em no máximo INVALIDATION_CHECK_INTERVAL segundos. Só vale
+    propagar mudanças de AUTH_FIELDS e remoções: cada aviso descarta todos
+    os usuários em cache de todos os workers. Nos outros casos (nome,
+    perfil, tema) os demais workers veem a mudança quando a entrada expira
+    (USER_CACHE_TIMEOUT).
+    """
+    cache.delete(user_cache_key(user_id))
+    if propagate and _local_cache:
+        invalidation_bus.bump(USERS)
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend que serve o usuário autenticado a partir do cache.
+
+    O CustomUser é carregado com select_related('profile'), então
+    request.user.profile também vem do cache e não custa outra consulta.
+    A entrada é invalidada pelos signals de CustomUser e UserProfile.
+    """
+
+    def get_user(self, user_id):
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+
+        if user is None:
+            if _local_cache:
+                invalidation_bus.start()
+            try:
+                user = CustomUser._default_manager.select_related('profile').get(pk=user_id)
+            except CustomUser.DoesNotExist:
+                return None
+            cache.set(key, user, getattr(settings, 'USER_CACHE_TIMEOUT', 300))
+
+        return user if self.user_can_authenticate(user) else None
+
+
+if _local_cache:
+    invalidation_bus.subscribe(USERS, bump_user_cache_version)
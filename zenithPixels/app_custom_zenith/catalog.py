@@ -0,0 +1,70 @@
+# app_custom_zenith/catalog.py
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+from .invalidation import CATALOG, invalidation_bus
+from .models import Game, StudioMember
+
+CATALOG_VERSION_KEY = 'catalog:version'
+
+
+def get_catalog_version():
+    """
+    Versão atual da equipe e dos jogos. Os fragmentos da home e das
+    páginas dos jogos usam esta versão na chave do {% cache %}.
+    """
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOG_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(CATALOG_VERSION_KEY)
+    return version
+
+
+def bump_catalog_version():
+    """Invalida todos os fragmentos do catálogo de uma vez"""
+    try:
+        return cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        get_catalog_version()
+        return cache.incr(CATALOG_VERSION_KEY)
+
+
+def bump_catalog_version_on_commit():
+    transaction.on_commit(bump_catalog_version)
+
+
+def catalog_cache_timeout():
+    return getattr(settings, 'CATALOG_CACHE_TIMEOUT', 24 * 60 * 60)
+
+
+def catalog_context():
+    """
+    Contexto dos fragmentos do catálogo. Os querysets são preguiçosos: só
+    consultam o banco quando o fragmento não está no cache, então uma home
+    com o cache quente custa a leitura da versão e um get por fragmento.
+    """
+    return {
+        'catalog_version': get_catalog_version(),
+        'catalog_timeout': catalog_cache_timeout(),
+        'team_members': StudioMember.objects.filter(is_active=True),
+        'games': Game.objects.filter(is_active=True),
+    }
+
+
+def get_game(slug):
+    """Jogo ativo pelo slug, guardado no cache até a próxima mudança do catálogo"""
+    return cache.get_or_set(
+        f'catalog:{get_catalog_version()}:game:{slug}',
+        lambda: Game.objects.filter(slug=slug, is_active=True).first(),
+        catalog_cache_timeout()
+    )
+
+
+# Mesmo esquema do feedcache: com LocMem cada worker tem a sua versão e o
+# barramento de invalidação propaga as mudanças feitas em outros workers
+if isinstance(caches['default'], LocMemCache):
+    invalidation_bus.subscribe(CATALOG, bump_catalog_version)
@@ -0,0 +1,59 @@
+# app_custom_zenith/categories.py
+import threading
+from typing import NamedTuple
+
+from django.db.models import Count, Q
+
+from .invalidation import DEVLOG, invalidation_bus
+from .models import DevlogPost, PostCategory
+
+
+class CategoryInfo(NamedTuple):
+    id: int
+    slug: str
+    name: str
+    color: str
+    description: str
+    post_count: int
+
+
+class CategoryRegistry:
+    """
+    Categorias ativas (com a contagem de posts publicados) carregadas em
+    memória com uma única consulta e reutilizadas até que o namespace
+    "devlog" do barramento de invalidação mude (signals de PostCategory e
+    DevlogPost, neste ou em outro worker).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._categories = None
+
+    def _load(self):
+        published = Q(posts__status=DevlogPost.Status.PUBLISHED)
+        rows = PostCategory.objects.filter(is_active=True).annotate(
+            post_count=Count('posts', filter=published)
+        ).order_by('name').values_list('id', 'slug', 'name', 'color', 'description', 'post_count')
+        return [CategoryInfo(*row) for row in rows]
+
+    def all(self):
+        categories = self._categories
+        if categories is None:
+            with self._lock:
+                # Outra thread pode ter carregado enquanto esperávamos
+                if self._categories is None:
+                    invalidation_bus.start()
+                    self._categories = self._load()
+                categories = self._categories
+        return categories
+
+    def choices(self):
+        """Opções (id, nome) para campos de formulário"""
+        return [(category.id, category.name) for category in self.all()]
+
+    def invalidate(self):
+        self._categories = None
+
+
+category_registry = CategoryRegistry()
+invalidation_bus.subscribe(DEVLOG, category_registry.invalidate)
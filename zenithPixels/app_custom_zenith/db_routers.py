@@ -0,0 +1,103 @@
+# app_custom_zenith/db_routers.py
+import random
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Cookie que mantém o usuário no primário logo após uma escrita
+PRIMARY_PIN_COOKIE = 'zp_primary_pin'
+
+# Estado por requisição: None fora das views de leitura
+_replica_state = ContextVar('replica_state', default=None)
+
+
+class ReplicaState:
+    """Estado de roteamento de uma requisição servida a partir das réplicas"""
+
+    def __init__(self):
+        self.written_models = set()
+
+
+def read_from_replica(view_func):
+    """
+    Decorator para views de leitura: as consultas feitas durante a view vão
+    para as réplicas, exceto se o usuário escreveu algo recentemente
+    (cookie PRIMARY_PIN_COOKIE), garantindo read-your-writes.
+
+    O estado vale só enquanto a view executa: um queryset consumido depois
+    do retorno (ex.: dentro de uma StreamingHttpResponse) iria para o
+    primário; fixe-o antes com pin_to_current_db.
+    """
+    if iscoroutinefunction(view_func):
+        async def _wrapped_view(request, *args, **kwargs):
+            if PRIMARY_PIN_COOKIE in request.COOKIES:
+                return await view_func(request, *args, **kwargs)
+
+            token = _replica_state.set(ReplicaState())
+            try:
+                return await view_func(request, *args, **kwargs)
+            finally:
+                _replica_state.reset(token)
+
+        return wraps(view_func)(markcoroutinefunction(_wrapped_view))
+
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        if PRIMARY_PIN_COOKIE in request.COOKIES:
+            return view_func(request, *args, **kwargs)
+
+        token = _replica_state.set(ReplicaState())
+        try:
+            return view_func(request, *args, **kwargs)
+        finally:
+            _replica_state.reset(token)
+
+    return _wrapped_view
+
+
+def pin_to_current_db(queryset):
+    """
+    Fixa o queryset no banco escolhido agora pelo roteador. Necessário para
+    querysets avaliados após o retorno da view, quando o estado de
+    @read_from_replica já foi descartado.
+    """
+    return queryset.using(queryset.db)
+
+
+class PrimaryReplicaRouter:
+    """
+    Envia leituras para as réplicas listadas em DATABASE_REPLICAS quando a
+    view foi marcada com @read_from_replica; escritas, blocos
+    transaction.atomic e tudo o mais vão para o primário.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _replica_state.get()
+        replicas = getattr(settings, 'DATABASE_REPLICAS', [])
+
+        if state is None or not replicas:
+            return DEFAULT_DB_ALIAS
+
+        # Dentro de uma transação a leitura precisa ver as próprias escritas
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+
+        # Modelo escrito nesta requisição (ex.: view_count) é lido do primário
+        if model._meta.label in state.written_models:
+            return DEFAULT_DB_ALIAS
+
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        state = _replica_state.get()
+        if state is not None:
+            state.written_models.add(model._meta.label)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Primário e réplicas têm os mesmos dados
+        return True
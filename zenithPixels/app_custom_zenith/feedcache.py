@@ -0,0 +1,60 @@
+# app_custom_zenith/feedcache.py
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+from .invalidation import DEVLOG, invalidation_bus
+
+FEED_VERSION_KEY = 'feed:version'
+
+
+def get_feed_version():
+    """
+    Versão atual do conteúdo publicado. Todas as chaves de cache da
+    listagem do devlog, páginas de categoria e feeds incluem esta versão.
+    """
+    version = cache.get(FEED_VERSION_KEY)
+    if version is None:
+        # Começa de um valor novo para não reaproveitar entradas antigas se a
+        # chave tiver sido descartada pelo cache; add() não sobrescreve a
+        # versão que outro worker acabou de gravar
+        cache.add(FEED_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(FEED_VERSION_KEY)
+    return version
+
+
+def bump_feed_version():
+    """
+    Invalida de uma vez todo o cache derivado dos posts publicados. As
+    entradas antigas não são apagadas, apenas deixam de ser lidas e expiram
+    sozinhas.
+    """
+    try:
+        return cache.incr(FEED_VERSION_KEY)
+    except ValueError:
+        get_feed_version()
+        return cache.incr(FEED_VERSION_KEY)
+
+
+def bump_feed_version_on_commit():
+    transaction.on_commit(bump_feed_version)
+
+
+def feed_cache_key(name, *parts):
+    """Chave de cache versionada, ex.: feed_cache_key('devlog-page', 'patch', 2)"""
+    suffix = ':'.join(str(part) for part in parts)
+    return f'feed:{get_feed_version()}:{name}:{suffix}'
+
+
+def feed_cache_timeout():
+    return getattr(settings, 'FEED_CACHE_TIMEOUT', 60 * 60)
+
+
+# Com cache local (LocMem) a versão do feed existe em cada worker: as
+# mudanças vistas no barramento de invalidação incrementam a cópia local.
+# Com um cache compartilhado (Redis) o incremento do signal já vale para todos.
+if isinstance(caches['default'], LocMemCache):
+    invalidation_bus.subscribe(DEVLOG, bump_feed_version)
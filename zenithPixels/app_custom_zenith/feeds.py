@@ -0,0 +1,188 @@
+# app_custom_zenith/feeds.py
+import json
+
+from django.conf import settings
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.db.models import TextField, Value
+from django.db.models.functions import Coalesce, Left, NullIf
+from django.http import Http404, HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.cache import patch_cache_control
+from django.utils.feedgenerator import Atom1Feed, Rss201rev2Feed
+from django.utils.http import http_date
+from django.utils.text import Truncator
+from django.views.decorators.http import condition, require_GET
+
+from .db_routers import read_from_replica
+from .feedcache import feed_cache_key, feed_cache_timeout, get_feed_version
+from .models import DevlogPost, PostCategory
+
+# Tamanho máximo do resumo de cada item
+SUMMARY_LENGTH = 400
+
+
+def feed_posts(category=None):
+    """
+    Posts publicados de um feed em uma única consulta, trazendo só as
+    colunas usadas. O resumo é o excerpt ou, se vazio, o começo do
+    conteúdo cortado no próprio banco.
+    """
+    posts = DevlogPost.objects.filter(
+        status=DevlogPost.Status.PUBLISHED
+    ).select_related('category', 'author').only(
+        'title', 'slug', 'published_at', 'updated_at',
+        'category__name', 'category__slug',
+        'author__first_name', 'author__last_name',
+    ).annotate(
+        summary=Coalesce(
+            NullIf('excerpt', Value('')),
+            Left('content', SUMMARY_LENGTH),
+            output_field=TextField()
+        )
+    ).order_by('-published_at')
+
+    if category is not None:
+        posts = posts.filter(category=category)
+    return posts[:getattr(settings, 'FEED_MAX_ITEMS', 30)]
+
+
+def feed_summary(post):
+    return Truncator(post.summary or '').chars(SUMMARY_LENGTH)
+
+
+class DevlogRssFeed(Feed):
+    feed_type = Rss201rev2Feed
+    language = 'pt-br'
+
+    def get_object(self, request, category_slug=None):
+        if category_slug is None:
+            return None
+        return get_object_or_404(PostCategory, slug=category_slug, is_active=True)
+
+    def title(self, obj):
+        if obj is None:
+            return 'ZenithPixels - Notícias & Devlog'
+        return f'ZenithPixels - {obj.name}'
+
+    def link(self, obj):
+        return obj.get_absolute_url() if obj is not None else reverse('devlog')
+
+    def description(self, obj):
+        if obj is not None and obj.description:
+            return obj.description
+        return 'Patches, devlogs e notícias dos jogos da ZenithPixels.'
+
+    def items(self, obj):
+        return feed_posts(obj)
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return feed_summary(item)
+
+    def item_pubdate(self, item):
+        return item.published_at
+
+    def item_updateddate(self, item):
+        return item.updated_at
+
+    def item_author_name(self, item):
+        return item.author.get_full_name()
+
+    def item_categories(self, item):
+        return [item.category.name]
+
+
+class DevlogAtomFeed(DevlogRssFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
+
+
+def json_feed(request, category_slug=None):
+    """Feed no formato JSON Feed 1.1 (https://jsonfeed.org/version/1.1)"""
+    feed = DevlogRssFeed()
+    category = feed.get_object(request, category_slug)
+    posts = list(feed_posts(category))
+
+    data = {
+        'version': 'https://jsonfeed.org/version/1.1',
+        'title': feed.title(category),
+        'home_page_url': request.build_absolute_uri(feed.link(category)),
+        'feed_url': request.build_absolute_uri(),
+        'description': feed.description(category),
+        'language': feed.language,
+        'items': [
+            {
+                'id': str(post.pk),
+                'url': request.build_absolute_uri(post.get_absolute_url()),
+                'title': post.title,
+                'summary': feed_summary(post),
+                'content_text': feed_summary(post),
+                'date_published': post.published_at.isoformat(),
+                'date_modified': post.updated_at.isoformat(),
+                'authors': [{'name': post.author.get_full_name()}],
+                'tags': [post.category.name],
+            }
+            for post in posts
+        ],
+    }
+
+    response = HttpResponse(
+        json.dumps(data, ensure_ascii=False),
+        content_type='application/feed+json; charset=utf-8'
+    )
+    if posts:
+        response['Last-Modified'] = http_date(max(post.updated_at for post in posts).timestamp())
+    return response
+
+
+FEED_BUILDERS = {
+    'rss': DevlogRssFeed(),
+    'atom': DevlogAtomFeed(),
+    'json': json_feed,
+}
+
+
+def feed_etag(request, feed_format, category_slug=None):
+    """
+    ETag derivado só da versão do feed: um leitor que repete a requisição
+    recebe 304 sem consulta ao banco nem renderização
+    """
+    if feed_format not in FEED_BUILDERS:
+        return None
+    return f'{get_feed_version()}-{feed_format}-{category_slug or "all"}'
+
+
+@require_GET
+@read_from_replica
+@condition(etag_func=feed_etag)
+def devlog_feed(request, feed_format, category_slug=None):
+    """
+    RSS, Atom ou JSON Feed dos posts publicados (geral ou por categoria).
+    O corpo fica em cache até a próxima publicação/edição.
+    """
+    if feed_format not in FEED_BUILDERS:
+        raise Http404('Formato de feed desconhecido')
+
+    # Os links do corpo são absolutos (esquema e host da requisição): cada
+    # host tem a sua entrada, e um Host forjado não contamina a do site
+    key = feed_cache_key(
+        'syndication', feed_format, category_slug or 'all', request.scheme, request.get_host()
+    )
+    cached = cache.get(key)
+    if cached is None:
+        generated = FEED_BUILDERS[feed_format](request, category_slug=category_slug)
+        cached = (generated.content, generated['Content-Type'], generated.get('Last-Modified'))
+        cache.set(key, cached, feed_cache_timeout())
+
+    content, content_type, last_modified = cached
+    response = HttpResponse(content, content_type=content_type)
+    if last_modified:
+        response['Last-Modified'] = last_modified
+    patch_cache_control(response, public=True, max_age=getattr(settings, 'FEED_MAX_AGE', 300))
+    return response
@@ -0,0 +1,320 @@
+# app_custom_zenith/fileserving.py
+import mimetypes
+import os
+import posixpath
+import re
+import threading
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified
+from django.urls import re_path
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+# Variantes pré-comprimidas procuradas ao lado do arquivo, na ordem de preferência
+PRECOMPRESSED = (('br', '.br'), ('gzip', '.gz'))
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+# Tipos de mídia enviada por usuários exibidos no navegador. Todo o resto
+# (HTML, SVG, etc.) sai como download em sandbox: um upload não pode rodar
+# scripts na origem do site
+INLINE_MEDIA_TYPES = frozenset({
+    'image/avif', 'image/bmp', 'image/gif', 'image/jpeg', 'image/png', 'image/webp',
+})
+
+
+class FileEntry:
+    __slots__ = ('path', 'size', 'mtime', 'etag', 'content_type', 'variants', 'attachment')
+
+    def __init__(self, path, stat, content_type, variants, attachment=False):
+        self.path = path
+        self.size = stat.st_size
+        self.mtime = int(stat.st_mtime)
+        self.etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        self.content_type = content_type
+        self.variants = variants
+        self.attachment = attachment
+
+
+class FileIndex:
+    """
+    Índice em memória dos arquivos de um diretório (mídia ou estáticos):
+    caminho absoluto, tamanho, ETag, tipo e variantes pré-comprimidas.
+
+    Evita resolver o caminho e adivinhar o tipo a cada requisição. Arquivos
+    novos (uploads) entram no índice no primeiro acesso; arquivos alterados
+    ou removidos são detectados pelo fstat do arquivo aberto. Com
+    inline_types, arquivos de outros tipos são servidos como download
+    (application/octet-stream).
+    """
+
+    def __init__(self, name, root, inline_types=None):
+        self.name = name
+        self.root = os.path.realpath(root) if root else None
+        self.inline_types = inline_types
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._scanned = False
+
+    def scan(self):
+        """Indexa o diretório inteiro (estáticos não mudam depois do deploy)"""
+        if self.root is None or not os.path.isdir(self.root):
+            return 0
+        entries = {}
+        for directory, _, files in os.walk(self.root):
+            names = set(files)
+            for filename in files:
+                if any(filename.endswith(suffix) for _, suffix in PRECOMPRESSED):
+                    continue
+                full_path = os.path.join(directory, filename)
+                relative = os.path.relpath(full_path, self.root).replace(os.sep, '/')
+                entries[relative] = self._entry(full_path, names=names)
+        with self._lock:
+            self._entries = entries
+            self._scanned = True
+        return len(entries)
+
+    def ensure_scanned(self):
+        if not self._scanned:
+            self.scan()
+
+    def _entry(self, full_path, names=None):
+        variants = {}
+        for encoding, suffix in PRECOMPRESSED:
+            variant = full_path + suffix
+            exists = (os.path.basename(variant) in names) if names is not None else os.path.isfile(variant)
+            if exists:
+                variants[encoding] = (variant, os.stat(variant).st_size)
+        content_type, _ = mimetypes.guess_type(full_path)
+        attachment = self.inline_types is not None and content_type not in self.inline_types
+        if attachment or content_type is None:
+            content_type = 'application/octet-stream'
+        return FileEntry(full_path, os.stat(full_path), content_type, variants, attachment)
+
+    def lookup(self, relative):
+        entry = self._entries.get(relative)
+        if entry is not None:
+            return entry
+
+        # Só caminhos normalizados dentro da raiz chegam ao disco
+        if self.root is None or relative != posixpath.normpath(relative) or relative.startswith(('/', '..')):
+            return None
+        full_path = os.path.realpath(os.path.join(self.root, relative))
+        if not full_path.startswith(self.root + os.sep) or not os.path.isfile(full_path):
+            return None
+        entry = self._entry(full_path)
+        with self._lock:
+            self._entries[relative] = entry
+        return entry
+
+    def refresh(self, relative, stat):
+        """Atualiza a entrada se o arquivo aberto não bate mais com o índice"""
+        entry = self._entries.get(relative)
+        if entry is not None and (entry.size != stat.st_size or entry.mtime != int(stat.st_mtime)):
+            entry = self._entry(entry.path)
+            with self._lock:
+                self._entries[relative] = entry
+        return entry
+
+    def forget(self, relative):
+        with self._lock:
+            self._entries.pop(relative, None)
+
+
+class FileRange:
+    """
+    Trecho de um arquivo aberto. O descritor fica posicionado no início do
+    trecho, então o wsgi.file_wrapper do gunicorn continua usando sendfile
+    (limitado pelo Content-Length); os demais servidores leem pelo read().
+    """
+
+    def __init__(self, file, start, length):
+        file.seek(start)
+        self.file = file
+        self.remaining = length
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def parse_range(header, size):
+    """
+    Intervalo (início, fim inclusivo) de um cabeçalho Range com um único
+    intervalo. Retorna None para cabeçalhos que devem ser ignorados
+    (resposta completa) e False para intervalos impossíveis (416).
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        # Múltiplos intervalos ou unidade desconhecida: resposta completa
+        return None
+    first, last = match.groups()
+    if not first:
+        if not last or int(last) == 0:
+            return False
+        return max(size - int(last), 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or (last and int(last) < start):
+        return False
+    return start, end
+
+
+def _not_modified(request, entry):
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+        return entry.etag in tags or '*' in tags
+    since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+    return since is not None and entry.mtime <= since
+
+
+def _select_variant(request, entry):
+    accept = request.META.get('HTTP_ACCEPT_ENCODING', '')
+    for encoding, _ in PRECOMPRESSED:
+        if encoding in entry.variants and re.search(rf'\b{encoding}\b', accept):
+            return encoding, entry.variants[encoding]
+    return None, (entry.path, entry.size)
+
+
+def _set_cache_headers(response, entry, max_age):
+    response['ETag'] = entry.etag
+    response['Last-Modified'] = http_date(entry.mtime)
+    response['Accept-Ranges'] = 'bytes'
+    patch_cache_control(response, public=True, max_age=max_age)
+    if entry.variants:
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+
+def _protect_download(response, entry):
+    if entry.attachment:
+        # Mesmo aberto direto, o documento não roda scripts nem tem a origem do site
+        response['Content-Security-Policy'] = 'sandbox'
+        response['X-Content-Type-Options'] = 'nosniff'
+    return response
+
+
+def serve_file(request, index, relative, max_age):
+    """
+    Resposta para um arquivo do índice. Em MEDIA_SERVE_MODE 'x-accel' ou
+    'x-sendfile' só os cabeçalhos saem do Django e o servidor da frente
+    (nginx/Apache) transfere o arquivo, com ranges e compressão próprios.
+    """
+    entry = index.lookup(relative)
+    if entry is None:
+        raise Http404('Arquivo não encontrado')
+
+    mode = getattr(settings, 'MEDIA_SERVE_MODE', 'django')
+    if mode == 'x-accel':
+        prefix = getattr(settings, 'MEDIA_ACCEL_PREFIX', '/_protected/')
+        response = HttpResponse(content_type=entry.content_type)
+        response['X-Accel-Redirect'] = quote(f'{prefix}{index.name}/{relative}')
+        if entry.attachment:
+            response['Content-Disposition'] = 'attachment'
+        return _protect_download(response, entry)
+    if mode == 'x-sendfile':
+        response = HttpResponse(content_type=entry.content_type)
+        response['X-Sendfile'] = entry.path
+        if entry.attachment:
+            response['Content-Disposition'] = 'attachment'
+        return _protect_download(response, entry)
+
+    if _not_modified(request, entry):
+        response = HttpResponseNotModified()
+        _set_cache_headers(response, entry, max_age)
+        return response
+
+    byte_range = None
+    range_header = request.META.get('HTTP_RANGE')
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if range_header and (if_range is None or if_range.strip() == entry.etag):
+        byte_range = parse_range(range_header, entry.size)
+
+    if byte_range is None:
+        encoding, (path, size) = _select_variant(request, entry)
+    else:
+        # Ranges se referem aos bytes do arquivo original
+        encoding, path, size = None, entry.path, entry.size
+
+    try:
+        file = open(path, 'rb')
+    except FileNotFoundError:
+        index.forget(relative)
+        raise Http404('Arquivo não encontrado')
+
+    if encoding is None:
+        current = index.refresh(relative, os.fstat(file.fileno()))
+        if current is not None and current is not entry:
+            # Arquivo substituído desde a indexação: tamanho e ETag novos
+            entry, size = current, current.size
+            if byte_range:
+                byte_range = parse_range(range_header, size)
+
+    if byte_range is False:
+        file.close()
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    if byte_range:
+        start, end = byte_range
+        length = end - start + 1
+        response = FileResponse(
+            FileRange(file, start, length), status=206,
+            content_type=entry.content_type, filename=os.path.basename(entry.path),
+            as_attachment=entry.attachment,
+        )
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    else:
+        length = size
+        response = FileResponse(
+            file, content_type=entry.content_type, filename=os.path.basename(entry.path),
+            as_attachment=entry.attachment,
+        )
+        if encoding:
+            response['Content-Encoding'] = encoding
+
+    response['Content-Length'] = str(length)
+    _set_cache_headers(response, entry, max_age)
+    return _protect_download(response, entry)
+
+
+media_index = FileIndex('media', settings.MEDIA_ROOT, inline_types=INLINE_MEDIA_TYPES)
+static_index = FileIndex('static', getattr(settings, 'STATIC_ROOT', None))
+
+
+@require_safe
+def serve_media(request, path):
+    return serve_file(request, media_index, path, getattr(settings, 'MEDIA_MAX_AGE', 24 * 60 * 60))
+
+
+@require_safe
+def serve_static(request, path):
+    static_index.ensure_scanned()
+    return serve_file(request, static_index, path, getattr(settings, 'STATIC_MAX_AGE', 7 * 24 * 60 * 60))
+
+
+def _prefix_pattern(url):
+    return r'^%s(?P<path>.*)$' % re.escape(url.lstrip('/'))
+
+
+def file_urlpatterns():
+    """Rotas de mídia e estáticos servidas pelo Django (fora do runserver)"""
+    return [
+        re_path(_prefix_pattern(settings.STATIC_URL), serve_static, name='static_file'),
+        re_path(_prefix_pattern(settings.MEDIA_URL), serve_media, name='media_file'),
+    ]
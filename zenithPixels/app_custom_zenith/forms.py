@@ -1,6 +1,8 @@
 from django import forms
 from django.contrib.auth.forms import UserCreationForm
 from .models import CustomUser, DevlogPost, PostCategory, PostComment
+from .registration import find_taken_fields, normalize_telefone, TAKEN_MESSAGES
+from .categories import category_registry
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 import re
@@ -73,21 +75,12 @@ class Etapa1Form(forms.Form):
         }
     )
     
-    def clean_email(self):
-        email = self.cleaned_data['email']
-        if CustomUser.objects.filter(email=email).exists():
-            raise ValidationError(_('Este email já está cadastrado.'))
-        return email
-    
     def clean_telefone(self):
         telefone = self.cleaned_data['telefone']
-        telefone_limpo = re.sub(r'[^\d]', '', telefone)
+        telefone_limpo = normalize_telefone(telefone)
         
         if len(telefone_limpo) < 10 or len(telefone_limpo) > 11:
             raise ValidationError(_('Número de telefone inválido. Digite o DDD + número.'))
-        
-        if CustomUser.objects.filter(telefone=telefone_limpo).exists():
-            raise ValidationError(_('Este telefone já está cadastrado.'))
             
         return telefone_limpo
     
@@ -99,6 +92,19 @@ class Etapa1Form(forms.Form):
             raise ValidationError(_('Você deve ter pelo menos 13 anos para se cadastrar.'))
             
         return data_nascimento
+    
+    def clean(self):
+        cleaned_data = super().clean()
+        
+        # Email e telefone verificados em uma única consulta
+        taken = find_taken_fields(
+            email=cleaned_data.get('email'),
+            telefone=cleaned_data.get('telefone'),
+        )
+        for field in taken:
+            self.add_error(field, TAKEN_MESSAGES[field])
+        
+        return cleaned_data
 
 
 class Etapa2Form(UserCreationForm):
@@ -143,9 +149,13 @@ class Etapa2Form(UserCreationForm):
     
     def clean_username(self):
         username = self.cleaned_data['username']
-        if CustomUser.objects.filter(username=username).exists():
-            raise ValidationError(_('Este nome de usuário já está em uso. Escolha outro.'))
+        if find_taken_fields(username=username):
+            raise ValidationError(TAKEN_MESSAGES['username'])
         return username
+    
+    def validate_unique(self):
+        # A unicidade do username já foi verificada em clean_username
+        pass
 
 
 class DevlogPostForm(forms.ModelForm):
@@ -154,6 +164,19 @@ class DevlogPostForm(forms.ModelForm):
         label='Publicar agora?',
         help_text='Marque esta opção para publicar o post imediatamente.'
     )
+    publish_at = forms.DateTimeField(
+        required=False,
+        label='Agendar para',
+        help_text='Opcional: data e hora futuras em que o post será publicado.',
+        input_formats=['%Y-%m-%dT%H:%M'],
+        widget=forms.DateTimeInput(
+            attrs={
+                'type': 'datetime-local',
+                'class': 'w-full px-3 py-2 text-sm border border-gray-300 dark:border-gray-600 rounded-lg bg-white dark:bg-gray-800 text-gray-900 dark:text-white'
+            },
+            format='%Y-%m-%dT%H:%M'
+        )
+    )
     
     class Meta:
         model = DevlogPost
@@ -165,7 +188,8 @@ class DevlogPostForm(forms.ModelForm):
             'category',
             'featured_image',
             'meta_description',
-            'is_published'
+            'is_published',
+            'publish_at'
         ]
         widgets = {
             'excerpt': forms.Textarea(attrs={'rows': 3}),
@@ -181,10 +205,16 @@ class DevlogPostForm(forms.ModelForm):
         super().__init__(*args, **kwargs)
         # Configuração inicial do campo is_published
         if self.instance and self.instance.pk:
-            self.initial['is_published'] = self.instance.status == DevlogPost.Status.PUBLISHED
+            self.initial['is_published'] = self.instance.status in (
+                DevlogPost.Status.PUBLISHED, DevlogPost.Status.SCHEDULED
+            )
+            if self.instance.is_scheduled:
+                self.initial['publish_at'] = timezone.localtime(self.instance.published_at)
         
-        # Melhorando o queryset da categoria
+        # Opções vindas do registro em memória; o queryset só é consultado
+        # para validar a categoria enviada
         self.fields['category'].queryset = PostCategory.objects.filter(is_active=True)
+        self.fields['category'].choices = [('', '---------')] + category_registry.choices()
         
         # Se desejar gerar o slug automaticamente
         self.fields['slug'].required = False
@@ -205,11 +235,9 @@ class DevlogPostForm(forms.ModelForm):
     def save(self, commit=True):
         instance = super().save(commit=False)
         
-        # Atualiza o status baseado no campo is_published
+        # Atualiza o status baseado no campo is_published (e no agendamento)
         if self.cleaned_data['is_published']:
-            instance.status = DevlogPost.Status.PUBLISHED
-            if not instance.published_at:
-                instance.published_at = timezone.now()
+            instance.schedule_publication(self.cleaned_data.get('publish_at'))
         else:
             instance.status = DevlogPost.Status.DRAFT
         
@@ -0,0 +1,66 @@
+# app_custom_zenith/hashing.py
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password, verify_password as django_verify_password
+
+_pool_lock = threading.Lock()
+_executor = None
+_slots = None
+
+
+class PasswordHashingBusy(Exception):
+    """O pool de hashing de senhas está saturado"""
+
+
+def _get_pool():
+    global _executor, _slots
+
+    with _pool_lock:
+        if _executor is None:
+            workers = getattr(settings, 'PASSWORD_HASHING_WORKERS', 4)
+            queue_size = getattr(settings, 'PASSWORD_HASHING_QUEUE_SIZE', 16)
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hashing')
+            # Tarefas em execução + tarefas aguardando na fila
+            _slots = threading.BoundedSemaphore(workers + queue_size)
+    return _executor, _slots
+
+
+def run_hashing_task(func, *args):
+    """
+    Executa uma tarefa de hashing no pool dedicado e espera o resultado.
+    Se o pool e a fila estiverem cheios, falha imediatamente com
+    PasswordHashingBusy em vez de prender o worker da requisição.
+    Com PASSWORD_HASHING_WORKERS = 0 a tarefa roda na própria thread.
+
+    A thread da requisição continua bloqueada em future.result() enquanto
+    o hash é calculado: o pool limita quantos hashes rodam ao mesmo tempo
+    (e recusa o excesso), mas não libera a thread para outras requisições.
+    """
+    if not getattr(settings, 'PASSWORD_HASHING_WORKERS', 4):
+        return func(*args)
+
+    executor, slots = _get_pool()
+    if not slots.acquire(blocking=False):
+        raise PasswordHashingBusy
+
+    try:
+        future = executor.submit(func, *args)
+    except Exception:
+        slots.release()
+        raise
+    future.add_done_callback(lambda f: slots.release())
+    return future.result()
+
+
+def hash_password(raw_password):
+    """make_password executado no pool (senhas inutilizáveis não custam nada)"""
+    if raw_password is None:
+        return make_password(None)
+    return run_hashing_task(make_password, raw_password)
+
+
+def verify_password(raw_password, encoded):
+    """Retorna (senha_correta, precisa_atualizar_hash) usando o pool"""
+    return run_hashing_task(django_verify_password, raw_password, encoded)
@@ -0,0 +1,71 @@
+# app_custom_zenith/imagemeta.py
+import base64
+import io
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from PIL import ExifTags, Image, ImageOps
+
+from .backends import invalidate_cached_user
+from .feedcache import bump_feed_version
+from .models import IMAGE_METADATA_SUFFIXES, DevlogPost, UserProfile
+
+# Modelos com imagens rastreadas: nome usado nas tarefas -> (modelo, campo)
+IMAGE_FIELDS = {
+    'devlogpost': (DevlogPost, 'featured_image'),
+    'userprofile': (UserProfile, 'profile_image'),
+}
+
+# Orientações EXIF que giram a imagem 90° (largura e altura trocadas na exibição)
+ROTATED_ORIENTATIONS = {5, 6, 7, 8}
+
+
+def compute_image_metadata(file):
+    """
+    Dimensões de exibição, cor predominante (média) e placeholder: uma
+    miniatura JPEG de IMAGE_PLACEHOLDER_SIZE pixels em data URI. JPEGs são
+    decodificados já reduzidos (draft), sem carregar a resolução inteira.
+    """
+    size = getattr(settings, 'IMAGE_PLACEHOLDER_SIZE', 16)
+    with Image.open(file) as image:
+        width, height = image.size
+        if image.getexif().get(ExifTags.Base.Orientation) in ROTATED_ORIENTATIONS:
+            width, height = height, width
+
+        image.draft('RGB', (size * 4, size * 4))
+        small = ImageOps.exif_transpose(image).convert('RGB')
+        small.thumbnail((size, size))
+
+    red, green, blue = small.resize((1, 1), Image.Resampling.BOX).getpixel((0, 0))
+    buffer = io.BytesIO()
+    small.save(buffer, 'JPEG', quality=40, optimize=True)
+    placeholder = 'data:image/jpeg;base64,' + base64.b64encode(buffer.getvalue()).decode()
+
+    return {
+        'width': width,
+        'height': height,
+        'color': f'#{red:02x}{green:02x}{blue:02x}',
+        'placeholder': placeholder,
+    }
+
+
+def update_image_metadata(model_name, pk, name):
+    """
+    Calcula e grava os metadados da imagem `name`. O UPDATE só vale se o
+    registro ainda aponta para a mesma imagem (outra troca pode ter
+    acontecido enquanto a tarefa esperava). Retorna True se gravou.
+    """
+    model, field_name = IMAGE_FIELDS[model_name]
+    with default_storage.open(name, 'rb') as file:
+        metadata = compute_image_metadata(file)
+
+    updated = model.objects.filter(pk=pk, **{field_name: name}).update(**{
+        f'{field_name}_{suffix}': metadata[suffix] for suffix in IMAGE_METADATA_SUFFIXES
+    })
+    if updated:
+        # update() não dispara signals: listagens em cache e usuário em cache
+        if model is DevlogPost:
+            bump_feed_version()
+        else:
+            invalidate_cached_user(model.objects.filter(pk=pk).values_list('user_id', flat=True).first())
+    return bool(updated)
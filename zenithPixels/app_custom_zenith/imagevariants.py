@@ -0,0 +1,143 @@
+# app_custom_zenith/imagevariants.py
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from PIL import Image, features
+
+SOURCE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.webp'}
+
+# Formatos modernos na ordem de preferência dos <source>; o fallback usa o formato original
+MODERN_FORMATS = (
+    ('avif', 'image/avif', {'quality': 55}),
+    ('webp', 'image/webp', {'quality': 80, 'method': 6}),
+)
+
+
+def variants_source_dir():
+    """Pasta com as artes originais (static/img)"""
+    return Path(settings.STATICFILES_DIRS[0]) / 'img'
+
+
+def variants_output_dir():
+    return variants_source_dir() / getattr(settings, 'IMAGE_VARIANTS_DIR', 'variants')
+
+
+def manifest_path():
+    return variants_output_dir() / 'manifest.json'
+
+
+def _fallback_format(image, extension):
+    if extension in ('.jpg', '.jpeg') or image.mode not in ('RGBA', 'LA', 'P'):
+        return 'jpeg', 'image/jpeg', {'quality': 82, 'optimize': True, 'progressive': True}
+    return 'png', 'image/png', {'optimize': True}
+
+
+def _available_formats():
+    return [fmt for fmt in MODERN_FORMATS if features.check(fmt[0])]
+
+
+def _build_one(source, relative, digest, output_dir):
+    """Gera as larguras de IMAGE_VARIANT_WIDTHS (nunca maiores que o original) em cada formato"""
+    widths = getattr(settings, 'IMAGE_VARIANT_WIDTHS', (320, 640, 960, 1280, 1920))
+    stem = relative.with_suffix('').as_posix().replace('/', '__')
+
+    with Image.open(source) as original:
+        original.load()
+        width, height = original.size
+        fallback = _fallback_format(original, source.suffix.lower())
+        targets = sorted({w for w in widths if w < width} | {width})
+
+        entry = {'width': width, 'height': height, 'sources': [], 'fallback': None}
+        for extension, mime, options in _available_formats() + [fallback]:
+            files = []
+            for target in targets:
+                resized = original if target == width else original.resize(
+                    (target, round(height * target / width)), Image.Resampling.LANCZOS
+                )
+                if extension == 'jpeg' and resized.mode != 'RGB':
+                    resized = resized.convert('RGB')
+                name = f'{stem}.{digest}.{target}w.{"jpg" if extension == "jpeg" else extension}'
+                resized.save(output_dir / name, extension.upper(), **options)
+                files.append([target, name])
+
+            group = {'type': mime, 'files': files}
+            if (extension, mime, options) == fallback:
+                entry['fallback'] = group
+            else:
+                entry['sources'].append(group)
+    return entry
+
+
+def build_image_variants(force=False):
+    """
+    Gera variantes redimensionadas (AVIF, WebP e o formato original) de
+    cada imagem em static/img e grava o manifest.json usado pela tag
+    {% picture %}. Os nomes incluem o hash do original, então podem ser
+    cacheados como imutáveis; só imagens novas ou alteradas são
+    reprocessadas e variantes que ninguém usa mais são apagadas.
+    Retorna (imagens processadas, total de imagens).
+    """
+    source_dir = variants_source_dir()
+    output_dir = variants_output_dir()
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    previous = {} if force else load_manifest(reload=True)
+    manifest = {}
+    built = 0
+    for source in sorted(source_dir.rglob('*')):
+        if source.suffix.lower() not in SOURCE_EXTENSIONS or output_dir in source.parents:
+            continue
+        relative = source.relative_to(source_dir)
+        key = f'img/{relative.as_posix()}'
+        digest = hashlib.sha256(source.read_bytes()).hexdigest()[:12]
+
+        entry = previous.get(key)
+        if entry is not None and entry.get('digest') == digest:
+            manifest[key] = entry
+            continue
+        manifest[key] = {'digest': digest, **_build_one(source, relative, digest, output_dir)}
+        built += 1
+
+    in_use = {
+        name
+        for entry in manifest.values()
+        for group in entry['sources'] + [entry['fallback']]
+        for _, name in group['files']
+    }
+    for file in output_dir.iterdir():
+        if file.is_file() and file.name != 'manifest.json' and file.name not in in_use:
+            file.unlink()
+
+    temp_path = manifest_path().with_suffix('.tmp')
+    temp_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    os.replace(temp_path, manifest_path())
+    load_manifest(reload=True)
+    return built, len(manifest)
+
+
+_manifest = {'mtime': None, 'data': {}}
+_manifest_lock = threading.Lock()
+
+
+def load_manifest(reload=False):
+    """Manifest em memória, relido quando o arquivo muda (um stat por chamada)"""
+    try:
+        mtime = os.stat(manifest_path()).st_mtime_ns
+    except FileNotFoundError:
+        return {}
+    if reload or _manifest['mtime'] != mtime:
+        with _manifest_lock:
+            with open(manifest_path()) as file:
+                _manifest['data'] = json.load(file)
+            _manifest['mtime'] = mtime
+    return _manifest['data']
+
+
+def variant_static_path(name):
+    """Caminho (para o {% static %}) de um arquivo de variante"""
+    variants_dir = getattr(settings, 'IMAGE_VARIANTS_DIR', 'variants')
+    return f'img/{variants_dir}/{name}'
@@ -0,0 +1,116 @@
+# app_custom_zenith/invalidation.py
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from .models import CacheNamespaceVersion
+
+logger = logging.getLogger(__name__)
+
+# Namespace do conteúdo do devlog (posts e categorias)
+DEVLOG = 'devlog'
+
+# Namespace da equipe e dos jogos exibidos na home e nas páginas dos jogos
+CATALOG = 'catalog'
+
+# Namespace dos usuários guardados em cache pelo CachedModelBackend
+USERS = 'users'
+
+
+class InvalidationBus:
+    """
+    Barramento de invalidação dos caches em memória entre workers.
+
+    Quem guarda algo em memória registra um handler para o seu namespace
+    com subscribe(). Os signals chamam bump(), que incrementa a versão do
+    namespace na tabela CacheNamespaceVersion e executa os handlers do
+    próprio processo. Os outros workers comparam as versões em check() (uma
+    consulta pequena, no máximo uma vez a cada INVALIDATION_CHECK_INTERVAL
+    segundos) e executam os handlers dos namespaces que mudaram; esse
+    intervalo é a defasagem máxima entre workers.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._handlers = defaultdict(list)
+        self._versions = None
+        self._checked_at = 0.0
+
+    def subscribe(self, namespace, handler):
+        self._handlers[namespace].append(handler)
+
+    def start(self):
+        """
+        Registra as versões atuais como referência, se ainda não houver uma.
+        Quem carrega um cache em memória chama antes da carga: uma mudança
+        feita por outro worker entre a carga e o primeiro check() ainda é
+        detectada. Só consulta o banco na primeira chamada do processo.
+        """
+        if self._versions is not None:
+            return
+        with self._lock:
+            if self._versions is None:
+                self._versions = self._read_versions()
+                self._checked_at = time.monotonic()
+
+    def _read_versions(self):
+        return dict(CacheNamespaceVersion.objects.values_list('namespace', 'version'))
+
+    def _run_handlers(self, namespace):
+        for handler in self._handlers.get(namespace, ()):
+            try:
+                handler()
+            except Exception:
+                logger.exception(f'Erro ao invalidar o namespace {namespace}')
+
+    def bump(self, namespace):
+        """Invalida o namespace em todos os workers depois do commit"""
+        transaction.on_commit(lambda: self._bump(namespace))
+
+    def _bump(self, namespace):
+        versions = CacheNamespaceVersion.objects.filter(namespace=namespace)
+        if not versions.update(version=F('version') + 1):
+            try:
+                with transaction.atomic():
+                    CacheNamespaceVersion.objects.create(namespace=namespace)
+            except IntegrityError:
+                versions.update(version=F('version') + 1)
+        # O próprio worker não espera o próximo check()
+        self._run_handlers(namespace)
+
+    def check(self, force=False):
+        """
+        Executa os handlers dos namespaces alterados por outros workers.
+        Retorna os namespaces invalidados.
+        """
+        interval = getattr(settings, 'INVALIDATION_CHECK_INTERVAL', 2)
+        if not force and time.monotonic() - self._checked_at < interval:
+            return []
+
+        with self._lock:
+            if not force and time.monotonic() - self._checked_at < interval:
+                return []
+            self._checked_at = time.monotonic()
+            current = self._read_versions()
+            previous, self._versions = self._versions, current
+
+        # Sem start() antes, a primeira leitura só estabelece a referência
+        if previous is None:
+            return []
+
+        changed = [
+            namespace for namespace, version in current.items()
+            if previous.get(namespace) != version
+        ]
+        for namespace in changed:
+            self._run_handlers(namespace)
+        return changed
+
+
+invalidation_bus = InvalidationBus()
+
@@ -0,0 +1,36 @@
+# app_custom_zenith/lore.py
+
+# Fragmentos do portal de lore da Chama Espiral (todos desbloqueados)
+LORE_FRAGMENTS = [
+    # --- LORE ---
+    {'id': 1, 'category': 'lore', 'subcategory': 'historia', 'title': "A Origem da Chama", 'type': "Lore / História", 'status': 'unlocked', 'content': "Há milênios, quando as estrelas ainda dançavam em harmonia com a terra, nasceu a Chama Espiral. Não era apenas fogo, mas a própria essência do conhecimento cósmico...", 'related_ids': [10]},
+    {'id': 2, 'category': 'lore', 'subcategory': 'eventos', 'title': "O Grande Eclipse", 'type': "Lore / Eventos", 'status': 'unlocked', 'content': "Durante o Grande Eclipse, a Chama Espiral oscilou pela primeira vez...", 'related_ids': [1]},
+    {'id': 3, 'category': 'lore', 'subcategory': 'cronologia', 'title': "Linha do Tempo Alpha", 'type': "Lore / Cronologia", 'status': 'unlocked', 'content': "Registro temporal da primeira era...", 'related_ids': []},
+
+    # --- PERSONAGENS ---
+    {'id': 10, 'category': 'personagens', 'subcategory': 'guardioes', 'title': "Os Guardiões Ancestrais", 'type': "Personagens / Guardiões", 'status': 'unlocked', 'content': "Os primeiros a tocar a chama não foram queimados, mas transformados...", 'related_ids': [20]},
+    {'id': 11, 'category': 'personagens', 'subcategory': 'lideres', 'title': "Rei Kaelthas", 'type': "Personagens / Líderes", 'status': 'unlocked', 'content': "O último rei a unir as tribos sob a luz da Chama...", 'related_ids': []},
+    {'id': 12, 'category': 'personagens', 'subcategory': 'entidades', 'title': "O Observador", 'type': "Personagens / Entidades", 'status': 'unlocked', 'content': "Uma entidade que existe apenas nos reflexos dos espelhos do templo...", 'related_ids': []},
+
+    # --- LOCAIS ---
+    {'id': 20, 'category': 'locais', 'subcategory': 'templos', 'title': "Templo Ancestral", 'type': "Locais / Templos", 'status': 'unlocked', 'content': "No coração da montanha sagrada, o Templo Ancestral foi erguido...", 'related_ids': [1, 10]},
+    {'id': 21, 'category': 'locais', 'subcategory': 'ruinas', 'title': "Ruínas Esquecidas", 'type': "Locais / Ruínas", 'status': 'unlocked', 'content': "Antigas estruturas que precedem até mesmo a Chama...", 'related_ids': []},
+    {'id': 22, 'category': 'locais', 'subcategory': 'santuarios', 'title': "Santuário da Luz", 'type': "Locais / Santuários", 'status': 'unlocked', 'content': "Um local de cura e meditação...", 'related_ids': []},
+
+    # --- ARTEFATOS ---
+    {'id': 30, 'category': 'artefatos', 'subcategory': 'reliquias', 'title': "Cálice de Fogo", 'type': "Artefatos / Relíquias", 'status': 'unlocked', 'content': "O cálice usado para transportar brasas da chama original...", 'related_ids': []},
+    {'id': 31, 'category': 'artefatos', 'subcategory': 'fragmentos', 'title': "Fragmento Estelar", 'type': "Artefatos / Fragmentos", 'status': 'unlocked', 'content': "Um pedaço de estrela solidificado...", 'related_ids': []},
+
+    # --- GALERIA ---
+    {'id': 40, 'category': 'galeria', 'subcategory': 'concept_art', 'title': "Concept: Templo", 'type': "Galeria / Concept Art", 'status': 'unlocked', 'content': "Esboços originais da arquitetura do templo...", 'related_ids': []},
+    {'id': 41, 'category': 'galeria', 'subcategory': 'ilustracoes', 'title': "Batalha Final", 'type': "Galeria / Ilustrações", 'status': 'unlocked', 'content': "Representação artística da grande guerra...", 'related_ids': []},
+
+    # --- PUZZLES ---
+    {'id': 50, 'category': 'puzzles', 'subcategory': 'facil', 'title': "Enigma da Porta", 'type': "Puzzles / Fácil", 'status': 'unlocked', 'content': "Fale 'amigo' e entre...", 'related_ids': []},
+    {'id': 51, 'category': 'puzzles', 'subcategory': 'medio', 'title': "Torres de Hanoi", 'type': "Puzzles / Médio", 'status': 'unlocked', 'content': "Mova os discos sem colocar um maior sobre um menor...", 'related_ids': []},
+    {'id': 52, 'category': 'puzzles', 'subcategory': 'dificil', 'title': "Cubo do Tempo", 'type': "Puzzles / Difícil", 'status': 'unlocked', 'content': "Alinhe as faces em quatro dimensões...", 'related_ids': []},
+
+    # --- EXTRAS ---
+    {'id': 60, 'category': 'extras', 'subcategory': 'curiosidades', 'title': "Easter Egg #1", 'type': "Extras / Curiosidades", 'status': 'unlocked', 'content': "Os desenvolvedores esconderam suas iniciais nas estrelas...", 'related_ids': []},
+    {'id': 61, 'category': 'extras', 'subcategory': 'referencias', 'title': "Inspirações", 'type': "Extras / Referências", 'status': 'unlocked', 'content': "Baseado em mitologias antigas...", 'related_ids': []},
+]
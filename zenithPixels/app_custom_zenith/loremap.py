@@ -0,0 +1,179 @@
+# app_custom_zenith/loremap.py
+import hashlib
+import json
+import logging
+import math
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .lore import LORE_FRAGMENTS
+from .models import LoreProgress
+
+logger = logging.getLogger(__name__)
+
+GOLDEN_ANGLE = math.pi * (3 - math.sqrt(5))
+
+
+def fragment_edges(fragments):
+    """Arestas (i, j) sem direção entre os índices dos fragmentos ligados por related_ids"""
+    index = {fragment['id']: i for i, fragment in enumerate(fragments)}
+    return sorted({
+        (min(i, index[related]), max(i, index[related]))
+        for i, fragment in enumerate(fragments)
+        for related in fragment.get('related_ids', ())
+        if related in index and index[related] != i
+    })
+
+
+def lore_revision(fragments=LORE_FRAGMENTS):
+    """Hash do que define o layout (ids, ordem e ligações); textos não contam"""
+    shape = [[fragment['id'], sorted(fragment.get('related_ids', ()))] for fragment in fragments]
+    return hashlib.sha1(json.dumps(shape).encode()).hexdigest()[:12]
+
+
+def compute_lore_layout(fragments):
+    """
+    Posições do mapa de constelação em porcentagem (left, top). Os
+    fragmentos começam numa espiral de Vogel, na ordem da lista (cada
+    categoria forma um braço da espiral), e o layout é relaxado por
+    LORE_MAP_ITERATIONS passos de Fruchterman-Reingold: todos os pares se
+    repelem (O(n²) por passo) e as ligações atraem.
+    """
+    count = len(fragments)
+    if not count:
+        return {'nodes': [], 'edges': []}
+    edges = fragment_edges(fragments)
+
+    positions = [
+        [math.sqrt((i + 0.5) / count) * math.cos(i * GOLDEN_ANGLE),
+         math.sqrt((i + 0.5) / count) * math.sin(i * GOLDEN_ANGLE)]
+        for i in range(count)
+    ]
+    ideal = math.sqrt(math.pi / count)  # distância ideal entre vizinhos no disco unitário
+    temperature = 0.1
+    iterations = getattr(settings, 'LORE_MAP_ITERATIONS', 200)
+    for _ in range(iterations):
+        moves = [[0.0, 0.0] for _ in range(count)]
+        for i in range(count):
+            for j in range(i + 1, count):
+                dx = positions[i][0] - positions[j][0]
+                dy = positions[i][1] - positions[j][1]
+                distance = max(math.hypot(dx, dy), 1e-3)
+                force = ideal * ideal / distance / distance
+                moves[i][0] += dx * force
+                moves[i][1] += dy * force
+                moves[j][0] -= dx * force
+                moves[j][1] -= dy * force
+        for i, j in edges:
+            dx = positions[i][0] - positions[j][0]
+            dy = positions[i][1] - positions[j][1]
+            force = math.hypot(dx, dy) / ideal
+            moves[i][0] -= dx * force
+            moves[i][1] -= dy * force
+            moves[j][0] += dx * force
+            moves[j][1] += dy * force
+
+        for position, (mx, my) in zip(positions, moves):
+            length = math.hypot(mx, my)
+            if length:
+                step = min(length, temperature)
+                position[0] += mx / length * step
+                position[1] += my / length * step
+            # Mantém os pontos dentro do disco
+            radius = math.hypot(*position)
+            if radius > 1:
+                position[0] /= radius
+                position[1] /= radius
+        temperature *= 0.98
+
+    margin = getattr(settings, 'LORE_MAP_MARGIN', 8)
+    xs = [x for x, _ in positions]
+    ys = [y for _, y in positions]
+    span_x = (max(xs) - min(xs)) or 1
+    span_y = (max(ys) - min(ys)) or 1
+
+    def scale(value, low, span):
+        return round(margin + (value - low) / span * (100 - 2 * margin), 1)
+
+    return {
+        'nodes': [
+            [fragment['id'], scale(x, min(xs), span_x), scale(y, min(ys), span_y)]
+            for fragment, (x, y) in zip(fragments, positions)
+        ],
+        'edges': [list(edge) for edge in edges],
+    }
+
+
+def lore_layout_path():
+    return Path(getattr(settings, 'LORE_MAP_PATH', Path(__file__).resolve().parent / 'lore_layout.json'))
+
+
+def build_lore_layout(force=False):
+    """
+    Calcula o layout da revisão atual e grava em LORE_MAP_PATH (rodado por
+    python manage.py build_lore_map, fora do caminho das requisições).
+    Retorna False se o arquivo já estava atualizado.
+    """
+    revision = lore_revision()
+    path = lore_layout_path()
+    if not force and _read_layout_file(path).get('revision') == revision:
+        return False
+
+    data = {'revision': revision, **compute_lore_layout(LORE_FRAGMENTS)}
+    temp_path = path.with_suffix('.tmp')
+    temp_path.write_text(json.dumps(data, separators=(',', ':')) + '\n')
+    os.replace(temp_path, path)
+    _layout.update(revision=None, data=None)
+    return True
+
+
+def _read_layout_file(path):
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+_layout = {'revision': None, 'data': None}
+
+
+def get_lore_layout():
+    """
+    Layout da revisão atual da lore ({"nodes": [[id, left, top]...],
+    "edges": [[i, j]...]}), lido do arquivo gerado por build_lore_map e
+    mantido em memória pelo processo. Se o arquivo estiver ausente ou for
+    de outra revisão, o layout é calculado uma vez e guardado no cache, com
+    um aviso: esse cálculo leva segundos e não deveria cair numa requisição.
+    """
+    revision = lore_revision()
+    if _layout['revision'] == revision:
+        return _layout['data']
+
+    data = _read_layout_file(lore_layout_path())
+    if data.get('revision') != revision:
+        key = f'lore-map:{revision}'
+        payload = cache.get(key)
+        if payload is None:
+            logger.warning('Layout do mapa da lore desatualizado; rode python manage.py build_lore_map')
+            payload = json.dumps(compute_lore_layout(LORE_FRAGMENTS), separators=(',', ':'))
+            cache.set(key, payload, None)
+        data = json.loads(payload)
+    _layout.update(revision=revision, data=data)
+    return data
+
+
+def unlocked_fragment_ids(user):
+    """Fragmentos desbloqueados pelo usuário (uma consulta; vazio para anônimos)"""
+    if not user.is_authenticated:
+        return set()
+    unlocked = LoreProgress.objects.filter(user_id=user.pk).values_list('unlocked', flat=True).first()
+    return set(unlocked or ())
+
+
+def fragment_status(fragment, unlocked):
+    if fragment['status'] == 'unlocked' or fragment['id'] in unlocked:
+        return 'unlocked'
+    return 'locked'
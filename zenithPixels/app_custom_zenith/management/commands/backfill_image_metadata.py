@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from app_custom_zenith.imagemeta import IMAGE_FIELDS, update_image_metadata
+
+
+class Command(BaseCommand):
+    help = (
+        'Calcula dimensões, cor predominante e placeholder das imagens de posts e '
+        'perfis enviadas antes desses campos existirem (ou de todas, com --force).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200, help='Registros lidos por consulta')
+        parser.add_argument('--force', action='store_true', help='Recalcula também as imagens que já têm metadados')
+
+    def handle(self, *args, **options):
+        for model_name, (model, field_name) in IMAGE_FIELDS.items():
+            pending = model.objects.exclude(Q(**{f'{field_name}__isnull': True}) | Q(**{field_name: ''}))
+            if not options['force']:
+                pending = pending.filter(**{f'{field_name}_width__isnull': True})
+
+            updated = failed = 0
+            rows = pending.order_by('pk').values_list('pk', field_name)
+            for pk, name in rows.iterator(chunk_size=options['batch_size']):
+                try:
+                    if update_image_metadata(model_name, pk, name):
+                        updated += 1
+                except (OSError, ValueError) as e:
+                    # Arquivo ausente ou ilegível: o registro fica sem metadados
+                    failed += 1
+                    self.stderr.write(f'{model_name} {pk}: {name} ({e})')
+
+            self.stdout.write(f'{model._meta.verbose_name_plural}: {updated} atualizado(s), {failed} com erro')
@@ -0,0 +1,71 @@
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        'Mede a vazão de requisições concorrentes contra um servidor em execução. '
+        'Compare as implantações rodando, por exemplo, '
+        '"gunicorn zenithPixels.wsgi -w 4" e "uvicorn zenithPixels.asgi:application --workers 4" '
+        'e apontando --url para cada uma.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help='Endereço base do servidor')
+        parser.add_argument('--post-id', type=int, required=True, help='ID de um post publicado')
+        parser.add_argument('--concurrency', type=int, default=50, help='Requisições simultâneas')
+        parser.add_argument('--requests', type=int, default=1000, help='Total de requisições por endpoint')
+        parser.add_argument('--sessionid', help='Cookie sessionid de um usuário logado (para get_comments)')
+
+    def handle(self, *args, **options):
+        base_url = options['url'].rstrip('/')
+        post_id = options['post_id']
+
+        endpoints = [('share_post', f'{base_url}/api/post/{post_id}/share/')]
+        if options['sessionid']:
+            endpoints.append(('get_comments', f'{base_url}/api/post/{post_id}/comments/'))
+
+        for name, url in endpoints:
+            results = self._run(url, options['concurrency'], options['requests'], options['sessionid'])
+            self._report(name, results)
+
+    def _run(self, url, concurrency, total, sessionid):
+        local = threading.local()
+
+        def fetch(_):
+            session = getattr(local, 'session', None)
+            if session is None:
+                session = local.session = requests.Session()
+                if sessionid:
+                    session.cookies.set('sessionid', sessionid)
+            start = time.perf_counter()
+            try:
+                ok = session.get(url, timeout=30).status_code == 200
+            except requests.RequestException:
+                ok = False
+            return ok, time.perf_counter() - start
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(fetch, range(total)))
+        elapsed = time.perf_counter() - start
+
+        if not any(ok for ok, _ in results):
+            raise CommandError(f'Nenhuma resposta 200 de {url}')
+        return elapsed, results
+
+    def _report(self, name, run):
+        elapsed, results = run
+        latencies = sorted(latency for _, latency in results)
+        errors = sum(1 for ok, _ in results if not ok)
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+
+        self.stdout.write(
+            f"{name:<13} {len(results)} reqs em {elapsed:.2f}s -> {len(results) / elapsed:.1f} req/s | "
+            f"p50 {statistics.median(latencies) * 1000:.1f} ms | p95 {p95 * 1000:.1f} ms | {errors} erros"
+        )
@@ -0,0 +1,71 @@
+import os
+import statistics
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory, override_settings
+from django.views.static import serve
+
+from app_custom_zenith.fileserving import FileIndex, serve_file
+
+
+class Command(BaseCommand):
+    help = (
+        'Compara a entrega de arquivos do app (fileserving) com o helper static() '
+        'do Django (django.views.static.serve): arquivo completo, range de 64KB '
+        'e revalidação com If-None-Match.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', type=int, default=2 * 1024 * 1024, help='Tamanho do arquivo de teste (bytes)')
+        parser.add_argument('--requests', type=int, default=200, help='Requisições por cenário')
+
+    def handle(self, *args, **options):
+        factory = RequestFactory()
+        total = options['requests']
+
+        with tempfile.TemporaryDirectory() as root:
+            name = 'bench/imagem.jpg'
+            os.makedirs(os.path.join(root, 'bench'))
+            with open(os.path.join(root, name), 'wb') as file:
+                file.write(os.urandom(options['size']))
+
+            index = FileIndex('media', root)
+            index.scan()
+            etag = index.lookup(name).etag
+
+            scenarios = (
+                ('completo', {}),
+                ('range 64KB', {'HTTP_RANGE': 'bytes=1048576-1114111'}),
+                ('revalidação', {'HTTP_IF_NONE_MATCH': etag}),
+            )
+            handlers = (
+                ('static()', lambda request: serve(request, name, document_root=root)),
+                ('fileserving', lambda request: serve_file(request, index, name, 3600)),
+            )
+
+            self.stdout.write(f'Arquivo de {options["size"] // 1024}KB, {total} requisições por cenário')
+            with override_settings(MEDIA_SERVE_MODE='django'):
+                for scenario, headers in scenarios:
+                    for label, handler in handlers:
+                        self._run(factory, handler, scenario, label, headers, total, name)
+
+    def _run(self, factory, handler, scenario, label, headers, total, name):
+        timings = []
+        sent = status = 0
+        for _ in range(total):
+            request = factory.get(f'/media/{name}', **headers)
+            start = time.perf_counter()
+            response = handler(request)
+            status = response.status_code
+            # Consome o corpo como o servidor faria (sem file_wrapper/sendfile)
+            sent = sum(len(chunk) for chunk in response) if response.streaming else len(response.content)
+            response.close()
+            timings.append(time.perf_counter() - start)
+
+        self.stdout.write(
+            f'{scenario:<12} {label:<12} HTTP {status} {sent:>8} bytes  '
+            f'mediana {statistics.median(timings) * 1000:.2f}ms  '
+            f'p95 {sorted(timings)[int(len(timings) * 0.95) - 1] * 1000:.2f}ms'
+        )
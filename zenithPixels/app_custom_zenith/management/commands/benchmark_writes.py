@@ -0,0 +1,102 @@
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+from django.test import RequestFactory
+
+from app_custom_zenith.models import CustomUser, DevlogPost, PostCategory
+from app_custom_zenith.views import add_comment, like_post
+
+
+class Command(BaseCommand):
+    help = (
+        'Mede a vazão de escrita de like_post/add_comment sob carga concorrente '
+        'no banco configurado (rode com DB_ENGINE=sqlite e DB_ENGINE=postgres para comparar).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8, help='Número de workers concorrentes')
+        parser.add_argument('--requests', type=int, default=50, help='Requisições por worker e por endpoint')
+
+    def handle(self, *args, **options):
+        threads = options['threads']
+        per_thread = options['requests']
+        run_id = uuid.uuid4().hex[:8]
+
+        self.stdout.write(
+            f"Banco: {settings.DATABASES['default']['ENGINE']} "
+            f"({threads} workers x {per_thread} requisições)"
+        )
+
+        users, post = self._create_fixtures(run_id, threads)
+        try:
+            for name, view, kwargs in (
+                ('like_post', like_post, {'post_id': post.id}),
+                ('add_comment', add_comment, {'slug': post.slug}),
+            ):
+                elapsed, errors = self._run(view, kwargs, users, per_thread)
+                total = threads * per_thread
+                self.stdout.write(
+                    f"{name:<12} {total} reqs em {elapsed:.2f}s -> "
+                    f"{total / elapsed:.1f} escritas/s ({errors} erros)"
+                )
+        finally:
+            post.delete()
+            CustomUser.objects.filter(id__in=[u.id for u in users]).delete()
+
+    def _create_fixtures(self, run_id, count):
+        PostCategory.get_default_categories()
+        users = [
+            CustomUser.objects.create_user(
+                email=f'bench-{run_id}-{i}@example.com',
+                username=f'bench-{run_id}-{i}',
+                password=None,
+                first_name='Bench',
+                last_name=str(i),
+                telefone=f'9{run_id[:4]}{i:05d}'[:11],
+                data_nascimento=date(1990, 1, 1),
+            )
+            for i in range(count)
+        ]
+        post = DevlogPost.objects.create(
+            title=f'Benchmark {run_id}',
+            content='Post temporário do benchmark de escrita.',
+            category=PostCategory.objects.first(),
+            author=users[0],
+            status=DevlogPost.Status.PUBLISHED,
+        )
+        return users, post
+
+    def _run(self, view, kwargs, users, per_thread):
+        factory = RequestFactory()
+
+        def worker(user):
+            async def auser():
+                return user
+
+            errors = 0
+            try:
+                for i in range(per_thread):
+                    request = factory.post('/', {'content': f'Comentário {i}'})
+                    request.user = user
+                    request.auser = auser
+                    response = async_to_sync(view)(request, **kwargs)
+                    if response.status_code != 200:
+                        errors += 1
+            finally:
+                # Cada thread abre sua própria conexão
+                connection.close()
+            return errors
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(users)) as executor:
+            errors = sum(executor.map(worker, users))
+        elapsed = time.perf_counter() - start
+
+        connections.close_all()
+        return elapsed, errors
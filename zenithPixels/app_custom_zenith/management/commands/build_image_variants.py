@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from app_custom_zenith.imagevariants import build_image_variants, manifest_path
+
+
+class Command(BaseCommand):
+    help = (
+        'Gera as variantes redimensionadas (AVIF, WebP e formato original) das artes de '
+        'static/img usadas pela tag {% picture %}. Rode antes do collectstatic.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Regera também as imagens que não mudaram')
+
+    def handle(self, *args, **options):
+        built, total = build_image_variants(force=options['force'])
+        self.stdout.write(f'{built} de {total} imagem(ns) processada(s); manifest em {manifest_path()}')
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from app_custom_zenith.loremap import build_lore_layout, lore_layout_path
+
+
+class Command(BaseCommand):
+    help = 'Calcula o layout do mapa de constelação da lore e grava o arquivo lido pela view'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Recalcula mesmo que a revisão não tenha mudado')
+
+    def handle(self, *args, **options):
+        if build_lore_layout(force=options['force']):
+            self.stdout.write(f'Layout gravado em {lore_layout_path()}')
+        else:
+            self.stdout.write('Layout já está atualizado')
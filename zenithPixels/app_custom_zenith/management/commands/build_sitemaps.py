@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from app_custom_zenith.sitemaps import build_sitemaps, sitemap_root
+
+
+class Command(BaseCommand):
+    help = 'Atualiza os arquivos do sitemap (só as seções que mudaram, a menos que use --force)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Reescreve todas as seções')
+
+    def handle(self, *args, **options):
+        changed = build_sitemaps(force=options['force'])
+        self.stdout.write(f'{changed} arquivo(s) atualizado(s) em {sitemap_root()}')
@@ -0,0 +1,28 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from app_custom_zenith.trending import decay_scores
+
+
+class Command(BaseCommand):
+    help = 'Aplica o decaimento das pontuações de tendência e incorpora os eventos pendentes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Executa uma vez e sai (para uso com cron)')
+
+    def handle(self, *args, **options):
+        interval = getattr(settings, 'TRENDING_DECAY_INTERVAL', 5 * 60)
+
+        try:
+            while True:
+                close_old_connections()
+                updated = decay_scores()
+                self.stdout.write(f'{updated} pontuação(ões) atualizada(s)')
+                if options['once']:
+                    break
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            self.stdout.write('Decaimento encerrado')
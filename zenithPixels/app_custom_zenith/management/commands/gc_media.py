@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from app_custom_zenith.mediagc import collect_orphans
+
+
+class Command(BaseCommand):
+    help = (
+        'Remove os arquivos de mídia (imagens de posts e perfis) que nenhum registro '
+        'referencia mais: uploads substituídos, saves que falharam e temporários antigos.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Arquivos verificados por consulta')
+        parser.add_argument('--grace', type=int, help='Idade mínima em segundos (padrão: MEDIA_GC_GRACE)')
+        parser.add_argument('--dry-run', action='store_true', help='Só lista o que seria removido')
+
+    def handle(self, *args, **options):
+        scanned, removed, freed = collect_orphans(
+            batch_size=options['batch_size'],
+            grace=options['grace'],
+            dry_run=options['dry_run'],
+        )
+        action = 'seriam removidos' if options['dry_run'] else 'removidos'
+        self.stdout.write(
+            f'{scanned} arquivo(s) verificado(s), {removed} órfão(s) {action} '
+            f'({freed / 1024 / 1024:.1f}MB)'
+        )
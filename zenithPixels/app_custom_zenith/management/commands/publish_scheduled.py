@@ -0,0 +1,29 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from app_custom_zenith.models import DevlogPost
+
+
+class Command(BaseCommand):
+    help = 'Publica os posts agendados cuja data de publicação já chegou'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Publica os posts vencidos e sai (para uso com cron)')
+
+    def handle(self, *args, **options):
+        interval = getattr(settings, 'SCHEDULED_PUBLISH_INTERVAL', 30)
+
+        try:
+            while True:
+                close_old_connections()
+                published = DevlogPost.publish_due()
+                if published:
+                    self.stdout.write(f'{published} post(s) agendado(s) publicado(s)')
+                if options['once']:
+                    break
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            self.stdout.write('Agendador encerrado')
@@ -0,0 +1,18 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from app_custom_zenith.related import rebuild_related
+
+
+class Command(BaseCommand):
+    help = (
+        'Recalcula os posts relacionados de todos os posts publicados. '
+        'As edições atualizam a lista de forma incremental; rode este comando '
+        'periodicamente (ex.: diariamente) para refletir mudanças no vocabulário geral.'
+    )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        updated = rebuild_related()
+        self.stdout.write(f'{updated} post(s) atualizado(s) em {time.perf_counter() - start:.2f}s')
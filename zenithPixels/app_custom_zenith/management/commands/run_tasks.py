@@ -0,0 +1,32 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from app_custom_zenith.taskqueue import run_pending
+
+
+class Command(BaseCommand):
+    help = 'Worker da fila de tarefas em segundo plano (emails, limpeza de arquivos, etc.)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Processa as tarefas vencidas e sai')
+        parser.add_argument('--batch-size', type=int, default=20, help='Tarefas por rodada')
+
+    def handle(self, *args, **options):
+        poll_interval = getattr(settings, 'TASK_POLL_INTERVAL', 2)
+        self.stdout.write('Worker de tarefas iniciado')
+
+        try:
+            while True:
+                close_old_connections()
+                processed = run_pending(options['batch_size'])
+                if processed:
+                    self.stdout.write(f'{processed} tarefa(s) processada(s)')
+                if options['once']:
+                    break
+                if processed < options['batch_size']:
+                    time.sleep(poll_interval)
+        except KeyboardInterrupt:
+            self.stdout.write('Worker encerrado')
@@ -0,0 +1,90 @@
+import time
+import uuid
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from app_custom_zenith.invalidation import InvalidationBus
+from app_custom_zenith.models import CacheNamespaceVersion
+
+
+class Command(BaseCommand):
+    help = (
+        'Simula vários workers com barramentos de invalidação independentes: um '
+        'deles invalida um namespace e os outros fazem polling com check(). Mede '
+        'a defasagem até cada worker descartar o cache em memória.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4, help='Número de workers simulados')
+        parser.add_argument('--rounds', type=int, default=3, help='Número de invalidações')
+        parser.add_argument('--poll', type=float, default=0.05, help='Intervalo entre requisições simuladas (s)')
+
+    def handle(self, *args, **options):
+        workers = max(options['workers'], 2)
+        namespace = f'simulacao-{uuid.uuid4().hex[:8]}'
+        interval = getattr(settings, 'INVALIDATION_CHECK_INTERVAL', 2)
+
+        # Cada worker tem o próprio barramento e um "cache" que o handler esvazia
+        buses = []
+        caches = []
+        for _ in range(workers):
+            bus = InvalidationBus()
+            cache = {'valid': True}
+            bus.subscribe(namespace, lambda cache=cache: cache.update(valid=False))
+            buses.append(bus)
+            caches.append(cache)
+
+        self.stdout.write(
+            f'{workers} workers, INVALIDATION_CHECK_INTERVAL={interval}s, '
+            f'defasagem máxima esperada ~{interval + options["poll"]:.2f}s'
+        )
+
+        try:
+            CacheNamespaceVersion.objects.create(namespace=namespace)
+            for bus in buses:
+                bus.check(force=True)
+
+            worst = 0.0
+            for round_number in range(1, options['rounds'] + 1):
+                for cache in caches:
+                    cache['valid'] = True
+
+                started = time.monotonic()
+                # bump() fora de transação roda imediatamente (on_commit)
+                buses[0].bump(namespace)
+                if caches[0]['valid']:
+                    self.stderr.write(self.style.ERROR('O worker que invalidou manteve o cache'))
+                    return
+
+                staleness = self._poll(buses[1:], caches[1:], started, interval * 3, options['poll'])
+                if staleness is None:
+                    self.stderr.write(self.style.ERROR(
+                        f'Rodada {round_number}: algum worker não foi invalidado'
+                    ))
+                    return
+                worst = max(worst, max(staleness))
+                self.stdout.write(
+                    f'Rodada {round_number}: defasagem média {sum(staleness) / len(staleness):.2f}s, '
+                    f'máxima {max(staleness):.2f}s'
+                )
+
+            self.stdout.write(self.style.SUCCESS(
+                f'Todos os workers invalidados; pior defasagem {worst:.2f}s'
+            ))
+        finally:
+            CacheNamespaceVersion.objects.filter(namespace=namespace).delete()
+
+    def _poll(self, buses, caches, started, timeout, poll):
+        """Simula requisições em cada worker até todos descartarem o cache"""
+        staleness = [None] * len(buses)
+        while time.monotonic() - started < timeout:
+            for i, bus in enumerate(buses):
+                if staleness[i] is None:
+                    bus.check()
+                    if not caches[i]['valid']:
+                        staleness[i] = time.monotonic() - started
+            if all(value is not None for value in staleness):
+                return staleness
+            time.sleep(poll)
+        return None
@@ -0,0 +1,109 @@
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+
+from app_custom_zenith.warmup import WARMUP_VIEWS, warm_up
+
+# Uma requisição é "rápida" quando fica dentro deste fator da mediana estável
+FAST_FACTOR = 1.5
+
+
+class Command(BaseCommand):
+    help = (
+        'Aquece o processo atual (templates, URLs, caches e posts mais acessados). '
+        'Com --benchmark, sobe processos novos com e sem aquecimento e compara o '
+        'tempo até a primeira requisição rápida de home, devlog e lore_portal. '
+        'Com cache compartilhado (Redis) o primeiro processo aquece o cache dos demais.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, help='Posts pré-renderizados (padrão: WARMUP_POSTS)')
+        parser.add_argument('--benchmark', action='store_true', help='Compara processos frios e aquecidos')
+        parser.add_argument('--runs', type=int, default=3, help='Processos por modo no benchmark')
+        parser.add_argument('--requests', type=int, default=10, help='Requisições por página em cada processo')
+        # Uso interno do benchmark: processo medido
+        parser.add_argument('--probe', action='store_true', help='(interno) mede as requisições e imprime JSON')
+        parser.add_argument('--skip-warmup', action='store_true', help='(interno) não aquece antes de medir')
+
+    def handle(self, *args, **options):
+        if options['probe']:
+            return self._probe(options)
+        if options['benchmark']:
+            return self._benchmark(options)
+
+        for name, count, elapsed in warm_up(options['posts']):
+            self.stdout.write(f'{name:<10} {count:>4} itens em {elapsed * 1000:.1f}ms')
+        self.stdout.write(self.style.SUCCESS('Aquecimento concluído'))
+
+    def _probe(self, options):
+        ready_at = time.time()
+        if not options['skip_warmup']:
+            warm_up(options['posts'])
+        warmed_at = time.time()
+
+        client = Client(HTTP_HOST=self._host())
+        urls = [reverse(name) for name in WARMUP_VIEWS]
+        samples = {url: [] for url in urls}
+        for _ in range(options['requests']):
+            for url in urls:
+                start = time.perf_counter()
+                status = client.get(url).status_code
+                if status != 200:
+                    raise CommandError(f'{url} respondeu {status}')
+                samples[url].append((time.perf_counter() - start, time.time()))
+
+        self.stdout.write(json.dumps({'ready_at': ready_at, 'warmed_at': warmed_at, 'samples': samples}))
+
+    def _host(self):
+        for host in settings.ALLOWED_HOSTS:
+            if host != '*':
+                return host.lstrip('.')
+        return 'localhost'
+
+    def _benchmark(self, options):
+        command = [sys.executable, sys.argv[0], 'warm_up', '--probe', '--requests', str(options['requests'])]
+        if options['posts'] is not None:
+            command += ['--posts', str(options['posts'])]
+
+        for label, extra in (('frio', ['--skip-warmup']), ('aquecido', [])):
+            runs = [self._spawn(command + extra) for _ in range(options['runs'])]
+            self._report(label, runs)
+
+    def _spawn(self, command):
+        started = time.time()
+        result = subprocess.run(command, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise CommandError(f'Processo de medição falhou:\n{result.stderr}')
+        data = json.loads(result.stdout.strip().splitlines()[-1])
+
+        first = {}
+        fast_at = started
+        for url, samples in data['samples'].items():
+            steady = statistics.median(latency for latency, _ in samples[1:] or samples)
+            first[url] = samples[0][0]
+            done = next(done for latency, done in samples if latency <= steady * FAST_FACTOR)
+            fast_at = max(fast_at, done)
+
+        return {
+            'boot': data['ready_at'] - started,
+            'warmup': data['warmed_at'] - data['ready_at'],
+            'first': first,
+            'fast': fast_at - started,
+        }
+
+    def _report(self, label, runs):
+        median = lambda values: statistics.median(values) * 1000
+        self.stdout.write(
+            f'[{label}] boot {median([r["boot"] for r in runs]):.0f}ms, '
+            f'aquecimento {median([r["warmup"] for r in runs]):.0f}ms, '
+            f'primeira requisição rápida em {median([r["fast"] for r in runs]):.0f}ms'
+        )
+        for url in runs[0]['first']:
+            self.stdout.write(f'    {url:<30} 1ª requisição {median([r["first"][url] for r in runs]):.1f}ms')
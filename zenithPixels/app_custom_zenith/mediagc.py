@@ -0,0 +1,127 @@
+# app_custom_zenith/mediagc.py
+import os
+import time
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+
+from .models import DevlogPost, UserProfile
+from .storage import TEMP_PREFIX
+
+# Campos que referenciam arquivos de mídia (os arquivos podem ser compartilhados)
+MEDIA_REFERENCES = (
+    (DevlogPost, 'featured_image'),
+    (UserProfile, 'profile_image'),
+)
+
+
+def media_folders():
+    """Pastas de upload dos campos rastreados (ex.: devlog_images)"""
+    folders = set()
+    for model, field_name in MEDIA_REFERENCES:
+        upload_to = model._meta.get_field(field_name).upload_to
+        folders.add(upload_to.split('/', 1)[0])
+    return sorted(folders)
+
+
+def referenced_names(names):
+    """Quais dos nomes informados ainda são usados por algum post ou perfil"""
+    names = list(names)
+    found = set()
+    for model, field_name in MEDIA_REFERENCES:
+        found.update(
+            model.objects.filter(**{f'{field_name}__in': names}).values_list(field_name, flat=True)
+        )
+    return found
+
+
+def _recent(name, grace):
+    try:
+        return time.time() - os.path.getmtime(default_storage.path(name)) < grace
+    except FileNotFoundError:
+        return False
+
+
+def release_media(name):
+    """
+    Remove o arquivo se nenhum post ou perfil o referencia mais. Arquivos
+    tocados há menos de MEDIA_GC_GRACE segundos ficam (um upload idêntico
+    pode estar para ser gravado). Retorna True se o arquivo foi removido.
+    """
+    grace = getattr(settings, 'MEDIA_GC_GRACE', 24 * 60 * 60)
+    if not name or referenced_names([name]) or _recent(name, grace):
+        return False
+    if default_storage.exists(name):
+        default_storage.delete(name)
+        return True
+    return False
+
+
+def iter_media_files(folder):
+    """Percorre os arquivos de uma pasta de mídia sem montar a lista inteira"""
+    root = default_storage.path(folder)
+    stack = [root]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except FileNotFoundError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    name = os.path.relpath(entry.path, default_storage.location).replace(os.sep, '/')
+                    yield name, entry.stat()
+
+
+def collect_orphans(batch_size=500, grace=None, dry_run=False):
+    """
+    Remove os arquivos de mídia sem referência no banco, em lotes: cada
+    lote de nomes lidos do disco vira uma consulta por campo rastreado.
+    Temporários de upload abandonados também são removidos. Retorna
+    (arquivos verificados, removidos, bytes liberados).
+    """
+    if grace is None:
+        grace = getattr(settings, 'MEDIA_GC_GRACE', 24 * 60 * 60)
+    cutoff = time.time() - grace
+    scanned = removed = freed = 0
+
+    def flush(batch):
+        nonlocal removed, freed
+        referenced = referenced_names(batch)
+        for name, size in batch.items():
+            if name in referenced:
+                continue
+            # O stat da varredura pode ser antigo: um upload idêntico renova
+            # o mtime (os.utime) antes de gravar a referência, então o
+            # arquivo é conferido de novo logo antes de remover, como em
+            # release_media
+            if _recent(name, grace):
+                continue
+            if not dry_run:
+                default_storage.delete(name)
+            removed += 1
+            freed += size
+
+    for folder in media_folders():
+        batch = {}
+        for name, stat in iter_media_files(folder):
+            scanned += 1
+            # Arquivos recentes podem pertencer a um save ainda não commitado
+            if stat.st_mtime > cutoff:
+                continue
+            if os.path.basename(name).startswith(TEMP_PREFIX):
+                if not dry_run:
+                    default_storage.delete(name)
+                removed += 1
+                freed += stat.st_size
+                continue
+            batch[name] = stat.st_size
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch = {}
+        if batch:
+            flush(batch)
+
+    return scanned, removed, freed
@@ -0,0 +1,135 @@
+# app_custom_zenith/middleware.py
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.regex_helper import _lazy_re_compile
+
+from .db_routers import PRIMARY_PIN_COOKIE
+from .invalidation import invalidation_bus
+
+try:
+    import brotli
+except ImportError:  # Brotli é opcional; sem ele usamos apenas gzip
+    brotli = None
+
+re_accepts_brotli = _lazy_re_compile(r"\bbr\b")
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Comprime as respostas negociando brotli (se o pacote `brotli` estiver
+    instalado e o navegador aceitar) ou gzip.
+
+    Brotli só é usado para os tipos de COMPRESSION_BROTLI_TYPES (JSON,
+    feeds, CSS, JS...). HTML, que carrega o token CSRF, fica no gzip do
+    Django, que acrescenta bytes aleatórios no cabeçalho contra o BREACH;
+    o brotli não tem onde pôr esse enchimento.
+
+    Respostas menores que COMPRESSION_MIN_SIZE não são comprimidas, e
+    tipos listados em COMPRESSION_EXCLUDED_TYPES (ex.: Server-Sent Events,
+    que precisam chegar sem buffer) são ignorados, assim como os arquivos
+    de fileserving (ranges e pré-comprimidos).
+    """
+
+    def process_response(self, request, response):
+        min_size = getattr(settings, 'COMPRESSION_MIN_SIZE', 1024)
+        excluded_types = getattr(settings, 'COMPRESSION_EXCLUDED_TYPES', ('text/event-stream',))
+
+        content_type = response.get('Content-Type', '').split(';')[0].strip()
+        if content_type in excluded_types:
+            return response
+
+        if not response.streaming and len(response.content) < min_size:
+            return response
+
+        if response.has_header('Content-Encoding'):
+            return response
+
+        # Arquivos servidos com ranges (os offsets valem para os bytes
+        # originais) ou transferidos pelo servidor da frente/sendfile
+        if response.has_header('Accept-Ranges') or response.has_header('X-Accel-Redirect') \
+                or response.has_header('X-Sendfile'):
+            return response
+
+        ae = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        brotli_types = getattr(settings, 'COMPRESSION_BROTLI_TYPES', ())
+        if brotli is None or content_type not in brotli_types or not re_accepts_brotli.search(ae):
+            # Fallback para o gzip padrão do Django
+            return super().process_response(request, response)
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        if response.streaming:
+            response.streaming_content = self._brotli_stream(response)
+            del response.headers['Content-Length']
+        else:
+            compressed_content = brotli.compress(response.content, quality=5)
+            if len(compressed_content) >= len(response.content):
+                return response
+            response.content = compressed_content
+            response.headers['Content-Length'] = str(len(response.content))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = 'br'
+
+        return response
+
+    @staticmethod
+    def _brotli_stream(response):
+        original_iterator = response.streaming_content
+        compressor = brotli.Compressor(quality=5)
+
+        if response.is_async:
+            async def brotli_wrapper():
+                async for chunk in original_iterator:
+                    data = compressor.process(chunk)
+                    if data:
+                        yield data
+                yield compressor.finish()
+
+            return brotli_wrapper()
+
+        def brotli_sequence():
+            for chunk in original_iterator:
+                data = compressor.process(chunk)
+                if data:
+                    yield data
+            yield compressor.finish()
+
+        return brotli_sequence()
+
+
+class ReplicaPinningMiddleware(MiddlewareMixin):
+    """
+    Após uma requisição de escrita bem-sucedida (POST, PUT, PATCH, DELETE),
+    marca o navegador com um cookie de curta duração que faz as views
+    @read_from_replica lerem do primário durante REPLICA_STICKY_SECONDS.
+    """
+
+    unsafe_methods = ('POST', 'PUT', 'PATCH', 'DELETE')
+
+    def process_response(self, request, response):
+        if request.method in self.unsafe_methods and response.status_code < 400:
+            response.set_cookie(
+                PRIMARY_PIN_COOKIE,
+                '1',
+                max_age=getattr(settings, 'REPLICA_STICKY_SECONDS', 5),
+                httponly=True,
+                samesite='Lax',
+            )
+
+        return response
+
+
+class InvalidationMiddleware(MiddlewareMixin):
+    """
+    Verifica o barramento de invalidação no início de cada requisição; os
+    caches em memória alterados por outros workers são descartados antes
+    da view rodar.
+    """
+
+    def process_request(self, request):
+        invalidation_bus.check()
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-19 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_custom_zenith', '0011_alter_postcomment_created_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='customuser',
+            name='last_login',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='último login'),
+        ),
+    ]
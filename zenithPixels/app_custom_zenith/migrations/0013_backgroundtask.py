@@ -0,0 +1,35 @@
+# Generated by Django 5.2.1 on 2026-10-19 15:27
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_custom_zenith', '0012_alter_customuser_last_login'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BackgroundTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_path', models.CharField(help_text='Caminho da função da tarefa (ex.: app_custom_zenith.tasks.send_welcome_email)', max_length=200, verbose_name='tarefa')),
+                ('kwargs', models.JSONField(blank=True, default=dict, verbose_name='argumentos')),
+                ('status', models.CharField(choices=[('pending', 'Pendente'), ('running', 'Em execução'), ('done', 'Concluída'), ('failed', 'Falhou')], default='pending', max_length=10, verbose_name='status')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='tentativas')),
+                ('max_attempts', models.PositiveSmallIntegerField(default=5, verbose_name='máximo de tentativas')),
+                ('run_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='executar em')),
+                ('locked_at', models.DateTimeField(blank=True, null=True, verbose_name='iniciada em')),
+                ('last_error', models.TextField(blank=True, verbose_name='último erro')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='data de criação')),
+            ],
+            options={
+                'verbose_name': 'tarefa em segundo plano',
+                'verbose_name_plural': 'tarefas em segundo plano',
+                'ordering': ['run_at'],
+                'indexes': [models.Index(fields=['status', 'run_at'], name='app_custom__status_0c4307_idx')],
+            },
+        ),
+    ]
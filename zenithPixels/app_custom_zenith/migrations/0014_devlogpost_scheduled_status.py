@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-19 15:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_custom_zenith', '0013_backgroundtask'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='devlogpost',
+            name='status',
+            field=models.CharField(choices=[('draft', 'Rascunho'), ('scheduled', 'Agendado'), ('published', 'Publicado'), ('archived', 'Arquivado')], db_index=True, default='draft', max_length=10, verbose_name='status'),
+        ),
+    ]
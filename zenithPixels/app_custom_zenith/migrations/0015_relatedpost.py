@@ -0,0 +1,30 @@
+# Generated by Django 5.2.1 on 2026-10-19 15:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_custom_zenith', '0014_devlogpost_scheduled_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedPost',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(verbose_name='similaridade')),
+                ('rank', models.PositiveSmallIntegerField(verbose_name='posição')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_entries', to='app_custom_zenith.devlogpost', verbose_name='post')),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='app_custom_zenith.devlogpost', verbose_name='post relacionado')),
+            ],
+            options={
+                'verbose_name': 'post relacionado',
+                'verbose_name_plural': 'posts relacionados',
+                'ordering': ['post', 'rank'],
+                'unique_together': {('post', 'rank')},
+            },
+        ),
+    ]
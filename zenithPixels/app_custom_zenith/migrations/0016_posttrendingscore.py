@@ -0,0 +1,27 @@
+# Generated by Django 5.2.1 on 2026-10-19 15:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_custom_zenith', '0015_relatedpost'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostTrendingScore',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='trending', serialize=False, to='app_custom_zenith.devlogpost', verbose_name='post')),
+                ('score', models.FloatField(default=0, verbose_name='pontuação')),
+                ('pending', models.FloatField(default=0, verbose_name='pontos pendentes')),
+                ('decayed_at', models.DateTimeField(blank=True, null=True, verbose_name='último decaimento')),
+            ],
+            options={
+                'verbose_name': 'pontuação de tendência',
+                'verbose_name_plural': 'pontuações de tendência',
+            },
+        ),
+    ]
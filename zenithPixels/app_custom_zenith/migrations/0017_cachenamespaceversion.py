@@ -0,0 +1,25 @@
+# Generated by Django 5.2.1 on 2026-10-19 15:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_custom_zenith', '0016_posttrendingscore'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CacheNamespaceVersion',
+            fields=[
+                ('namespace', models.CharField(max_length=50, primary_key=True, serialize=False, verbose_name='namespace')),
+                ('version', models.PositiveBigIntegerField(default=1, verbose_name='versão')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='última atualização')),
+            ],
+            options={
+                'verbose_name': 'versão de cache',
+                'verbose_name_plural': 'versões de cache',
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-19 15:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_custom_zenith', '0017_cachenamespaceversion'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='devlogpost',
+            name='featured_image',
+            field=models.ImageField(blank=True, db_index=True, help_text='Imagem principal do post (recomendado 1200x630 pixels)', null=True, upload_to='devlog_images/%Y/%m/', verbose_name='imagem destacada'),
+        ),
+        migrations.AlterField(
+            model_name='userprofile',
+            name='profile_image',
+            field=models.ImageField(blank=True, db_index=True, help_text='Imagem de perfil do usuário', null=True, upload_to='profile_images/%Y/%m/', verbose_name='foto de perfil'),
+        ),
+    ]
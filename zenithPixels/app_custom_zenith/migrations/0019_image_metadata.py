@@ -0,0 +1,53 @@
+# Generated by Django 5.2.1 on 2026-10-19 15:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_custom_zenith', '0018_media_reference_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='devlogpost',
+            name='featured_image_color',
+            field=models.CharField(blank=True, editable=False, max_length=7, null=True, verbose_name='cor predominante da imagem'),
+        ),
+        migrations.AddField(
+            model_name='devlogpost',
+            name='featured_image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='altura da imagem'),
+        ),
+        migrations.AddField(
+            model_name='devlogpost',
+            name='featured_image_placeholder',
+            field=models.TextField(blank=True, editable=False, help_text='Miniatura borrada (data URI) exibida enquanto a imagem carrega', null=True, verbose_name='placeholder da imagem'),
+        ),
+        migrations.AddField(
+            model_name='devlogpost',
+            name='featured_image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='largura da imagem'),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='profile_image_color',
+            field=models.CharField(blank=True, editable=False, max_length=7, null=True, verbose_name='cor predominante da foto'),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='profile_image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='altura da foto'),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='profile_image_placeholder',
+            field=models.TextField(blank=True, editable=False, help_text='Miniatura borrada (data URI) exibida enquanto a imagem carrega', null=True, verbose_name='placeholder da foto'),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='profile_image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='largura da foto'),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.1 on 2026-10-19 15:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_custom_zenith', '0019_image_metadata'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Game',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=100, verbose_name='título')),
+                ('slug', models.SlugField(max_length=60, unique=True, verbose_name='slug')),
+                ('tagline', models.CharField(help_text='Frase curta exibida no card da home', max_length=200, verbose_name='chamada')),
+                ('genre', models.CharField(max_length=100, verbose_name='gênero')),
+                ('description', models.TextField(verbose_name='descrição')),
+                ('features', models.TextField(blank=True, help_text='Uma por linha', verbose_name='características')),
+                ('cover_image', models.CharField(help_text='Arte em static/ (ex: img/lility.jpeg) ou URL completa', max_length=255, verbose_name='imagem do card')),
+                ('banner_image', models.CharField(blank=True, help_text='Deixe em branco para usar a imagem do card', max_length=255, verbose_name='imagem dos detalhes')),
+                ('platforms', models.CharField(blank=True, max_length=200, verbose_name='plataformas')),
+                ('release', models.CharField(blank=True, max_length=50, verbose_name='lançamento')),
+                ('engine', models.CharField(blank=True, max_length=50, verbose_name='engine')),
+                ('link', models.CharField(blank=True, help_text='Site oficial ou página do jogo (URL completa ou caminho)', max_length=255, verbose_name='link')),
+                ('position', models.PositiveSmallIntegerField(default=0, verbose_name='posição')),
+                ('is_active', models.BooleanField(default=True, verbose_name='ativo')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='última atualização')),
+            ],
+            options={
+                'verbose_name': 'jogo',
+                'verbose_name_plural': 'jogos',
+                'ordering': ['position', 'title'],
+            },
+        ),
+        migrations.CreateModel(
+            name='StudioMember',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, verbose_name='nome completo')),
+                ('short_name', models.CharField(blank=True, help_text='Deixe em branco para usar o nome completo', max_length=60, verbose_name='nome no card')),
+                ('role', models.CharField(max_length=60, verbose_name='função')),
+                ('bio', models.TextField(blank=True, verbose_name='bio')),
+                ('image', models.CharField(blank=True, help_text='Arte em static/ (ex: img/willian.jpeg, com variantes otimizadas) ou URL completa', max_length=255, verbose_name='foto')),
+                ('social_links', models.JSONField(blank=True, default=dict, help_text='Ex: {"linkedin": "https://...", "github": "https://..."}', verbose_name='redes sociais')),
+                ('accent', models.CharField(choices=[('purple', 'Roxo'), ('blue', 'Azul'), ('yellow', 'Amarelo'), ('green', 'Verde')], default='purple', max_length=10, verbose_name='cor da borda')),
+                ('position', models.PositiveSmallIntegerField(default=0, verbose_name='posição')),
+                ('is_active', models.BooleanField(default=True, verbose_name='ativo')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='última atualização')),
+            ],
+            options={
+                'verbose_name': 'integrante da equipe',
+                'verbose_name_plural': 'integrantes da equipe',
+                'ordering': ['position', 'name'],
+            },
+        ),
+    ]
@@ -0,0 +1,121 @@
+from django.db import migrations
+
+# Conteúdo que estava fixo em index/home.html
+TEAM = [
+    {
+        'name': 'Ana Silva',
+        'short_name': 'Enzo AQUI',
+        'role': 'Artista 3D',
+        'bio': 'Apaixonada por dar vida a personagens e mundos fantásticos. Ana é a mestre por trás dos visuais incríveis dos nossos jogos.',
+        'image': 'https://placehold.co/400x400/6d28d9/ffffff?text=Ana',
+        'social_links': {'linkedin': '#', 'artstation': '#'},
+        'accent': 'purple',
+    },
+    {
+        'name': 'Willian de Sena Chiquinato',
+        'short_name': 'Willian de S. Chiquinato',
+        'role': 'Game Developer',
+        'bio': 'Gosto de aprender coisas inovadoras e não tenho medo de dar minha cara onde ainda não consigo ver o chão.',
+        'image': 'img/willian.jpeg',
+        'social_links': {
+            'linkedin': 'https://www.linkedin.com/in/willian-de-sena-chiquinato-97b857260',
+            'github': 'https://willianchiquinato.github.io/Portifolio-Zadek/',
+        },
+        'accent': 'blue',
+    },
+    {
+        'name': 'Eduardo Lucio Oliveira',
+        'short_name': 'Eduardo L. Oliveira',
+        'role': 'Software Developer',
+        'bio': 'Me desafio constantemente a criar soluções inovadoras e eficientes, sempre buscando aprimorar minhas habilidades e contribuir para projetos impactantes, seja em um cenário de mercado ou interno.',
+        'image': 'img/Edu.jpeg',
+        'social_links': {
+            'linkedin': 'http://linkedin.com/in/eduloliveira/',
+            'github': 'https://eduloliveira.github.io/business_blog/home.html',
+        },
+        'accent': 'yellow',
+    },
+    {
+        'name': 'Daniel Oliveira',
+        'short_name': 'Vitorrr AQUIs',
+        'role': 'Produtor',
+        'bio': 'Daniel é o maestro que mantém todos os projetos no caminho certo. Com sua experiência em gestão de projetos e paixão por jogos, ele garante que todas as peças se encaixem perfeitamente e que os prazos sejam cumpridos sem sacrificar a qualidade. Sua capacidade de resolver problemas é lendária no estúdio.',
+        'image': 'https://placehold.co/400x400/15803d/ffffff?text=Daniel',
+        'social_links': {'linkedin': '#', 'twitter': '#'},
+        'accent': 'green',
+    },
+]
+
+GAMES = [
+    {
+        'title': 'Lilith: Keys of Power',
+        'slug': 'lilith',
+        'tagline': 'Uma jornada épica em Pixel Art para derrubar um império opressor.',
+        'genre': 'RPG de Ação / MetroidVania',
+        'description': 'Junte-se a Lilith em sua missão para derrubar um império opressor dentro de uma montanha. Explore um vasto mundo em Pixel Art 2D, desvende segredos ancestrais e liberte seu povo nesta aventura épica cheia de ação e mistério.',
+        'features': '\n'.join([
+            'Mundo em Pixel Art 2D interconectado',
+            'Combate fluido com habilidades progressivas',
+            'Narrativa impactante com escolhas significativas',
+            'Exploração vertical com upgrades',
+            'Trilha sonora atmosférica imersiva',
+        ]),
+        'cover_image': 'img/lility.jpeg',
+        'platforms': 'PC, Nintendo Switch, PlayStation 5, Xbox Series X/S',
+        'release': 'Q4 2024',
+        'engine': 'Godot Engine 4',
+        'link': 'https://willianchiquinato.github.io/Lility_Search_Truth/',
+    },
+    {
+        'title': 'Chama Espiral',
+        'slug': 'chama-espiral',
+        'tagline': 'Uma jornada de puzzles em ruínas geométricas com uma chama misteriosa.',
+        'genre': 'Puzzle / Plataforma',
+        'description': 'Explore ruínas geométricas...',
+        'features': '\n'.join([
+            'Sistema de puzzles baseado em um único item',
+            'Níveis projetados com proporção áurea',
+            'Mecânica de risco: 5seg sem a chama = reinício',
+            'Câmera dinâmica que se adapta a cada situação',
+            'Estética geométrica e arquitetura perfeccionista',
+        ]),
+        'cover_image': 'img/chama_Espiral.jpeg',
+        'banner_image': 'img/1080.png',
+        'platforms': 'PC, Nintendo Switch',
+        'release': 'Q3 2024',
+        'engine': 'Godot Engine 4',
+        'link': '/chama_espiral/',
+    },
+]
+
+
+def seed_catalog(apps, schema_editor):
+    StudioMember = apps.get_model('app_custom_zenith', 'StudioMember')
+    Game = apps.get_model('app_custom_zenith', 'Game')
+    StudioMember.objects.bulk_create(
+        [StudioMember(position=position, **data) for position, data in enumerate(TEAM)]
+    )
+    Game.objects.bulk_create(
+        [Game(position=position, **data) for position, data in enumerate(GAMES)],
+        ignore_conflicts=True
+    )
+
+
+def unseed_catalog(apps, schema_editor):
+    apps.get_model('app_custom_zenith', 'StudioMember').objects.filter(
+        name__in=[member['name'] for member in TEAM]
+    ).delete()
+    apps.get_model('app_custom_zenith', 'Game').objects.filter(
+        slug__in=[game['slug'] for game in GAMES]
+    ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_custom_zenith', '0020_studiomember_game'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_catalog, unseed_catalog),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.1 on 2026-10-19 15:59
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_custom_zenith', '0021_seed_catalog'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LoreProgress',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='lore_progress', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='usuário')),
+                ('unlocked', models.JSONField(blank=True, default=list, verbose_name='fragmentos desbloqueados')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='última atualização')),
+            ],
+            options={
+                'verbose_name': 'progresso na lore',
+                'verbose_name_plural': 'progressos na lore',
+            },
+        ),
+    ]
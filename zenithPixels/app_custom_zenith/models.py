@@ -2,12 +2,35 @@ from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.db import models
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
+import json
 import re
 from django.urls import reverse
 from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
-from datetime import date
+from datetime import date, timedelta
 from django.utils.text import slugify
+from django.conf import settings
+from .hashing import hash_password, verify_password
+
+
+def coalesced_touch(instance, field_name, interval):
+    """
+    Grava timezone.now() em um campo de data/hora no máximo uma vez a cada
+    `interval` segundos. O UPDATE é condicional, então vários workers
+    tentando ao mesmo tempo resultam em uma única escrita.
+    Retorna True se a linha foi atualizada.
+    """
+    now = timezone.now()
+    current = getattr(instance, field_name)
+    threshold = now - timedelta(seconds=interval)
+    
+    if current and current > threshold:
+        return False
+    
+    stale = models.Q(**{f'{field_name}__isnull': True}) | models.Q(**{f'{field_name}__lte': threshold})
+    updated = type(instance)._default_manager.filter(stale, pk=instance.pk).update(**{field_name: now})
+    setattr(instance, field_name, now)
+    return bool(updated)
 
 class CustomUserManager(BaseUserManager):
     """Gerenciador personalizado para o modelo CustomUser"""
@@ -79,7 +102,7 @@ class CustomUser(AbstractUser):
     )
     
     date_joined = models.DateTimeField(_('data de cadastro'), auto_now_add=True)
-    last_login = models.DateTimeField(_('último login'), auto_now=True)
+    last_login = models.DateTimeField(_('último login'), blank=True, null=True)
     is_active = models.BooleanField(_('ativo'), default=True)
     
     objects = CustomUserManager()
@@ -116,6 +139,26 @@ class CustomUser(AbstractUser):
     def get_short_name(self):
         return self.first_name
     
+    def set_password(self, raw_password):
+        """Gera o hash da senha no pool dedicado (ver hashing.py)"""
+        self.password = hash_password(raw_password)
+        self._password = raw_password
+    
+    def check_password(self, raw_password):
+        """Verifica a senha no pool dedicado, atualizando hashes antigos"""
+        is_correct, must_update = verify_password(raw_password, self.password)
+        if is_correct and must_update:
+            self.set_password(raw_password)
+            # Atualização de hash não conta como troca de senha
+            self._password = None
+            self.save(update_fields=['password'])
+        return is_correct
+    
+    def touch_last_login(self):
+        """Atualiza last_login respeitando LAST_LOGIN_UPDATE_INTERVAL"""
+        interval = getattr(settings, 'LAST_LOGIN_UPDATE_INTERVAL', 15 * 60)
+        return coalesced_touch(self, 'last_login', interval)
+    
     @property
     def age(self):
         if self.data_nascimento:
@@ -139,6 +182,27 @@ class CustomUser(AbstractUser):
     def formatted_phone(self, value):
         pass
 
+# Metadados das imagens enviadas (dimensões, cor e placeholder), calculados
+# em segundo plano por imagemeta.update_image_metadata
+IMAGE_METADATA_SUFFIXES = ('width', 'height', 'color', 'placeholder')
+
+
+def reset_image_metadata(instance, field_name, save_kwargs):
+    """
+    Descarta os metadados quando a imagem foi trocada (upload ainda não
+    gravado) ou removida; o signal enfileira o novo cálculo após o save.
+    """
+    image = getattr(instance, field_name)
+    if image and image._committed:
+        return
+    names = [f'{field_name}_{suffix}' for suffix in IMAGE_METADATA_SUFFIXES]
+    for name in names:
+        setattr(instance, name, None)
+    update_fields = save_kwargs.get('update_fields')
+    if update_fields is not None and field_name in update_fields:
+        save_kwargs['update_fields'] = list(update_fields) + names
+
+
 class UserProfile(models.Model):
     user = models.OneToOneField(
         CustomUser,
@@ -177,8 +241,35 @@ class UserProfile(models.Model):
         upload_to='profile_images/%Y/%m/',
         null=True,
         blank=True,
+        db_index=True,  # verificação de referências do storage por conteúdo
         help_text=_('Imagem de perfil do usuário')
     )
+    profile_image_width = models.PositiveIntegerField(
+        _('largura da foto'),
+        null=True,
+        blank=True,
+        editable=False
+    )
+    profile_image_height = models.PositiveIntegerField(
+        _('altura da foto'),
+        null=True,
+        blank=True,
+        editable=False
+    )
+    profile_image_color = models.CharField(
+        _('cor predominante da foto'),
+        max_length=7,
+        null=True,
+        blank=True,
+        editable=False
+    )
+    profile_image_placeholder = models.TextField(
+        _('placeholder da foto'),
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=_('Miniatura borrada (data URI) exibida enquanto a imagem carrega')
+    )
     
     twitter = models.CharField(
         _('Twitter'),
@@ -241,6 +332,10 @@ class UserProfile(models.Model):
             'dark_mode': self.dark_mode
         }
     
+    def save(self, *args, **kwargs):
+        reset_image_metadata(self, 'profile_image', kwargs)
+        super().save(*args, **kwargs)
+    
     def get_profile_image_url(self):
         if self.profile_image and hasattr(self.profile_image, 'url'):
             return self.profile_image.url
@@ -308,18 +403,20 @@ class PostCategory(models.Model):
             {'name': 'Notícias', 'slug': 'noticias', 'color': '#2563eb'}
         ]
         
-        for cat_data in defaults:
-            cls.objects.get_or_create(
-                slug=cat_data['slug'],
-                defaults={
-                    'name': cat_data['name'],
-                    'color': cat_data['color']
-                }
-            )
+        # Um único INSERT; categorias já existentes são mantidas como estão
+        cls.objects.bulk_create(
+            [cls(**cat_data) for cat_data in defaults],
+            ignore_conflicts=True
+        )
+        
+        # bulk_create não dispara signals
+        from .invalidation import DEVLOG, invalidation_bus
+        invalidation_bus.bump(DEVLOG)
 
 class DevlogPost(models.Model):
     class Status(models.TextChoices):
         DRAFT = 'draft', _('Rascunho')
+        SCHEDULED = 'scheduled', _('Agendado')
         PUBLISHED = 'published', _('Publicado')
         ARCHIVED = 'archived', _('Arquivado')
     
@@ -366,8 +463,35 @@ class DevlogPost(models.Model):
         verbose_name=_('imagem destacada'),
         blank=True,
         null=True,
+        db_index=True,  # verificação de referências do storage por conteúdo
         help_text=_('Imagem principal do post (recomendado 1200x630 pixels)')
     )
+    featured_image_width = models.PositiveIntegerField(
+        _('largura da imagem'),
+        null=True,
+        blank=True,
+        editable=False
+    )
+    featured_image_height = models.PositiveIntegerField(
+        _('altura da imagem'),
+        null=True,
+        blank=True,
+        editable=False
+    )
+    featured_image_color = models.CharField(
+        _('cor predominante da imagem'),
+        max_length=7,
+        null=True,
+        blank=True,
+        editable=False
+    )
+    featured_image_placeholder = models.TextField(
+        _('placeholder da imagem'),
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=_('Miniatura borrada (data URI) exibida enquanto a imagem carrega')
+    )
     status = models.CharField(
         max_length=10,
         choices=Status.choices,
@@ -430,9 +554,61 @@ class DevlogPost(models.Model):
             
         if self.status == self.Status.PUBLISHED and not self.published_at:
             self.published_at = timezone.now()
-            
+        
+        reset_image_metadata(self, 'featured_image', kwargs)
         super().save(*args, **kwargs)
     
+    def schedule_publication(self, when=None):
+        """
+        Publica o post agora ou, se `when` estiver no futuro, agenda a
+        publicação; o comando publish_scheduled faz a transição na hora
+        marcada. Não salva a instância.
+        """
+        now = timezone.now()
+        if when and when > now:
+            self.status = self.Status.SCHEDULED
+            self.published_at = when
+        else:
+            self.status = self.Status.PUBLISHED
+            # Mantém a data original de posts que já estavam publicados
+            if not self.published_at or self.published_at > now:
+                self.published_at = now
+    
+    @classmethod
+    def publish_due(cls, now=None):
+        """
+        Publica os posts agendados cuja data já chegou. O UPDATE é
+        condicional ao status, então vários schedulers rodando juntos não
+        publicam o mesmo post duas vezes. Retorna quantos foram publicados.
+        """
+        from .feedcache import bump_feed_version_on_commit
+
+        now = now or timezone.now()
+        due = cls.objects.filter(status=cls.Status.SCHEDULED, published_at__lte=now)
+        post_ids = list(due.values_list('id', flat=True))
+        published = due.filter(id__in=post_ids).update(status=cls.Status.PUBLISHED, updated_at=now)
+
+        # update() não dispara signals: faz aqui o que o post_save faria
+        # (feeds, caches em memória, sitemap e posts relacionados)
+        if published:
+            from .invalidation import DEVLOG, invalidation_bus
+            from .taskqueue import enqueue_on_commit
+            from .tasks import refresh_related_posts, schedule_sitemap_rebuild
+            bump_feed_version_on_commit()
+            invalidation_bus.bump(DEVLOG)
+            schedule_sitemap_rebuild()
+            for post_id in post_ids:
+                enqueue_on_commit(refresh_related_posts, post_id=post_id)
+        return published
+    
+    @property
+    def is_scheduled(self):
+        return self.status == self.Status.SCHEDULED
+    
+    @is_scheduled.setter
+    def is_scheduled(self, value):
+        pass
+    
     @property
     def is_published(self):
         return self.status == self.Status.PUBLISHED
@@ -461,6 +637,10 @@ class DevlogPost(models.Model):
     def published(cls):
         return cls.objects.filter(status=cls.Status.PUBLISHED)
     
+    @classmethod
+    def scheduled(cls):
+        return cls.objects.filter(status=cls.Status.SCHEDULED)
+    
     @classmethod
     def drafts(cls):
         return cls.objects.filter(status=cls.Status.DRAFT)
@@ -499,6 +679,7 @@ class DevlogPost(models.Model):
     def status_color(self):
         status_colors = {
             self.Status.DRAFT: 'gray',
+            self.Status.SCHEDULED: 'blue',
             self.Status.PUBLISHED: 'green',
             self.Status.ARCHIVED: 'orange'
         }
@@ -575,4 +756,364 @@ class PostComment(models.Model):
         return f"Comentário de {self.user.get_short_name()} em {self.post.title}"
     
     def get_absolute_url(self):
-        return f"{self.post.get_absolute_url()}#comment-{self.id}"
\ No newline at end of file
+        return f"{self.post.get_absolute_url()}#comment-{self.id}"
+
+class BackgroundTask(models.Model):
+    class Status(models.TextChoices):
+        PENDING = 'pending', _('Pendente')
+        RUNNING = 'running', _('Em execução')
+        DONE = 'done', _('Concluída')
+        FAILED = 'failed', _('Falhou')
+    
+    task_path = models.CharField(
+        max_length=200,
+        verbose_name=_('tarefa'),
+        help_text=_('Caminho da função da tarefa (ex.: app_custom_zenith.tasks.send_welcome_email)')
+    )
+    kwargs = models.JSONField(
+        verbose_name=_('argumentos'),
+        default=dict,
+        blank=True
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=Status.choices,
+        default=Status.PENDING,
+        verbose_name=_('status')
+    )
+    attempts = models.PositiveSmallIntegerField(
+        verbose_name=_('tentativas'),
+        default=0
+    )
+    max_attempts = models.PositiveSmallIntegerField(
+        verbose_name=_('máximo de tentativas'),
+        default=5
+    )
+    run_at = models.DateTimeField(
+        verbose_name=_('executar em'),
+        default=timezone.now
+    )
+    locked_at = models.DateTimeField(
+        verbose_name=_('iniciada em'),
+        null=True,
+        blank=True
+    )
+    last_error = models.TextField(
+        verbose_name=_('último erro'),
+        blank=True
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name=_('data de criação')
+    )
+    
+    class Meta:
+        verbose_name = _('tarefa em segundo plano')
+        verbose_name_plural = _('tarefas em segundo plano')
+        ordering = ['run_at']
+        indexes = [
+            models.Index(fields=['status', 'run_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.task_path} ({self.get_status_display()})"
+
+class RelatedPost(models.Model):
+    """
+    Vizinhos mais similares de cada post publicado, pré-calculados por
+    related.py (TF-IDF). Lidos em ordem de rank pelo índice (post, rank).
+    """
+    post = models.ForeignKey(
+        DevlogPost,
+        on_delete=models.CASCADE,
+        related_name='related_entries',
+        verbose_name=_('post')
+    )
+    related = models.ForeignKey(
+        DevlogPost,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name=_('post relacionado')
+    )
+    score = models.FloatField(
+        verbose_name=_('similaridade')
+    )
+    rank = models.PositiveSmallIntegerField(
+        verbose_name=_('posição')
+    )
+    
+    class Meta:
+        verbose_name = _('post relacionado')
+        verbose_name_plural = _('posts relacionados')
+        unique_together = ('post', 'rank')
+        ordering = ['post', 'rank']
+    
+    def __str__(self):
+        return f"{self.post_id} -> {self.related_id} ({self.score:.3f})"
+
+class PostTrendingScore(models.Model):
+    """
+    Pontuação de tendência de um post com decaimento exponencial (ver
+    trending.py). Eventos somam em `pending`; o comando decay_trending
+    aplica o decaimento e incorpora os pendentes em `score`.
+    """
+    post = models.OneToOneField(
+        DevlogPost,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='trending',
+        verbose_name=_('post')
+    )
+    score = models.FloatField(
+        verbose_name=_('pontuação'),
+        default=0
+    )
+    pending = models.FloatField(
+        verbose_name=_('pontos pendentes'),
+        default=0
+    )
+    decayed_at = models.DateTimeField(
+        verbose_name=_('último decaimento'),
+        null=True,
+        blank=True
+    )
+    
+    class Meta:
+        verbose_name = _('pontuação de tendência')
+        verbose_name_plural = _('pontuações de tendência')
+    
+    def __str__(self):
+        return f"{self.post_id}: {self.score + self.pending:.2f}"
+
+class CacheNamespaceVersion(models.Model):
+    """
+    Versão de um namespace de cache em memória (ver invalidation.py). Cada
+    worker compara as versões periodicamente e descarta os caches locais
+    dos namespaces que mudaram.
+    """
+    namespace = models.CharField(
+        max_length=50,
+        primary_key=True,
+        verbose_name=_('namespace')
+    )
+    version = models.PositiveBigIntegerField(
+        verbose_name=_('versão'),
+        default=1
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name=_('última atualização')
+    )
+    
+    class Meta:
+        verbose_name = _('versão de cache')
+        verbose_name_plural = _('versões de cache')
+    
+    def __str__(self):
+        return f"{self.namespace} v{self.version}"
+
+class StudioMember(models.Model):
+    """Integrante da equipe exibido na home (seção "Conheça a Equipe")"""
+    class Accent(models.TextChoices):
+        PURPLE = 'purple', _('Roxo')
+        BLUE = 'blue', _('Azul')
+        YELLOW = 'yellow', _('Amarelo')
+        GREEN = 'green', _('Verde')
+    
+    name = models.CharField(
+        max_length=100,
+        verbose_name=_('nome completo')
+    )
+    short_name = models.CharField(
+        max_length=60,
+        blank=True,
+        verbose_name=_('nome no card'),
+        help_text=_('Deixe em branco para usar o nome completo')
+    )
+    role = models.CharField(
+        max_length=60,
+        verbose_name=_('função')
+    )
+    bio = models.TextField(
+        verbose_name=_('bio'),
+        blank=True
+    )
+    image = models.CharField(
+        max_length=255,
+        blank=True,
+        verbose_name=_('foto'),
+        help_text=_('Arte em static/ (ex: img/willian.jpeg, com variantes otimizadas) ou URL completa')
+    )
+    social_links = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name=_('redes sociais'),
+        help_text=_('Ex: {"linkedin": "https://...", "github": "https://..."}')
+    )
+    accent = models.CharField(
+        max_length=10,
+        choices=Accent.choices,
+        default=Accent.PURPLE,
+        verbose_name=_('cor da borda')
+    )
+    position = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name=_('posição')
+    )
+    is_active = models.BooleanField(
+        _('ativo'),
+        default=True
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name=_('última atualização')
+    )
+    
+    class Meta:
+        verbose_name = _('integrante da equipe')
+        verbose_name_plural = _('integrantes da equipe')
+        ordering = ['position', 'name']
+    
+    def __str__(self):
+        return self.name
+    
+    @property
+    def card_name(self):
+        return self.short_name or self.name
+    
+    @property
+    def border_class(self):
+        return {
+            self.Accent.PURPLE: 'border-purple-600 dark:border-yellow-400',
+            self.Accent.BLUE: 'border-blue-600 dark:border-yellow-400',
+            self.Accent.YELLOW: 'border-yellow-400',
+            self.Accent.GREEN: 'border-green-600 dark:border-yellow-400',
+        }.get(self.accent, 'border-purple-600 dark:border-yellow-400')
+    
+    @property
+    def social_json(self):
+        return json.dumps(self.social_links or {})
+
+class Game(models.Model):
+    """Jogo do estúdio exibido na home (seção "Nossos Jogos") e nas páginas dos jogos"""
+    title = models.CharField(
+        max_length=100,
+        verbose_name=_('título')
+    )
+    slug = models.SlugField(
+        unique=True,
+        max_length=60,
+        verbose_name=_('slug')
+    )
+    tagline = models.CharField(
+        max_length=200,
+        verbose_name=_('chamada'),
+        help_text=_('Frase curta exibida no card da home')
+    )
+    genre = models.CharField(
+        max_length=100,
+        verbose_name=_('gênero')
+    )
+    description = models.TextField(
+        verbose_name=_('descrição')
+    )
+    features = models.TextField(
+        blank=True,
+        verbose_name=_('características'),
+        help_text=_('Uma por linha')
+    )
+    cover_image = models.CharField(
+        max_length=255,
+        verbose_name=_('imagem do card'),
+        help_text=_('Arte em static/ (ex: img/lility.jpeg) ou URL completa')
+    )
+    banner_image = models.CharField(
+        max_length=255,
+        blank=True,
+        verbose_name=_('imagem dos detalhes'),
+        help_text=_('Deixe em branco para usar a imagem do card')
+    )
+    platforms = models.CharField(
+        max_length=200,
+        blank=True,
+        verbose_name=_('plataformas')
+    )
+    release = models.CharField(
+        max_length=50,
+        blank=True,
+        verbose_name=_('lançamento')
+    )
+    engine = models.CharField(
+        max_length=50,
+        blank=True,
+        verbose_name=_('engine')
+    )
+    link = models.CharField(
+        max_length=255,
+        blank=True,
+        verbose_name=_('link'),
+        help_text=_('Site oficial ou página do jogo (URL completa ou caminho)')
+    )
+    position = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name=_('posição')
+    )
+    is_active = models.BooleanField(
+        _('ativo'),
+        default=True
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name=_('última atualização')
+    )
+    
+    class Meta:
+        verbose_name = _('jogo')
+        verbose_name_plural = _('jogos')
+        ordering = ['position', 'title']
+    
+    def __str__(self):
+        return self.title
+    
+    def save(self, *args, **kwargs):
+        if not self.slug:
+            self.slug = slugify(self.title)
+        super().save(*args, **kwargs)
+    
+    @property
+    def feature_list(self):
+        return [line.strip() for line in self.features.splitlines() if line.strip()]
+    
+    @property
+    def details_image(self):
+        return self.banner_image or self.cover_image
+
+class LoreProgress(models.Model):
+    """
+    Fragmentos de lore que o usuário desbloqueou além dos liberados para
+    todos (ver loremap.py). Uma linha por usuário, lida numa única consulta
+    ao montar o mapa.
+    """
+    user = models.OneToOneField(
+        CustomUser,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='lore_progress',
+        verbose_name=_('usuário')
+    )
+    unlocked = models.JSONField(
+        default=list,
+        blank=True,
+        verbose_name=_('fragmentos desbloqueados')
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name=_('última atualização')
+    )
+    
+    class Meta:
+        verbose_name = _('progresso na lore')
+        verbose_name_plural = _('progressos na lore')
+    
+    def __str__(self):
+        return f"{self.user_id}: {len(self.unlocked)} fragmento(s)"
@@ -0,0 +1,190 @@
+# app_custom_zenith/realtime.py
+import asyncio
+import json
+import threading
+from collections import deque
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+# Quantos comentários novos um evento agrupado carrega no máximo
+MAX_COMMENTS_PER_EVENT = 50
+
+
+def realtime_enabled():
+    """
+    Streams SSE disponíveis? Só sob ASGI: sob WSGI o gerador assíncrono
+    infinito é consumido com async_to_sync e prende o worker para sempre.
+    """
+    return getattr(settings, 'REALTIME_ENABLED', False)
+
+
+def post_channel(post_id):
+    return f'post:{post_id}'
+
+
+def merge_events(current, event):
+    """
+    Junta dois eventos de um post: contadores ficam com o valor mais recente
+    e comentários novos são acumulados.
+    """
+    merged = dict(current or {})
+    comments = merged.get('comments', []) + event.get('comments', [])
+    merged.update(event)
+    if comments:
+        merged['comments'] = comments[-MAX_COMMENTS_PER_EVENT:]
+    return merged
+
+
+class BaseBroker:
+    """
+    Interface de pub/sub usada pelos streams SSE.
+
+    publish() pode ser chamado de qualquer thread (views síncronas ou
+    assíncronas); subscribe() é um gerador assíncrono que entrega eventos
+    já agrupados. Para vários workers, implemente esta interface sobre um
+    broker externo (ex.: Redis pub/sub) e aponte REALTIME_BROKER para ela.
+    """
+
+    def publish(self, channel, event):
+        raise NotImplementedError('Subclasses de BaseBroker devem implementar publish()')
+
+    def subscribe(self, channel):
+        raise NotImplementedError('Subclasses de BaseBroker devem implementar subscribe()')
+
+
+class _ChannelState:
+    """Estado de um canal dentro de um event loop (acessado só pelo loop)"""
+
+    def __init__(self, loop, coalesce_interval):
+        self.loop = loop
+        self.coalesce_interval = coalesce_interval
+        self.subscribers = 0
+        self.pending = None
+        self.flush_handle = None
+        self.sequence = 0
+        self.history = deque(maxlen=20)
+        self.waiter = loop.create_future()
+
+    def push(self, event):
+        self.pending = merge_events(self.pending, event)
+        # Um único flush por intervalo, independente do número de eventos
+        if self.flush_handle is None:
+            self.flush_handle = self.loop.call_later(self.coalesce_interval, self.flush)
+
+    def flush(self):
+        self.flush_handle = None
+        if self.pending is None:
+            return
+        self.sequence += 1
+        self.history.append((self.sequence, self.pending))
+        self.pending = None
+
+        waiter, self.waiter = self.waiter, self.loop.create_future()
+        waiter.set_result(None)
+
+    def events_after(self, sequence):
+        events = [event for seq, event in self.history if seq > sequence]
+        merged = None
+        for event in events:
+            merged = merge_events(merged, event)
+        return merged
+
+
+class InProcessBroker(BaseBroker):
+    """
+    Broker em memória: entrega eventos apenas aos inscritos do mesmo processo.
+
+    Eventos publicados em rajada são agrupados e entregues no máximo uma vez
+    a cada REALTIME_COALESCE_INTERVAL segundos; todos os inscritos de um
+    canal acordam com o mesmo evento, então o custo de publicar não cresce
+    com o número de leitores.
+    """
+
+    def __init__(self):
+        self.coalesce_interval = getattr(settings, 'REALTIME_COALESCE_INTERVAL', 0.5)
+        self._lock = threading.Lock()
+        self._channels = {}
+
+    def publish(self, channel, event):
+        with self._lock:
+            states = list(self._channels.get(channel, {}).values())
+        # Sem inscritos no canal a publicação não custa nada
+        for state in states:
+            state.loop.call_soon_threadsafe(state.push, event)
+
+    async def subscribe(self, channel):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            states = self._channels.setdefault(channel, {})
+            state = states.get(loop)
+            if state is None:
+                state = states[loop] = _ChannelState(loop, self.coalesce_interval)
+            state.subscribers += 1
+
+        sequence = state.sequence
+        try:
+            while True:
+                event = state.events_after(sequence)
+                if event is None:
+                    await asyncio.shield(state.waiter)
+                    continue
+                sequence = state.sequence
+                yield event
+        finally:
+            with self._lock:
+                state.subscribers -= 1
+                if not state.subscribers:
+                    states.pop(loop, None)
+                    if not states and self._channels.get(channel) is states:
+                        del self._channels[channel]
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """Instância do broker configurado em REALTIME_BROKER"""
+    global _broker
+
+    with _broker_lock:
+        if _broker is None:
+            broker_path = getattr(settings, 'REALTIME_BROKER', 'app_custom_zenith.realtime.InProcessBroker')
+            _broker = import_string(broker_path)()
+    return _broker
+
+
+async def sse_stream(channel):
+    """
+    Gera as mensagens Server-Sent Events de um canal, enviando um
+    comentário de heartbeat a cada REALTIME_HEARTBEAT segundos sem eventos
+    para manter a conexão aberta através de proxies.
+    """
+    heartbeat = getattr(settings, 'REALTIME_HEARTBEAT', 15)
+    events = get_broker().subscribe(channel).__aiter__()
+    next_event = asyncio.ensure_future(events.__anext__())
+
+    try:
+        yield 'retry: 3000\n\n'
+        while True:
+            done, _ = await asyncio.wait({next_event}, timeout=heartbeat)
+            if not done:
+                yield ': ping\n\n'
+                continue
+            event = next_event.result()
+            next_event = asyncio.ensure_future(events.__anext__())
+            yield f'event: update\ndata: {json.dumps(event)}\n\n'
+    finally:
+        # Cliente desconectou: encerra a inscrição no broker
+        next_event.cancel()
+        try:
+            await next_event
+        except (asyncio.CancelledError, StopAsyncIteration):
+            pass
+        await events.aclose()
+
+
+def publish_post_event(post_id, **event):
+    """Publica uma atualização (contadores e/ou comentários) de um post"""
+    get_broker().publish(post_channel(post_id), event)
@@ -0,0 +1,65 @@
+# app_custom_zenith/registration.py
+import re
+
+from django.db.models import Q
+from django.utils.translation import gettext_lazy as _
+
+from .models import CustomUser
+
+# Campos únicos verificados no cadastro
+UNIQUE_FIELDS = ('email', 'telefone', 'username')
+
+TAKEN_MESSAGES = {
+    'email': _('Este email já está cadastrado.'),
+    'telefone': _('Este telefone já está cadastrado.'),
+    'username': _('Este nome de usuário já está em uso. Escolha outro.'),
+}
+
+
+def normalize_telefone(telefone):
+    """Mantém apenas os dígitos do telefone"""
+    return re.sub(r'[^\d]', '', telefone or '')
+
+
+def find_taken_fields(email=None, telefone=None, username=None):
+    """
+    Verifica em uma única consulta quais dos valores informados já estão
+    em uso e retorna o conjunto de nomes de campo em conflito.
+    """
+    values = {
+        field: value
+        for field, value in (('email', email), ('telefone', telefone), ('username', username))
+        if value
+    }
+    if not values:
+        return set()
+
+    query = Q()
+    for field, value in values.items():
+        query |= Q(**{field: value})
+
+    # Cada valor é único, então no máximo uma linha por campo
+    rows = CustomUser.objects.filter(query).values_list(*values.keys())[:len(values)]
+
+    taken = set()
+    for row in rows:
+        for field, value in zip(values.keys(), row):
+            if value == values[field]:
+                taken.add(field)
+    return taken
+
+
+def check_availability(email=None, telefone=None, username=None):
+    """Disponibilidade de cada campo informado, no formato usado pela API"""
+    telefone = normalize_telefone(telefone) if telefone else None
+    requested = {'email': email, 'telefone': telefone, 'username': username}
+    taken = find_taken_fields(**requested)
+
+    return {
+        field: {
+            'available': field not in taken,
+            'message': str(TAKEN_MESSAGES[field]) if field in taken else '',
+        }
+        for field, value in requested.items()
+        if value
+    }
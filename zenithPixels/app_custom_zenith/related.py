@@ -0,0 +1,219 @@
+# app_custom_zenith/related.py
+import heapq
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Min
+
+from .models import DevlogPost, RelatedPost
+
+# Palavras comuns demais para indicar assunto
+STOPWORDS = frozenset("""
+    a ao aos as com como da das de do dos e ela ele em entre era essa esse esta
+    este foi for ha isso mais mas na nas nao no nos o os ou para pela pelas pelo
+    pelos por que se sem ser seu sua sao tambem tem um uma uns umas voce ja so
+    the and for with this that from are was
+""".split())
+
+# O título pesa mais que o corpo na hora de definir o assunto do post
+TITLE_WEIGHT = 3
+
+TOKEN_RE = re.compile(r'[a-z0-9]{3,}')
+
+
+def tokenize(text):
+    """Termos em minúsculas e sem acentos, sem stopwords"""
+    text = unicodedata.normalize('NFKD', text or '').encode('ascii', 'ignore').decode().lower()
+    return [term for term in TOKEN_RE.findall(text) if term not in STOPWORDS]
+
+
+class TfidfCorpus:
+    """
+    Contagens de termos, frequência de documentos (DF), vetores TF-IDF
+    (esparsos, normalizados) e índice invertido dos posts publicados,
+    mantidos em memória pelo processo que roda as tarefas.
+
+    sync() compara o updated_at de cada post publicado (uma consulta só com
+    id e data) e carrega o texto apenas dos posts novos ou alterados: o DF
+    é ajustado e só os vetores deles são recalculados. Os demais vetores
+    ficam com o IDF da época em que foram calculados até um sync(full=True),
+    feito por rebuild_related() sem argumentos.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        self.term_counts = {}
+        self.categories = {}
+        self.versions = {}
+        self.document_frequency = Counter()
+        self.vectors = {}
+        self.index = defaultdict(dict)
+
+    def sync(self, full=False):
+        """Atualiza o corpus com o banco; retorna os ids recarregados"""
+        if full:
+            self.clear()
+        published = DevlogPost.objects.filter(status=DevlogPost.Status.PUBLISHED).order_by()
+        current = dict(published.values_list('id', 'updated_at'))
+
+        for post_id in set(self.versions) - set(current):
+            self._remove(post_id)
+        changed = [post_id for post_id, version in current.items() if self.versions.get(post_id) != version]
+        if not changed:
+            return []
+
+        if self.versions:
+            published = published.filter(id__in=changed)
+        for post_id in changed:
+            self._remove(post_id)
+        rows = published.values_list('id', 'category_id', 'title', 'excerpt', 'content', 'updated_at')
+        for post_id, category_id, title, excerpt, content, updated_at in rows:
+            counts = Counter(tokenize(excerpt) + tokenize(content))
+            for term in tokenize(title):
+                counts[term] += TITLE_WEIGHT
+            self.term_counts[post_id] = counts
+            self.categories[post_id] = category_id
+            self.versions[post_id] = updated_at
+            self.document_frequency.update(counts.keys())
+
+        # Com o DF já atualizado por todos os posts carregados
+        for post_id in changed:
+            if post_id in self.term_counts:
+                self._vectorize(post_id)
+        return changed
+
+    def _remove(self, post_id):
+        counts = self.term_counts.pop(post_id, None)
+        if counts is None:
+            return
+        self.document_frequency.subtract(counts.keys())
+        for term in counts:
+            if self.document_frequency[term] <= 0:
+                del self.document_frequency[term]
+        for term in self.vectors.pop(post_id, ()):
+            postings = self.index[term]
+            postings.pop(post_id, None)
+            if not postings:
+                del self.index[term]
+        self.categories.pop(post_id, None)
+        self.versions.pop(post_id, None)
+
+    def _vectorize(self, post_id):
+        total = len(self.term_counts)
+        weights = {
+            term: (1 + math.log(tf)) * (math.log((1 + total) / (1 + self.document_frequency[term])) + 1)
+            for term, tf in self.term_counts[post_id].items()
+        }
+        norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+        vector = {term: w / norm for term, w in weights.items()}
+        self.vectors[post_id] = vector
+        for term, weight in vector.items():
+            self.index[term][post_id] = weight
+
+
+corpus = TfidfCorpus()
+
+
+def similarity_scores(post_id, vectors, index, categories):
+    """Similaridade de cosseno do post com todos os outros que compartilham termos"""
+    bonus = getattr(settings, 'RELATED_POSTS_CATEGORY_BONUS', 0.1)
+    scores = defaultdict(float)
+    for term, weight in vectors[post_id].items():
+        for other_id, other_weight in index[term].items():
+            scores[other_id] += weight * other_weight
+    scores.pop(post_id, None)
+
+    category_id = categories[post_id]
+    for other_id in scores:
+        if categories[other_id] == category_id:
+            scores[other_id] += bonus
+    return scores
+
+
+def top_neighbours(scores, k):
+    # Empate desfeito pelo post mais recente (id maior)
+    return heapq.nlargest(k, ((score, other_id) for other_id, score in scores.items()))
+
+
+def _store(neighbours):
+    """Substitui a lista de vizinhos dos posts informados"""
+    with transaction.atomic():
+        RelatedPost.objects.filter(post_id__in=list(neighbours)).delete()
+        RelatedPost.objects.bulk_create([
+            RelatedPost(post_id=post_id, related_id=related_id, score=score, rank=rank)
+            for post_id, ranked in neighbours.items()
+            for rank, (score, related_id) in enumerate(ranked)
+        ])
+    return len(neighbours)
+
+
+def _neighbours_for(post_ids, vectors, categories, index, k):
+    neighbours = {}
+    for post_id in post_ids:
+        if post_id in vectors:
+            scores = similarity_scores(post_id, vectors, index, categories)
+            neighbours[post_id] = top_neighbours(scores, k)
+        else:
+            # Despublicado ou removido: fica sem vizinhos
+            neighbours[post_id] = []
+    return neighbours
+
+
+def rebuild_related(post_ids=None):
+    """
+    Recalcula os vizinhos dos posts informados (ou de todos os publicados).
+    Use periodicamente para corrigir a deriva do IDF das atualizações
+    incrementais. Retorna quantos posts foram atualizados.
+    """
+    k = getattr(settings, 'RELATED_POSTS_COUNT', 6)
+    with corpus.lock:
+        corpus.sync(full=post_ids is None)
+        targets = list(corpus.vectors) if post_ids is None else set(post_ids)
+        neighbours = _neighbours_for(targets, corpus.vectors, corpus.categories, corpus.index, k)
+
+    if post_ids is None:
+        # Posts que deixaram de estar publicados perdem a lista
+        RelatedPost.objects.exclude(post_id__in=targets).delete()
+    return _store(neighbours)
+
+
+def refresh_related(post_id):
+    """
+    Atualização incremental após um post ser salvo: recalcula a lista dele
+    e apenas a dos posts em que ele entra, sai ou muda de posição.
+    """
+    k = getattr(settings, 'RELATED_POSTS_COUNT', 6)
+    with corpus.lock:
+        corpus.sync()
+        return _refresh(post_id, corpus.vectors, corpus.categories, corpus.index, k)
+
+
+def _refresh(post_id, vectors, categories, index, k):
+    # Quem já lista o post precisa ser recalculado em qualquer caso
+    affected = set(RelatedPost.objects.filter(related_id=post_id).values_list('post_id', flat=True))
+    affected.add(post_id)
+
+    if post_id in vectors:
+        scores = similarity_scores(post_id, vectors, index, categories)
+        current = {
+            row['post_id']: row
+            for row in RelatedPost.objects.filter(post_id__in=list(scores)).values('post_id').annotate(
+                total=Count('id'), lowest=Min('score')
+            )
+        }
+        # Similaridade é simétrica: o post entra na lista de quem tem
+        # vaga ou cujo vizinho mais fraco tem score menor
+        for other_id, score in scores.items():
+            entry = current.get(other_id)
+            if entry is None or entry['total'] < k or score > entry['lowest']:
+                affected.add(other_id)
+
+    return _store(_neighbours_for(affected, vectors, categories, index, k))
@@ -1,10 +1,22 @@
 # app_custom_zentlib/signals/signals.py
-from django.db.models.signals import post_save, pre_save, post_delete
+from django.db.models.signals import post_save, pre_save, post_delete, pre_delete
+from django.contrib.auth.signals import user_logged_in
 from django.dispatch import receiver
-from django.core.mail import send_mail
-from django.template.loader import render_to_string
 from django.conf import settings
-from app_custom_zenith.models import CustomUser, UserProfile, DevlogPost
+from app_custom_zenith.models import (
+    CustomUser, UserProfile, DevlogPost, PostCategory, PostLike, PostComment, RelatedPost,
+    StudioMember, Game,
+)
+from app_custom_zenith.backends import auth_fields_changed, invalidate_cached_user
+from app_custom_zenith.feedcache import bump_feed_version_on_commit
+from app_custom_zenith.catalog import bump_catalog_version_on_commit
+from app_custom_zenith.invalidation import CATALOG, DEVLOG, invalidation_bus
+from app_custom_zenith.trending import record_post_event
+from app_custom_zenith.taskqueue import enqueue_on_commit
+from app_custom_zenith.tasks import (
+    send_welcome_email, delete_media_file, schedule_sitemap_rebuild,
+    refresh_related_posts, rebuild_related_posts, compute_image_metadata,
+)
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,7 +24,7 @@ logger = logging.getLogger(__name__)
 @receiver(post_save, sender=CustomUser)
 def handle_user_creation(sender, instance, created, **kwargs):
     """
-    Signal para criar perfil do usuário e enviar email de boas-vindas
+    Signal para criar perfil do usuário e enfileirar o email de boas-vindas
     quando um novo usuário é registrado.
     """
     if created:
@@ -20,26 +32,55 @@ def handle_user_creation(sender, instance, created, **kwargs):
             # Cria perfil associado
             UserProfile.objects.create(user=instance)
             
-            # Envia email de boas-vindas
+            # O email é enviado pelo worker de tarefas, fora da transação do cadastro
             if not settings.DEBUG:  # Só envia em produção
-                subject = 'Bem-vindo ao ZentlibPixels!'
-                message = render_to_string('emails/welcome_email.html', {
-                    'user': instance,
-                })
-                send_mail(
-                    subject,
-                    message,
-                    settings.DEFAULT_FROM_EMAIL,
-                    [instance.email],
-                    fail_silently=False,
-                    html_message=message
-                )
+                enqueue_on_commit(send_welcome_email, user_id=instance.pk)
                 
             logger.info(f'Novo usuário criado: {instance.email}')
             
         except Exception as e:
             logger.error(f'Erro ao criar perfil para {instance.email}: {str(e)}')
 
+@receiver(pre_save, sender=CustomUser)
+def detect_auth_change(sender, instance, update_fields=None, **kwargs):
+    """
+    Marca saves que alteram senha, is_active ou permissões de staff
+    """
+    instance._auth_changed = auth_fields_changed(instance, update_fields)
+
+@receiver(post_save, sender=CustomUser)
+def invalidate_user_cache(sender, instance, **kwargs):
+    """
+    Invalida o usuário em cache quando ele é alterado (nome, senha, etc.);
+    só mudanças que afetam a autenticação são propagadas aos outros workers
+    """
+    invalidate_cached_user(instance.pk, propagate=getattr(instance, '_auth_changed', True))
+
+@receiver(post_delete, sender=CustomUser)
+def invalidate_deleted_user_cache(sender, instance, **kwargs):
+    invalidate_cached_user(instance.pk, propagate=True)
+
+# Substitui o update_last_login do Django (um save a cada login) pela
+# versão com escrita agrupada
+user_logged_in.disconnect(dispatch_uid='update_last_login')
+
+@receiver(user_logged_in, dispatch_uid='coalesced_last_login')
+def update_last_login(sender, user, **kwargs):
+    """
+    Atualiza last_login no máximo uma vez por LAST_LOGIN_UPDATE_INTERVAL
+    """
+    if user.touch_last_login():
+        invalidate_cached_user(user.pk)
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def invalidate_profile_cache(sender, instance, **kwargs):
+    """
+    Invalida o usuário em cache quando o perfil muda (profile_update,
+    toggle_theme). Só neste worker: nos outros a entrada expira sozinha
+    """
+    invalidate_cached_user(instance.user_id)
+
 @receiver(pre_save, sender=DevlogPost)
 def generate_post_slug(sender, instance, **kwargs):
     """
@@ -50,17 +91,99 @@ def generate_post_slug(sender, instance, **kwargs):
         instance.slug = slugify(instance.title)
         logger.debug(f'Slug gerado para post: {instance.slug}')
 
+@receiver(post_save, sender=DevlogPost)
+@receiver(post_save, sender=UserProfile)
+def schedule_image_metadata(sender, instance, update_fields=None, **kwargs):
+    """
+    Enfileira o cálculo de dimensões, cor e placeholder de uma imagem nova
+    (o save do model zera os metadados quando a imagem muda)
+    """
+    field_name = 'featured_image' if sender is DevlogPost else 'profile_image'
+    if update_fields and field_name not in update_fields:
+        return
+    image = getattr(instance, field_name)
+    if image and getattr(instance, f'{field_name}_width') is None:
+        enqueue_on_commit(
+            compute_image_metadata,
+            model=sender._meta.model_name, pk=instance.pk, name=image.name,
+        )
+
 @receiver(post_delete, sender=DevlogPost)
 def cleanup_post_images(sender, instance, **kwargs):
     """
-    Remove imagens associadas quando um post é deletado
+    Enfileira a remoção das imagens associadas quando um post é deletado
     """
     if instance.featured_image:
-        try:
-            instance.featured_image.delete(save=False)
-            logger.info(f'Imagem removida para post {instance.pk}')
-        except Exception as e:
-            logger.error(f'Erro ao deletar imagem do post {instance.pk}: {str(e)}')
+        enqueue_on_commit(delete_media_file, name=instance.featured_image.name)
+        logger.info(f'Remoção da imagem do post {instance.pk} enfileirada')
+
+@receiver(post_save, sender=DevlogPost)
+@receiver(post_delete, sender=DevlogPost)
+@receiver(post_save, sender=PostCategory)
+@receiver(post_delete, sender=PostCategory)
+def invalidate_feed_cache(sender, instance, update_fields=None, **kwargs):
+    """
+    Invalida listagem, páginas de categoria e feeds com um único incremento
+    da versão do feed, e avisa os caches em memória de todos os workers pelo
+    barramento de invalidação (contador de visualizações não conta como edição)
+    """
+    if update_fields and set(update_fields) <= {'view_count'}:
+        return
+    bump_feed_version_on_commit()
+    invalidation_bus.bump(DEVLOG)
+    schedule_sitemap_rebuild()
+
+@receiver(post_save, sender=StudioMember)
+@receiver(post_delete, sender=StudioMember)
+@receiver(post_save, sender=Game)
+@receiver(post_delete, sender=Game)
+def invalidate_catalog_cache(sender, instance, **kwargs):
+    """
+    Invalida os fragmentos da equipe e dos jogos (home e páginas dos jogos)
+    """
+    bump_catalog_version_on_commit()
+    invalidation_bus.bump(CATALOG)
+
+@receiver(post_save, sender=DevlogPost)
+def schedule_related_posts_refresh(sender, instance, update_fields=None, **kwargs):
+    """
+    Recalcula em segundo plano os posts relacionados afetados pela edição
+    """
+    if update_fields and set(update_fields) <= {'view_count'}:
+        return
+    enqueue_on_commit(refresh_related_posts, post_id=instance.pk)
+
+@receiver(pre_delete, sender=DevlogPost)
+def schedule_related_posts_cleanup(sender, instance, **kwargs):
+    """
+    Posts que listavam o post removido ganham outro vizinho (as linhas
+    somem por CASCADE, então os ids são lidos antes da remoção)
+    """
+    post_ids = list(
+        RelatedPost.objects.filter(related=instance).exclude(post=instance).values_list('post_id', flat=True)
+    )
+    if post_ids:
+        enqueue_on_commit(rebuild_related_posts, post_ids=post_ids)
+
+@receiver(post_save, sender=PostLike)
+def trending_like_added(sender, instance, created, **kwargs):
+    if created:
+        record_post_event(instance.post_id, 'like')
+
+@receiver(post_delete, sender=PostLike)
+def trending_like_removed(sender, instance, origin=None, **kwargs):
+    """
+    Desfaz os pontos de uma curtida removida. Curtidas apagadas em cascata
+    (post ou usuário excluído) não contam: o post pode estar sendo excluído
+    e recriar a pontuação dele violaria a chave estrangeira.
+    """
+    if isinstance(origin, PostLike) or getattr(origin, 'model', None) is PostLike:
+        record_post_event(instance.post_id, 'like', count=-1)
+
+@receiver(post_save, sender=PostComment)
+def trending_comment_added(sender, instance, created, **kwargs):
+    if created:
+        record_post_event(instance.post_id, 'comment')
 
 # Importante para conectar os signals
 default_app_config = 'app_custom_zentlib.apps.AppCustomZentlihConfig'
\ No newline at end of file
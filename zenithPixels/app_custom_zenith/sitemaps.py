@@ -0,0 +1,231 @@
+# app_custom_zenith/sitemaps.py
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime, timezone as dt_timezone
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.db.models import Count, F, Max, Q, Sum
+from django.http import FileResponse, Http404
+from django.urls import reverse
+from django.utils import timezone
+from django.views.decorators.http import condition, require_GET
+
+from .lore import LORE_FRAGMENTS
+from .models import DevlogPost, PostCategory
+
+INDEX_NAME = 'sitemap.xml'
+MANIFEST_NAME = 'manifest.json'
+
+
+def sitemap_root():
+    return Path(getattr(settings, 'SITEMAP_ROOT', Path(settings.BASE_DIR) / 'sitemaps'))
+
+
+def section_filename(name):
+    return f'sitemap-{name}.xml'
+
+
+def absolute_url(path):
+    return getattr(settings, 'SITE_URL', 'http://localhost:8000').rstrip('/') + path
+
+
+# --- Conteúdo de cada seção ---
+
+def post_chunk_signatures():
+    """
+    Assinatura de cada bloco de posts publicados (faixas de SITEMAP_CHUNK_SIZE
+    ids) calculada em uma única consulta agregada. Só os blocos cuja
+    assinatura mudou precisam ter as linhas carregadas e o arquivo reescrito.
+    """
+    size = getattr(settings, 'SITEMAP_CHUNK_SIZE', 5000)
+    rows = DevlogPost.objects.filter(
+        status=DevlogPost.Status.PUBLISHED
+    ).annotate(chunk=F('id') / size).values('chunk').annotate(
+        total=Count('id'),
+        id_sum=Sum('id'),
+        last=Max('updated_at'),
+    ).order_by('chunk')
+
+    return {
+        f"posts-{row['chunk']}": (
+            f"{row['total']}:{row['id_sum']}:{row['last'].isoformat()}",
+            row['last'],
+        )
+        for row in rows
+    }
+
+
+def post_chunk_entries(name):
+    size = getattr(settings, 'SITEMAP_CHUNK_SIZE', 5000)
+    chunk = int(name.split('-', 1)[1])
+    posts = DevlogPost.objects.filter(
+        status=DevlogPost.Status.PUBLISHED,
+        id__gte=chunk * size,
+        id__lt=(chunk + 1) * size,
+    ).order_by('id').values_list('slug', 'updated_at')
+
+    return [
+        (reverse('devlog_post_detail', kwargs={'slug': slug}), updated_at)
+        for slug, updated_at in posts
+    ]
+
+
+def category_entries():
+    """Listagem do devlog e página de cada categoria ativa"""
+    published = Q(posts__status=DevlogPost.Status.PUBLISHED)
+    categories = PostCategory.objects.filter(is_active=True).annotate(
+        last=Max('posts__updated_at', filter=published)
+    ).order_by('slug')
+
+    entries = [(category.get_absolute_url(), category.last) for category in categories]
+    latest = max((last for _, last in entries if last), default=None)
+    return [(reverse('devlog'), latest)] + entries
+
+
+def lore_entries():
+    # Os fragmentos não têm data; o lastmod da seção é o da última mudança
+    return [(reverse('lore_detail', args=[fragment['id']]), None) for fragment in LORE_FRAGMENTS]
+
+
+# Seções pequenas: a assinatura é o hash do próprio XML
+SMALL_SECTIONS = {
+    'categories': category_entries,
+    'lore': lore_entries,
+}
+
+
+# --- Geração dos arquivos ---
+
+def render_urlset(entries):
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">',
+    ]
+    for path, lastmod in entries:
+        lines.append('<url>')
+        lines.append(f'<loc>{escape(absolute_url(path))}</loc>')
+        if lastmod:
+            lines.append(f'<lastmod>{lastmod.date().isoformat()}</lastmod>')
+        lines.append('</url>')
+    lines.append('</urlset>')
+    return '\n'.join(lines) + '\n'
+
+
+def render_index(manifest):
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">',
+    ]
+    for name in sorted(manifest):
+        path = reverse('sitemap_section', kwargs={'name': name})
+        lines.append('<sitemap>')
+        lines.append(f'<loc>{escape(absolute_url(path))}</loc>')
+        lines.append(f"<lastmod>{manifest[name]['lastmod']}</lastmod>")
+        lines.append('</sitemap>')
+    lines.append('</sitemapindex>')
+    return '\n'.join(lines) + '\n'
+
+
+def _write_atomic(path, content):
+    # Escreve em um temporário e renomeia: quem está servindo o arquivo
+    # nunca vê uma versão pela metade
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as tmp:
+            tmp.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _load_manifest(root):
+    try:
+        return json.loads((root / MANIFEST_NAME).read_text(encoding='utf-8'))
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def build_sitemaps(force=False):
+    """
+    Atualiza os arquivos do sitemap em SITEMAP_ROOT de forma incremental:
+    cada seção tem uma assinatura guardada no manifesto e só é reescrita
+    quando ela muda. Retorna o número de arquivos escritos ou removidos.
+    """
+    root = sitemap_root()
+    root.mkdir(parents=True, exist_ok=True)
+    previous = _load_manifest(root)
+    manifest = {}
+    changed = 0
+
+    def is_stale(name, signature):
+        return (
+            force
+            or previous.get(name, {}).get('signature') != signature
+            or not (root / section_filename(name)).exists()
+        )
+
+    for name, (signature, last) in post_chunk_signatures().items():
+        if is_stale(name, signature):
+            _write_atomic(root / section_filename(name), render_urlset(post_chunk_entries(name)))
+            changed += 1
+        manifest[name] = {'signature': signature, 'lastmod': last.date().isoformat()}
+
+    for name, entries in SMALL_SECTIONS.items():
+        content = render_urlset(entries())
+        signature = hashlib.sha1(content.encode('utf-8')).hexdigest()
+        if is_stale(name, signature):
+            _write_atomic(root / section_filename(name), content)
+            lastmod = timezone.now().date().isoformat()
+            changed += 1
+        else:
+            lastmod = previous[name]['lastmod']
+        manifest[name] = {'signature': signature, 'lastmod': lastmod}
+
+    # Blocos que deixaram de existir (todos os posts despublicados/removidos)
+    for name in set(previous) - set(manifest):
+        (root / section_filename(name)).unlink(missing_ok=True)
+        changed += 1
+
+    if changed or not (root / INDEX_NAME).exists():
+        _write_atomic(root / INDEX_NAME, render_index(manifest))
+        _write_atomic(root / MANIFEST_NAME, json.dumps(manifest, indent=2))
+
+    return changed
+
+
+# --- Views: servem os arquivos já gerados ---
+
+def _sitemap_path(name=None):
+    return sitemap_root() / (section_filename(name) if name else INDEX_NAME)
+
+
+def sitemap_last_modified(request, name=None):
+    try:
+        mtime = _sitemap_path(name).stat().st_mtime
+    except FileNotFoundError:
+        return None
+    return datetime.fromtimestamp(mtime, tz=dt_timezone.utc)
+
+
+@require_GET
+@condition(last_modified_func=sitemap_last_modified)
+def sitemap_index(request):
+    path = _sitemap_path()
+    if not path.exists():
+        # Primeiro acesso depois do deploy; depois disso o worker mantém os arquivos
+        build_sitemaps()
+    return FileResponse(open(path, 'rb'), content_type='application/xml')
+
+
+@require_GET
+@condition(last_modified_func=sitemap_last_modified)
+def sitemap_section(request, name):
+    path = _sitemap_path(name)
+    if not path.exists():
+        raise Http404('Sitemap não encontrado')
+    return FileResponse(open(path, 'rb'), content_type='application/xml')
@@ -0,0 +1,53 @@
+# app_custom_zenith/storage.py
+import hashlib
+import os
+import posixpath
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+
+# Prefixo dos arquivos temporários de upload (ignorados pela coleta de órfãos até expirarem)
+TEMP_PREFIX = '.upload-'
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Storage de mídia endereçado pelo conteúdo: o arquivo é gravado como
+    <pasta do upload_to>/<2 primeiros hex>/<sha256><extensão>, então a
+    mesma imagem enviada várias vezes ocupa um único arquivo.
+
+    O hash é calculado enquanto os chunks são copiados para um arquivo
+    temporário, que depois é renomeado atomicamente (nenhum leitor vê um
+    arquivo pela metade). Como o arquivo pode ser compartilhado, a remoção
+    passa pela verificação de referências de mediagc.
+    """
+
+    def _save(self, name, content):
+        folder = name.split('/', 1)[0] if '/' in name else ''
+        extension = os.path.splitext(name)[1].lower()
+        directory = self.path(folder)
+        os.makedirs(directory, exist_ok=True)
+
+        digest = hashlib.sha256()
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=TEMP_PREFIX)
+        try:
+            with os.fdopen(fd, 'wb') as temp_file:
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    temp_file.write(chunk)
+
+            hashed = digest.hexdigest()
+            name = posixpath.join(folder, hashed[:2], hashed + extension)
+            full_path = self.path(name)
+            if os.path.exists(full_path):
+                # Mesmo conteúdo já armazenado: renova o mtime para a coleta
+                # de órfãos não removê-lo antes desta referência ser gravada
+                os.utime(full_path)
+            else:
+                os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                os.chmod(temp_path, self.file_permissions_mode or 0o644)
+                os.replace(temp_path, full_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+        return name
@@ -0,0 +1,121 @@
+# app_custom_zenith/taskqueue.py
+import logging
+import traceback
+from datetime import timedelta
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import BackgroundTask
+
+logger = logging.getLogger(__name__)
+
+
+def task(func):
+    """Marca uma função como tarefa que pode ser enfileirada"""
+    func.is_background_task = True
+    func.task_path = f'{func.__module__}.{func.__qualname__}'
+    return func
+
+
+def enqueue(func, delay=0, max_attempts=None, **kwargs):
+    """
+    Grava a tarefa na fila. Os argumentos precisam ser serializáveis em JSON
+    (passe IDs, não instâncias de modelo).
+    """
+    if not getattr(func, 'is_background_task', False):
+        raise ValueError(f'{func!r} não é uma tarefa (use o decorator @task)')
+
+    return BackgroundTask.objects.create(
+        task_path=func.task_path,
+        kwargs=kwargs,
+        run_at=timezone.now() + timedelta(seconds=delay),
+        max_attempts=max_attempts or getattr(settings, 'TASK_MAX_ATTEMPTS', 5),
+    )
+
+
+def enqueue_on_commit(func, **kwargs):
+    """Enfileira a tarefa só depois que a transação atual for confirmada"""
+    transaction.on_commit(partial(enqueue, func, **kwargs))
+
+
+def _release_stale_tasks():
+    # Tarefas presas em "running" por um worker que morreu voltam para a fila.
+    # A execução interrompida conta como tentativa: uma tarefa que sempre
+    # derruba o worker falha depois de max_attempts em vez de voltar para sempre
+    timeout = getattr(settings, 'TASK_LOCK_TIMEOUT', 10 * 60)
+    stale = BackgroundTask.objects.filter(
+        status=BackgroundTask.Status.RUNNING,
+        locked_at__lt=timezone.now() - timedelta(seconds=timeout),
+    )
+    failed = stale.filter(attempts__gte=F('max_attempts') - 1).update(
+        status=BackgroundTask.Status.FAILED,
+        attempts=F('attempts') + 1,
+        locked_at=None,
+        last_error='Execução interrompida (worker parou ou passou de TASK_LOCK_TIMEOUT)',
+    )
+    if failed:
+        logger.error(f'{failed} tarefa(s) interrompida(s) falharam definitivamente')
+    stale.update(status=BackgroundTask.Status.PENDING, attempts=F('attempts') + 1, locked_at=None)
+
+
+def _claim(task_id):
+    # UPDATE condicional: só um worker consegue mudar pending -> running
+    return BackgroundTask.objects.filter(
+        pk=task_id,
+        status=BackgroundTask.Status.PENDING,
+    ).update(status=BackgroundTask.Status.RUNNING, locked_at=timezone.now()) == 1
+
+
+def run_task(background_task):
+    """Executa uma tarefa já reivindicada, agendando nova tentativa se falhar"""
+    background_task.attempts += 1
+    try:
+        func = import_string(background_task.task_path)
+        if not getattr(func, 'is_background_task', False):
+            raise ValueError(f'{background_task.task_path} não é uma tarefa')
+        func(**background_task.kwargs)
+    except Exception:
+        error = traceback.format_exc()
+        if background_task.attempts < background_task.max_attempts:
+            # Backoff exponencial: base, 2x base, 4x base...
+            base = getattr(settings, 'TASK_RETRY_BACKOFF', 30)
+            delay = base * 2 ** (background_task.attempts - 1)
+            background_task.status = BackgroundTask.Status.PENDING
+            background_task.run_at = timezone.now() + timedelta(seconds=delay)
+            logger.warning(f'Tarefa {background_task.pk} falhou, nova tentativa em {delay}s')
+        else:
+            background_task.status = BackgroundTask.Status.FAILED
+            logger.error(f'Tarefa {background_task.pk} falhou definitivamente:\n{error}')
+        background_task.last_error = error
+    else:
+        background_task.status = BackgroundTask.Status.DONE
+        background_task.last_error = ''
+
+    background_task.locked_at = None
+    background_task.save(update_fields=['status', 'attempts', 'run_at', 'locked_at', 'last_error'])
+    return background_task.status == BackgroundTask.Status.DONE
+
+
+def run_pending(batch_size=20):
+    """Executa até batch_size tarefas vencidas; retorna quantas foram processadas"""
+    _release_stale_tasks()
+
+    due_ids = list(
+        BackgroundTask.objects.filter(
+            status=BackgroundTask.Status.PENDING,
+            run_at__lte=timezone.now(),
+        ).order_by('run_at').values_list('pk', flat=True)[:batch_size]
+    )
+
+    processed = 0
+    for task_id in due_ids:
+        if not _claim(task_id):
+            continue
+        run_task(BackgroundTask.objects.get(pk=task_id))
+        processed += 1
+    return processed
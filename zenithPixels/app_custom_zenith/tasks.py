@@ -0,0 +1,90 @@
+# app_custom_zenith/tasks.py
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import send_mail
+from django.db import transaction
+from django.template.loader import render_to_string
+
+from .imagemeta import update_image_metadata
+from .mediagc import release_media
+from .models import CustomUser
+from .related import rebuild_related, refresh_related
+from .sitemaps import build_sitemaps
+from .taskqueue import enqueue, task
+
+logger = logging.getLogger(__name__)
+
+
+@task
+def send_welcome_email(user_id):
+    """Envia o email de boas-vindas para um novo usuário"""
+    user = CustomUser.objects.filter(pk=user_id).first()
+    if user is None:
+        return
+
+    subject = 'Bem-vindo ao ZentlibPixels!'
+    message = render_to_string('emails/welcome_email.html', {
+        'user': user,
+    })
+    send_mail(
+        subject,
+        message,
+        settings.DEFAULT_FROM_EMAIL,
+        [user.email],
+        fail_silently=False,
+        html_message=message
+    )
+    logger.info(f'Email de boas-vindas enviado para {user.email}')
+
+
+@task
+def delete_media_file(name):
+    """
+    Remove um arquivo do storage de mídia (imagens de posts e perfis) se
+    nenhum outro post ou perfil usa o mesmo conteúdo
+    """
+    if release_media(name):
+        logger.info(f'Arquivo removido: {name}')
+
+
+@task
+def rebuild_sitemaps():
+    """Atualiza os arquivos do sitemap que mudaram"""
+    changed = build_sitemaps()
+    logger.info(f'Sitemap atualizado: {changed} arquivo(s) alterado(s)')
+
+
+def schedule_sitemap_rebuild():
+    """
+    Agenda uma única atualização do sitemap por SITEMAP_REBUILD_DELAY
+    segundos, mesmo com várias edições. A marca da janela só é gravada
+    depois do commit: um rollback não impede a próxima atualização.
+    """
+    delay = getattr(settings, 'SITEMAP_REBUILD_DELAY', 60)
+
+    def schedule():
+        if cache.add('sitemap:rebuild-scheduled', True, delay):
+            enqueue(rebuild_sitemaps, delay=delay)
+
+    transaction.on_commit(schedule)
+
+
+@task
+def refresh_related_posts(post_id):
+    """Atualiza os posts relacionados depois que um post é salvo"""
+    refresh_related(post_id)
+
+
+@task
+def rebuild_related_posts(post_ids):
+    """Recalcula os posts relacionados de uma lista de posts"""
+    rebuild_related(post_ids)
+
+
+@task
+def compute_image_metadata(model, pk, name):
+    """Dimensões, cor e placeholder de uma imagem recém-enviada"""
+    if update_image_metadata(model, pk, name):
+        logger.info(f'Metadados calculados: {name}')
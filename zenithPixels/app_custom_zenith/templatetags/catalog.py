@@ -0,0 +1,27 @@
+from django import template
+
+from .images import variant_url
+
+register = template.Library()
+
+
+@register.filter
+def games_modal_data(games):
+    """
+    Dados do modal de detalhes de cada jogo, por slug, para usar com
+    json_script: {{ games|games_modal_data|json_script:'games-data' }}
+    """
+    return {
+        game.slug: {
+            'title': game.title,
+            'genre': game.genre,
+            'description': game.description,
+            'features': game.feature_list,
+            'image': variant_url(game.details_image, 960),
+            'platforms': game.platforms,
+            'release': game.release,
+            'engine': game.engine,
+            'link': game.link,
+        }
+        for game in games
+    }
@@ -0,0 +1,73 @@
+from urllib.parse import urlsplit
+
+from django import template
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+
+from ..imagevariants import load_manifest, variant_static_path
+
+register = template.Library()
+
+
+def _source_url(path):
+    """URLs completas e caminhos absolutos (ex.: placeholders externos) passam direto"""
+    if urlsplit(path).scheme or path.startswith('/'):
+        return path
+    return static(path)
+
+
+def _srcset(group):
+    return ', '.join(f'{static(variant_static_path(name))} {width}w' for width, name in group['files'])
+
+
+def _attrs(attrs):
+    return format_html_join('', ' {}="{}"', ((key, value) for key, value in attrs.items() if value is not None))
+
+
+@register.simple_tag
+def picture(path, alt='', sizes='100vw', loading='lazy', decoding='async', **attrs):
+    """
+    <picture> com as variantes AVIF/WebP de uma arte de static/img e um
+    <img> com srcset no formato original. Sem variantes geradas (manifest
+    ausente ou imagem fora dele) vira um <img> simples apontando para o
+    original, ou para a própria URL se `path` for uma. Atributos extras
+    (class, style, fetchpriority...) vão no <img>.
+
+        {% picture 'img/estudio.png' alt='Estúdio' sizes='(min-width: 768px) 50vw, 100vw' class='w-full' %}
+    """
+    entry = load_manifest().get(path)
+    img_attrs = {'alt': alt, 'loading': loading, 'decoding': decoding, **attrs}
+    if entry is None:
+        return format_html('<img src="{}"{}>', _source_url(path), _attrs(img_attrs))
+
+    fallback = entry['fallback']
+    largest = fallback['files'][-1][1]
+    img_attrs = {
+        'src': static(variant_static_path(largest)),
+        'srcset': _srcset(fallback),
+        'sizes': sizes,
+        'width': entry['width'],
+        'height': entry['height'],
+        **img_attrs,
+    }
+    sources = format_html_join(
+        '', '<source type="{}" srcset="{}" sizes="{}">',
+        ((group['type'], _srcset(group), sizes) for group in entry['sources']),
+    )
+    return format_html('<picture>{}<img{}></picture>', sources, _attrs(img_attrs))
+
+
+@register.simple_tag
+def variant_url(path, width, type='image/webp'):
+    """
+    URL da menor variante com pelo menos `width` pixels (ou a maior que
+    existir), para imagens trocadas via JavaScript. Usa o formato `type`
+    se ele foi gerado e o formato original caso contrário.
+    """
+    entry = load_manifest().get(path)
+    if entry is None:
+        return _source_url(path)
+
+    group = next((g for g in entry['sources'] if g['type'] == type), entry['fallback'])
+    name = next((name for w, name in group['files'] if w >= int(width)), group['files'][-1][1])
+    return static(variant_static_path(name))
@@ -1,3 +1,839 @@
-from django.test import TestCase
+import gzip
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+from datetime import date, timedelta
+from itertools import count
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib import admin
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection, router, transaction
+from django.db.models.signals import post_save
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+
+from . import db_routers, loremap
+from .backends import CachedModelBackend
+from .categories import CategoryRegistry
+from .fileserving import INLINE_MEDIA_TYPES, FileIndex, serve_file
+from .imagemeta import update_image_metadata
+from .invalidation import CATALOG, DEVLOG, USERS, InvalidationBus, invalidation_bus
+from .mediagc import collect_orphans, release_media
+from .middleware import CompressionMiddleware, ReplicaPinningMiddleware, brotli
+from .models import (
+    BackgroundTask, CacheNamespaceVersion, CustomUser, DevlogPost, Game, LoreProgress, PostCategory, PostComment,
+    PostLike, PostTrendingScore, RelatedPost, UserProfile,
+)
+from .related import TfidfCorpus, corpus, rebuild_related, refresh_related
+from .taskqueue import run_pending
+from .throttling import client_ip, is_login_throttled, register_login_attempt
+
+
+_phones = count(1)
+
+
+def create_user(username='leitor', **extra_fields):
+    return CustomUser.objects.create_user(
+        email=f'{username}@example.com',
+        username=username,
+        password='Senha-forte-123',
+        telefone=extra_fields.pop('telefone', f'11 9{next(_phones):08d}'),
+        data_nascimento=date(2000, 1, 1),
+        **extra_fields
+    )
+
+
+def png_bytes(size=(8, 8), color='purple'):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, color).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+class TempMediaMixin:
+    """MEDIA_ROOT temporário: os testes não tocam em media/"""
+
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        media_settings = override_settings(MEDIA_ROOT=self.media_root)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+
+
+def create_post(author, title='Post de teste', **extra_fields):
+    category, _ = PostCategory.objects.get_or_create(name='Devlog', defaults={'slug': 'devlog'})
+    extra_fields.setdefault('status', DevlogPost.Status.PUBLISHED)
+    extra_fields.setdefault('published_at', timezone.now())
+    extra_fields.setdefault('content', 'Conteúdo do post de teste.')
+    return DevlogPost.objects.create(
+        title=title,
+        category=category,
+        author=author,
+        **extra_fields
+    )
+
+
+class RealtimeEventsTests(TestCase):
+    def setUp(self):
+        self.post = create_post(create_user())
+
+    @override_settings(REALTIME_ENABLED=False)
+    def test_stream_unavailable_without_asgi(self):
+        response = self.client.get(reverse('post_events', args=[self.post.id]))
+        self.assertEqual(response.status_code, 204)
+
+        page = self.client.get(self.post.get_absolute_url())
+        self.assertNotContains(page, 'EventSource(')
+
+    @override_settings(REALTIME_ENABLED=True)
+    def test_page_subscribes_when_enabled(self):
+        page = self.client.get(self.post.get_absolute_url())
+        self.assertContains(page, reverse('post_events', args=[self.post.id]))
+
+
+class TrendingSignalTests(TestCase):
+    def setUp(self):
+        self.author = create_user('autor')
+        self.reader = create_user('leitor')
+        self.post = create_post(self.author)
+        PostLike.objects.create(user=self.reader, post=self.post)
+
+    def test_unlike_removes_points(self):
+        pending = PostTrendingScore.objects.get(post=self.post).pending
+        PostLike.objects.get(user=self.reader, post=self.post).delete()
+        self.assertLess(PostTrendingScore.objects.get(post=self.post).pending, pending)
+
+    def test_deleting_post_with_likes(self):
+        self.post.delete()
+        connection.check_constraints()
+        self.assertFalse(PostTrendingScore.objects.exists())
+
+    def test_deleting_user_with_likes(self):
+        self.reader.delete()
+        connection.check_constraints()
+        self.assertFalse(PostLike.objects.exists())
+
+    def test_deleting_author_with_liked_post(self):
+        self.author.delete()
+        connection.check_constraints()
+        self.assertFalse(PostTrendingScore.objects.exists())
+
+
+class CachedUserTests(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.backend = CachedModelBackend()
+
+    def test_deactivation_in_other_worker(self):
+        invalidation_bus.check(force=True)
+        self.assertIsNotNone(self.backend.get_user(self.user.pk))
+
+        # Outro worker desativa a conta: o cache local deste ainda tem o usuário
+        CustomUser.objects.filter(pk=self.user.pk).update(is_active=False)
+        InvalidationBus()._bump(USERS)
+
+        self.assertEqual(invalidation_bus.check(force=True), [USERS])
+        self.assertIsNone(self.backend.get_user(self.user.pk))
+
+    def users_version(self):
+        return CacheNamespaceVersion.objects.filter(namespace=USERS).values_list('version', flat=True).first()
+
+    def test_cosmetic_changes_stay_local(self):
+        version = self.users_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.profile.dark_mode = not self.user.profile.dark_mode
+            self.user.profile.save(update_fields=['dark_mode'])
+            self.user.first_name = 'Outro'
+            self.user.save()
+        self.assertEqual(self.users_version(), version)
+
+    def test_password_change_propagates(self):
+        version = self.users_version() or 0
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.set_password('Outra-senha-456')
+            self.user.save()
+        self.assertEqual(self.users_version(), version + 1)
+
+
+class SitemapScheduleTests(TestCase):
+    def setUp(self):
+        self.author = create_user('autor')
+        cache.delete('sitemap:rebuild-scheduled')
+
+    def rebuild_tasks(self):
+        return BackgroundTask.objects.filter(task_path='app_custom_zenith.tasks.rebuild_sitemaps')
+
+    def test_rollback_does_not_hold_window(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    create_post(self.author)
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        self.assertIsNone(cache.get('sitemap:rebuild-scheduled'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            create_post(self.author)
+        self.assertEqual(self.rebuild_tasks().count(), 1)
+
+    def test_one_rebuild_per_window(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            post = create_post(self.author)
+        with self.captureOnCommitCallbacks(execute=True):
+            post.title = 'Outro título'
+            post.save()
+        self.assertEqual(self.rebuild_tasks().count(), 1)
+
+
+class PublishDueTests(TestCase):
+    def test_publishing_schedules_sitemap_and_related(self):
+        author = create_user('autor')
+        with self.captureOnCommitCallbacks(execute=True):
+            post = create_post(
+                author, status=DevlogPost.Status.SCHEDULED,
+                published_at=timezone.now() - timedelta(minutes=1)
+            )
+        cache.delete('sitemap:rebuild-scheduled')
+        BackgroundTask.objects.all().delete()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(DevlogPost.publish_due(), 1)
+
+        tasks = BackgroundTask.objects.values_list('task_path', 'kwargs')
+        self.assertIn(('app_custom_zenith.tasks.rebuild_sitemaps', {}), tasks)
+        self.assertIn(('app_custom_zenith.tasks.refresh_related_posts', {'post_id': post.pk}), tasks)
+
+
+class CategoryRegistryTests(TestCase):
+    def test_change_before_first_check(self):
+        bus = InvalidationBus()
+        registry = CategoryRegistry()
+        bus.subscribe(DEVLOG, registry.invalidate)
+        PostCategory.objects.create(name='Arte', slug='arte')
+
+        with mock.patch('app_custom_zenith.categories.invalidation_bus', bus):
+            self.assertEqual([category.slug for category in registry.all()], ['arte'])
+
+            # Outro worker cria uma categoria antes do primeiro check() deste
+            PostCategory.objects.create(name='Som', slug='som')
+            InvalidationBus()._bump(DEVLOG)
+
+            self.assertEqual(bus.check(force=True), [DEVLOG])
+            self.assertEqual([category.slug for category in registry.all()], ['arte', 'som'])
+
+
+class InvalidationBusTests(TestCase):
+    """Duas instâncias do barramento fazem o papel de dois workers"""
+
+    def setUp(self):
+        self.worker_a = InvalidationBus()
+        self.worker_b = InvalidationBus()
+        self.calls = []
+        self.worker_b.subscribe(DEVLOG, lambda: self.calls.append(DEVLOG))
+        self.worker_b.start()
+
+    def test_bump_reaches_other_worker(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.worker_a.bump(DEVLOG)
+
+        self.assertEqual(self.worker_b.check(force=True), [DEVLOG])
+        self.assertEqual(self.calls, [DEVLOG])
+        # A mudança é entregue uma única vez
+        self.assertEqual(self.worker_b.check(force=True), [])
+        self.assertEqual(self.calls, [DEVLOG])
+
+    def test_bump_waits_for_commit(self):
+        with self.captureOnCommitCallbacks(execute=False):
+            self.worker_a.bump(DEVLOG)
+        self.assertEqual(self.worker_b.check(force=True), [])
+        self.assertEqual(self.calls, [])
+
+    def test_unrelated_namespace_is_ignored(self):
+        self.worker_a._bump(CATALOG)
+        self.assertEqual(self.worker_b.check(force=True), [CATALOG])
+        self.assertEqual(self.calls, [])
+
+    @override_settings(INVALIDATION_CHECK_INTERVAL=2)
+    def test_check_interval(self):
+        now = time.monotonic() + 60
+        with mock.patch('app_custom_zenith.invalidation.time.monotonic') as monotonic:
+            monotonic.return_value = now
+            self.assertEqual(self.worker_b.check(), [])
+
+            self.worker_a._bump(DEVLOG)
+            monotonic.return_value = now + 1.5
+            with self.assertNumQueries(0):
+                self.assertEqual(self.worker_b.check(), [])
+            self.assertEqual(self.calls, [])
+
+            monotonic.return_value = now + 2
+            self.assertEqual(self.worker_b.check(), [DEVLOG])
+            self.assertEqual(self.calls, [DEVLOG])
+
+
+class LoreMapTests(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.client.force_login(self.user)
+        loremap._layout.update(revision=None, data=None)
+
+    def test_reading_does_not_write_progress(self):
+        with mock.patch.object(loremap, 'compute_lore_layout') as compute:
+            response = self.client.get(reverse('lore_map_detail', args=[1]))
+        self.assertEqual(response.status_code, 200)
+        # Layout vem do arquivo gerado por build_lore_map
+        compute.assert_not_called()
+        self.assertFalse(LoreProgress.objects.exists())
+
+
+
+class ClientIpTests(SimpleTestCase):
+    def request(self, remote_addr, forwarded=None):
+        extra = {'REMOTE_ADDR': remote_addr}
+        if forwarded:
+            extra['HTTP_X_FORWARDED_FOR'] = forwarded
+        return RequestFactory().get('/', **extra)
+
+    @override_settings(TRUSTED_PROXIES=[])
+    def test_header_ignored_without_trusted_proxies(self):
+        self.assertEqual(client_ip(self.request('203.0.113.9', '198.51.100.1')), '203.0.113.9')
+
+    @override_settings(TRUSTED_PROXIES=['127.0.0.1', '10.0.0.0/8'])
+    def test_forwarded_through_trusted_proxies(self):
+        request = self.request('127.0.0.1', '198.51.100.1, 203.0.113.7, 10.0.0.2')
+        self.assertEqual(client_ip(request), '203.0.113.7')
+
+
+@override_settings(LOGIN_THROTTLE_ACCOUNT_LIMIT=2)
+class LoginThrottleTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_failures_do_not_lock_account_for_other_ips(self):
+        attacker = RequestFactory().get('/', REMOTE_ADDR='203.0.113.9')
+        owner = RequestFactory().get('/', REMOTE_ADDR='198.51.100.1')
+        for _ in range(2):
+            register_login_attempt(attacker, 'leitor@example.com', success=False)
+
+        self.assertTrue(is_login_throttled(attacker, 'leitor@example.com'))
+        self.assertFalse(is_login_throttled(owner, 'leitor@example.com'))
+
+
+@override_settings(AVAILABILITY_THROTTLE_LIMIT=2)
+class RegistrationAvailabilityTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_rate_limited_per_ip(self):
+        url = reverse('registration_availability')
+        for _ in range(2):
+            self.assertEqual(self.client.get(url, {'email': 'leitor@example.com'}).status_code, 200)
+        self.assertEqual(self.client.get(url, {'email': 'leitor@example.com'}).status_code, 429)
+        other = self.client.get(url, {'email': 'leitor@example.com'}, REMOTE_ADDR='198.51.100.1')
+        self.assertEqual(other.status_code, 200)
+
+
+class StaleTaskTests(TestCase):
+    def stale_task(self, attempts):
+        return BackgroundTask.objects.create(
+            task_path='app_custom_zenith.tasks.rebuild_sitemaps',
+            status=BackgroundTask.Status.RUNNING,
+            attempts=attempts,
+            max_attempts=3,
+            run_at=timezone.now() + timedelta(hours=1),
+            locked_at=timezone.now() - timedelta(hours=1),
+        )
+
+    def test_release_counts_attempt(self):
+        task = self.stale_task(attempts=0)
+        run_pending()
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.attempts), (BackgroundTask.Status.PENDING, 1))
+
+    def test_fails_after_max_attempts(self):
+        task = self.stale_task(attempts=2)
+        run_pending()
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.attempts), (BackgroundTask.Status.FAILED, 3))
+
+
+class SQLiteSettingsTests(TestCase):
+    def test_busy_timeout_follows_timeout_option(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('Apenas SQLite')
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA busy_timeout')
+            busy_timeout = cursor.fetchone()[0]
+        self.assertEqual(busy_timeout, settings.DATABASES['default']['OPTIONS']['timeout'] * 1000)
+
+
+class RelatedPostsTests(TestCase):
+    def setUp(self):
+        author = create_user('autor')
+        self.dragons = create_post(author, 'Dragões de pixel', content='Dragões voam sobre castelos de pixel.')
+        self.castles = create_post(author, 'Castelos de pixel', content='Castelos e dragões em pixel art.')
+        self.music = create_post(author, 'Trilha sonora', content='Sintetizadores e trilha sonora do jogo.')
+        rebuild_related()
+
+    def tearDown(self):
+        corpus.clear()
+
+    def test_refresh_reloads_only_changed_post(self):
+        self.music.content = 'Trilha sonora dos castelos com dragões.'
+        self.music.save()
+
+        self.assertEqual(corpus.sync(), [self.music.pk])
+        refresh_related(self.music.pk)
+        self.assertIn(self.music.pk, RelatedPost.objects.filter(post=self.dragons).values_list('related_id', flat=True))
+
+        # O vetor do post alterado usa o DF atual, igual ao de um corpus novo
+        fresh = TfidfCorpus()
+        fresh.sync()
+        self.assertEqual(corpus.vectors[self.music.pk], fresh.vectors[self.music.pk])
+        self.assertEqual(corpus.document_frequency, fresh.document_frequency)
+
+
+class ProfileImageUploadTests(TempMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = create_user()
+        self.client.force_login(self.user)
+
+    def upload(self, name, content, content_type='image/png'):
+        return self.client.post(reverse('profile_update'), {
+            'profile_image': SimpleUploadedFile(name, content, content_type=content_type),
+        })
+
+    def test_rejects_html(self):
+        response = self.upload('x.html', b'<script>alert(document.cookie)</script>', 'text/html')
+        self.assertEqual(response.status_code, 400)
+        # Recusado já pelo ImageUploadHandler
+        self.assertEqual(response.json()['message'], 'O arquivo enviado não é uma imagem válida.')
+        self.user.profile.refresh_from_db()
+        self.assertFalse(self.user.profile.profile_image)
+
+    def test_rejects_image_with_wrong_extension(self):
+        self.assertEqual(self.upload('x.html', png_bytes()).status_code, 400)
+
+    def test_accepts_image(self):
+        response = self.upload('avatar.png', png_bytes())
+        self.assertEqual(response.status_code, 200)
+        self.user.profile.refresh_from_db()
+        self.assertTrue(self.user.profile.profile_image.name.endswith('.png'))
+
+
+class FileServingTests(TempMediaMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.content = bytes(range(256)) * 4
+        os.makedirs(os.path.join(self.media_root, 'imgs'))
+        with open(os.path.join(self.media_root, 'imgs', 'a.png'), 'wb') as file:
+            file.write(self.content)
+        with open(os.path.join(self.media_root, 'x.html'), 'wb') as file:
+            file.write(b'<script>alert(document.cookie)</script>')
+        self.index = FileIndex('media', self.media_root, inline_types=INLINE_MEDIA_TYPES)
+
+    def serve(self, relative, **headers):
+        response = serve_file(RequestFactory().get('/media/' + relative, **headers), self.index, relative, 60)
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+        response.close()
+        return response, body
+
+    def test_full_response(self):
+        response, body = self.serve('imgs/a.png')
+        self.assertEqual((response.status_code, response['Content-Type']), (200, 'image/png'))
+        self.assertEqual(body, self.content)
+        self.assertTrue(response['Content-Disposition'].startswith('inline'))
+
+    def test_partial_content(self):
+        response, body = self.serve('imgs/a.png', HTTP_RANGE='bytes=10-19')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 10-19/{len(self.content)}')
+        self.assertEqual(body, self.content[10:20])
+
+        response, body = self.serve('imgs/a.png', HTTP_RANGE='bytes=-5')
+        self.assertEqual(body, self.content[-5:])
+
+    def test_unsatisfiable_range(self):
+        response, _ = self.serve('imgs/a.png', HTTP_RANGE=f'bytes={len(self.content)}-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(self.content)}')
+
+    def test_multiple_ranges_get_full_response(self):
+        response, body = self.serve('imgs/a.png', HTTP_RANGE='bytes=0-1,5-6')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body, self.content)
+
+    def test_stale_if_range_gets_full_response(self):
+        response, _ = self.serve('imgs/a.png', HTTP_RANGE='bytes=0-1', HTTP_IF_RANGE='"outro"')
+        self.assertEqual(response.status_code, 200)
+
+    def test_not_modified(self):
+        etag = self.serve('imgs/a.png')[0]['ETag']
+        response, _ = self.serve('imgs/a.png', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_path_traversal(self):
+        for relative in ('../etc/passwd', 'imgs/../../etc/passwd', '/etc/passwd', 'imgs/./a.png'):
+            with self.subTest(relative=relative):
+                with self.assertRaises(Http404):
+                    self.serve(relative)
+
+    def test_html_served_as_sandboxed_download(self):
+        response, _ = self.serve('x.html')
+        self.assertEqual(response['Content-Type'], 'application/octet-stream')
+        self.assertTrue(response['Content-Disposition'].startswith('attachment'))
+        self.assertEqual(response['Content-Security-Policy'], 'sandbox')
+
+
+@override_settings(COMMENTS_STREAM_CHUNK_SIZE=2)
+class CommentStreamTests(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.post = create_post(self.user)
+        PostComment.objects.bulk_create([
+            PostComment(user=self.user, post=self.post, content=f'Comentário {i}', is_approved=True)
+            for i in range(5)
+        ])
+        self.client.force_login(self.user)
+
+    def test_streamed_lazily_under_wsgi(self):
+        response = self.client.get(reverse('get_comments', args=[self.post.id]), {'stream': '1'})
+        self.assertTrue(response.streaming)
+        self.assertFalse(response.is_async)
+
+        chunks = iter(response.streaming_content)
+        # Nada foi lido do banco antes de o corpo começar a ser consumido
+        with self.assertNumQueries(0):
+            self.assertEqual(next(chunks), b'[')
+        body = b'[' + b''.join(chunks)
+        self.assertEqual([c['content'] for c in json.loads(body)], [f'Comentário {i}' for i in range(5)])
+
+
+class FeedTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.post = create_post(create_user('autor'), 'Patch de inverno')
+
+    def feed_url(self, feed_format):
+        return reverse('devlog_feed', args=[feed_format])
+
+    def test_formats(self):
+        for feed_format, content_type in (
+            ('rss', 'application/rss+xml'), ('atom', 'application/atom+xml'), ('json', 'application/feed+json'),
+        ):
+            with self.subTest(feed_format=feed_format):
+                response = self.client.get(self.feed_url(feed_format))
+                self.assertEqual(response.status_code, 200)
+                self.assertTrue(response['Content-Type'].startswith(content_type))
+                self.assertContains(response, 'Patch de inverno')
+        self.assertEqual(self.client.get(self.feed_url('xml')).status_code, 404)
+
+    def test_etag_and_not_modified(self):
+        response = self.client.get(self.feed_url('rss'))
+        etag = response['ETag']
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.feed_url('rss'), HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        # Editar um post muda a versão e, com ela, o ETag
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post.title = 'Patch de primavera'
+            self.post.save()
+        response = self.client.get(self.feed_url('rss'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Patch de primavera')
+
+    @override_settings(ALLOWED_HOSTS=['*'])
+    def test_forged_host_does_not_poison_cache(self):
+        self.client.get(self.feed_url('json'), HTTP_HOST='evil.example')
+        response = self.client.get(self.feed_url('json'), HTTP_HOST='zenithpixels.com', secure=True)
+        self.assertNotContains(response, 'evil.example')
+        self.assertContains(response, 'https://zenithpixels.com/')
+
+
+@override_settings(COMPRESSION_MIN_SIZE=200)
+class CompressionMiddlewareTests(SimpleTestCase):
+    body = b'{"texto": "' + b'zenith pixels ' * 100 + b'"}'
+
+    def compress(self, response, accept='gzip, deflate, br'):
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING=accept)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    @skipUnless(brotli, 'pacote brotli não instalado')
+    def test_brotli_for_json(self):
+        response = self.compress(HttpResponse(self.body, content_type='application/json'))
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(response.content), self.body)
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_html_uses_gzip(self):
+        response = self.compress(HttpResponse(self.body, content_type='text/html; charset=utf-8'))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), self.body)
+
+    def test_gzip_only_client(self):
+        response = self.compress(HttpResponse(self.body, content_type='application/json'), accept='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+
+    def test_identity(self):
+        response = self.compress(HttpResponse(self.body, content_type='application/json'), accept='')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response.content, self.body)
+
+    def test_below_threshold(self):
+        response = self.compress(HttpResponse(self.body[:100], content_type='application/json'))
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_event_stream_untouched(self):
+        response = self.compress(StreamingHttpResponse(iter([b'data: 1\n\n']), content_type='text/event-stream'))
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(b''.join(response.streaming_content), b'data: 1\n\n')
+
+
+class MediaStorageTests(TempMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.author = create_user('autor')
+
+    def save_image(self, content=None):
+        return default_storage.save('devlog_images/capa.png', SimpleUploadedFile('capa.png', content or png_bytes()))
+
+    def age(self, name, seconds=2 * 24 * 60 * 60):
+        path = default_storage.path(name)
+        past = time.time() - seconds
+        os.utime(path, (past, past))
+
+    def test_same_bytes_same_name(self):
+        first = self.save_image()
+        self.assertEqual(self.save_image(), first)
+        self.assertNotEqual(self.save_image(png_bytes(color='green')), first)
+        self.assertRegex(first, r'^devlog_images/[0-9a-f]{2}/[0-9a-f]{64}\.png$')
+
+    def test_release_keeps_shared_file(self):
+        name = self.save_image()
+        create_post(self.author, featured_image=name)
+        self.age(name)
+        self.assertFalse(release_media(name))
+        self.assertTrue(default_storage.exists(name))
+
+    def test_release_respects_grace(self):
+        name = self.save_image()
+        self.assertFalse(release_media(name))
+        self.age(name)
+        self.assertTrue(release_media(name))
+        self.assertFalse(default_storage.exists(name))
+
+    def test_collect_orphans(self):
+        orphan, recent, used = (self.save_image(png_bytes(color=color)) for color in ('red', 'green', 'blue'))
+        create_post(self.author, featured_image=used)
+        self.age(orphan)
+        self.age(used)
+
+        scanned, removed, _ = collect_orphans()
+        self.assertEqual((scanned, removed), (3, 1))
+        self.assertFalse(default_storage.exists(orphan))
+        self.assertTrue(default_storage.exists(recent))
+        self.assertTrue(default_storage.exists(used))
+
+    def test_collect_rechecks_mtime_before_delete(self):
+        name = self.save_image()
+        self.age(name)
+
+        def upload_during_scan(names):
+            # Upload idêntico depois da varredura: renova o mtime do arquivo
+            os.utime(default_storage.path(name))
+            return set()
+
+        with mock.patch('app_custom_zenith.mediagc.referenced_names', side_effect=upload_during_scan):
+            self.assertEqual(collect_orphans()[1], 0)
+        self.assertTrue(default_storage.exists(name))
+
+
+class ImageMetadataTests(TempMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post = create_post(
+                create_user('autor'),
+                featured_image=SimpleUploadedFile('capa.png', png_bytes((40, 20), 'red')),
+            )
+        self.first_image = self.post.featured_image.name
+
+    def metadata_tasks(self):
+        return BackgroundTask.objects.filter(task_path='app_custom_zenith.tasks.compute_image_metadata')
+
+    def test_metadata_computed(self):
+        self.assertTrue(update_image_metadata('devlogpost', self.post.pk, self.first_image))
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.featured_image_width, self.post.featured_image_height), (40, 20))
+        self.assertEqual(self.post.featured_image_color, '#ff0000')
+        self.assertTrue(self.post.featured_image_placeholder.startswith('data:image/jpeg;base64,'))
+
+    def test_new_image_resets_and_enqueues(self):
+        update_image_metadata('devlogpost', self.post.pk, self.first_image)
+        self.post.refresh_from_db()
+        self.metadata_tasks().delete()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post.featured_image = SimpleUploadedFile('nova.png', png_bytes((10, 30), 'blue'))
+            self.post.save(update_fields=['featured_image'])
+
+        self.post.refresh_from_db()
+        self.assertIsNone(self.post.featured_image_width)
+        self.assertIsNone(self.post.featured_image_placeholder)
+        self.assertEqual(
+            list(self.metadata_tasks().values_list('kwargs', flat=True)),
+            [{'model': 'devlogpost', 'pk': self.post.pk, 'name': self.post.featured_image.name}],
+        )
+
+    def test_stale_task_skips_replaced_image(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post.featured_image = SimpleUploadedFile('nova.png', png_bytes((10, 30), 'blue'))
+            self.post.save()
+
+        # Tarefa da imagem antiga rodando depois da troca
+        self.assertFalse(update_image_metadata('devlogpost', self.post.pk, self.first_image))
+        self.post.refresh_from_db()
+        self.assertIsNone(self.post.featured_image_width)
+
+
+class GameCatalogTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_saving_game_refreshes_home_fragment(self):
+        self.assertNotIn('Lilith Remasterizado', self.client.get(reverse('home')).content.decode())
+
+        game = Game.objects.get(slug='lilith')
+        with self.captureOnCommitCallbacks(execute=True):
+            game.title = 'Lilith Remasterizado'
+            game.save()
+
+        self.assertIn('Lilith Remasterizado', self.client.get(reverse('home')).content.decode())
+
+    def test_slug_is_read_only_for_existing_games(self):
+        game_admin = admin.site._registry[Game]
+        request = RequestFactory().get('/')
+        self.assertIn('slug', game_admin.get_readonly_fields(request, Game.objects.get(slug='lilith')))
+        self.assertNotIn('slug', game_admin.get_readonly_fields(request))
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaRoutingTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def run_view(self, view, **cookies):
+        request = self.factory.get('/')
+        request.COOKIES.update(cookies)
+        return db_routers.read_from_replica(view)(request)
+
+    def test_reads_go_to_replica_only_inside_decorated_views(self):
+        self.assertEqual(self.run_view(lambda request: router.db_for_read(PostComment)), 'replica')
+        self.assertEqual(router.db_for_read(PostComment), 'default')
+
+    def test_pin_cookie_reads_from_primary(self):
+        db = self.run_view(lambda request: router.db_for_read(PostComment), **{db_routers.PRIMARY_PIN_COOKIE: '1'})
+        self.assertEqual(db, 'default')
+
+    def test_written_model_is_read_from_primary(self):
+        def view(request):
+            router.db_for_write(DevlogPost)
+            return router.db_for_read(DevlogPost), router.db_for_read(PostComment)
+
+        self.assertEqual(self.run_view(view), ('default', 'replica'))
+
+    def test_pinned_queryset_keeps_replica_after_view_returns(self):
+        unpinned = self.run_view(lambda request: PostComment.objects.all())
+        pinned = self.run_view(lambda request: db_routers.pin_to_current_db(PostComment.objects.all()))
+        self.assertEqual(unpinned.db, 'default')
+        self.assertEqual(pinned.db, 'replica')
+
+    def test_pin_cookie_set_after_successful_writes(self):
+        pinning = ReplicaPinningMiddleware(lambda request: HttpResponse())
+        with override_settings(REPLICA_STICKY_SECONDS=7):
+            response = pinning.process_response(self.factory.post('/'), HttpResponse())
+        self.assertEqual(response.cookies[db_routers.PRIMARY_PIN_COOKIE]['max-age'], 7)
+
+        for request, status in ((self.factory.get('/'), 200), (self.factory.post('/'), 400)):
+            response = pinning.process_response(request, HttpResponse(status=status))
+            self.assertNotIn(db_routers.PRIMARY_PIN_COOKIE, response.cookies)
+
+
+class LastLoginTests(TestCase):
+    def setUp(self):
+        self.user = create_user()
+
+    def test_second_login_inside_interval_does_not_write(self):
+        self.client.force_login(self.user)
+        first = CustomUser.objects.get(pk=self.user.pk).last_login
+        self.assertIsNotNone(first)
+
+        user = CustomUser.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertFalse(user.touch_last_login())
+        self.client.force_login(user)
+        self.assertEqual(CustomUser.objects.get(pk=self.user.pk).last_login, first)
+
+    @override_settings(LAST_LOGIN_UPDATE_INTERVAL=60)
+    def test_login_after_interval_writes(self):
+        stale = timezone.now() - timedelta(minutes=5)
+        CustomUser.objects.filter(pk=self.user.pk).update(last_login=stale)
+        user = CustomUser.objects.get(pk=self.user.pk)
+
+        self.assertTrue(user.touch_last_login())
+        self.assertGreater(CustomUser.objects.get(pk=self.user.pk).last_login, stale)
+
+    def test_concurrent_touch_writes_once(self):
+        CustomUser.objects.filter(pk=self.user.pk).update(last_login=None)
+        first, second = CustomUser.objects.get(pk=self.user.pk), CustomUser.objects.get(pk=self.user.pk)
+        # A segunda cópia ainda vê last_login vazio, mas o UPDATE condicional a barra
+        self.assertEqual((first.touch_last_login(), second.touch_last_login()), (True, False))
+
+
+class ProfileUpdateTests(TestCase):
+    def setUp(self):
+        self.user = create_user(first_name='Ana', last_name='Souza')
+        self.user.profile.bio = 'Bio antiga'
+        self.user.profile.save()
+        self.client.force_login(self.user)
+
+        self.saved = []
+
+        def record(sender, instance, update_fields=None, **kwargs):
+            self.saved.append((sender, update_fields and set(update_fields)))
+
+        for model in (CustomUser, UserProfile):
+            post_save.connect(record, sender=model, weak=False, dispatch_uid=f'profile-update-test-{model.__name__}')
+            self.addCleanup(post_save.disconnect, sender=model, dispatch_uid=f'profile-update-test-{model.__name__}')
+
+    def update(self, **data):
+        response = self.client.post(reverse('profile_update'), data)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_saves_only_changed_fields(self):
+        self.update(first_name='Ana', last_name='Lima', bio='Bio antiga', role='Artista', twitter='zenith')
+        self.assertEqual(self.saved, [
+            (CustomUser, {'last_name'}),
+            (UserProfile, {'role', 'twitter', 'updated_at'}),
+        ])
+        self.user.profile.refresh_from_db()
+        self.assertEqual(self.user.profile.twitter, '@zenith')
+
+    def test_unchanged_values_do_not_write(self):
+        self.update(first_name='Ana', last_name='Souza', bio='Bio antiga')
+        self.assertEqual(self.saved, [])
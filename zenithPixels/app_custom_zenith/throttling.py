@@ -0,0 +1,96 @@
+# app_custom_zenith/throttling.py
+import hashlib
+import ipaddress
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+@lru_cache(maxsize=1)
+def _trusted_networks(proxies):
+    return tuple(ipaddress.ip_network(proxy.strip(), strict=False) for proxy in proxies if proxy.strip())
+
+
+def _is_trusted_proxy(address):
+    networks = _trusted_networks(tuple(getattr(settings, 'TRUSTED_PROXIES', ())))
+    try:
+        address = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(address in network for network in networks)
+
+
+def client_ip(request):
+    """
+    IP do cliente. Atrás de proxies de TRUSTED_PROXIES (ex.: o nginx) o
+    REMOTE_ADDR é o do proxy: o IP vem do X-Forwarded-For, lido da direita
+    para a esquerda até o primeiro endereço que não é de um proxy confiável.
+    Sem proxies confiáveis o cabeçalho é ignorado (qualquer cliente pode
+    enviá-lo).
+    """
+    address = request.META.get('REMOTE_ADDR', '')
+    if not _is_trusted_proxy(address):
+        return address
+
+    forwarded = request.META.get('HTTP_X_FORWARDED_FOR', '')
+    for hop in reversed([hop.strip() for hop in forwarded.split(',') if hop.strip()]):
+        address = hop
+        if not _is_trusted_proxy(hop):
+            break
+    return address
+
+
+def _ip_key(request):
+    return f'login_throttle:ip:{client_ip(request)}'
+
+
+def _account_key(request, account):
+    # Falhas contadas por conta e IP: errar a senha de outra pessoa a
+    # partir de um IP não bloqueia o login dela a partir dos outros
+    digest = hashlib.sha256((account or '').strip().lower().encode()).hexdigest()
+    return f'login_throttle:account:{digest}:{client_ip(request)}'
+
+
+def _increment(key, window=None):
+    if window is None:
+        window = getattr(settings, 'LOGIN_THROTTLE_WINDOW', 300)
+    # add() só cria a chave se ela não existir, iniciando a janela
+    cache.add(key, 0, window)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, window)
+        return 1
+
+
+def is_login_throttled(request, account):
+    """
+    Indica se o login deve ser recusado: muitas tentativas vindas do mesmo IP
+    ou muitas falhas para a mesma conta a partir desse IP dentro de
+    LOGIN_THROTTLE_WINDOW.
+    """
+    ip_limit = getattr(settings, 'LOGIN_THROTTLE_IP_LIMIT', 30)
+    account_limit = getattr(settings, 'LOGIN_THROTTLE_ACCOUNT_LIMIT', 5)
+
+    ip_key, account_key = _ip_key(request), _account_key(request, account)
+    counters = cache.get_many([ip_key, account_key])
+    return counters.get(ip_key, 0) >= ip_limit or counters.get(account_key, 0) >= account_limit
+
+
+def register_login_attempt(request, account, success):
+    """Contabiliza a tentativa; um login bem-sucedido zera as falhas da conta nesse IP"""
+    _increment(_ip_key(request))
+    if success:
+        cache.delete(_account_key(request, account))
+    else:
+        _increment(_account_key(request, account))
+
+
+def is_rate_limited(request, scope, limit, window):
+    """
+    Conta a requisição na janela de `window` segundos do IP do cliente para
+    `scope` e indica se ela passou de `limit` (para endpoints públicos que
+    revelam dados, como a verificação de disponibilidade do cadastro)
+    """
+    return _increment(f'throttle:{scope}:{client_ip(request)}', window) > limit
@@ -0,0 +1,80 @@
+# app_custom_zenith/trending.py
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import DevlogPost, PostTrendingScore
+
+DEFAULT_EVENT_WEIGHTS = {'view': 1, 'like': 5, 'comment': 8}
+
+
+def record_post_event(post_id, event, count=1):
+    """
+    Soma o peso do evento (view, like, comment) aos pontos pendentes do
+    post com um UPDATE atômico, sem ler nem agregar curtidas/comentários.
+    count=-1 desfaz um evento (ex.: curtida removida).
+    """
+    weights = getattr(settings, 'TRENDING_EVENT_WEIGHTS', DEFAULT_EVENT_WEIGHTS)
+    points = weights[event] * count
+
+    scores = PostTrendingScore.objects.filter(post_id=post_id)
+    if scores.update(pending=F('pending') + points):
+        return
+    try:
+        with transaction.atomic():
+            PostTrendingScore.objects.create(post_id=post_id, pending=points)
+    except IntegrityError:
+        # Outro worker criou a linha ao mesmo tempo
+        scores.update(pending=F('pending') + points)
+
+
+def decay_scores(now=None):
+    """
+    Aplica o decaimento exponencial (meia-vida TRENDING_HALF_LIFE) e
+    incorpora os pontos pendentes: score = max(score * fator + pending, 0).
+
+    As linhas decaídas juntas compartilham decayed_at, então cada grupo é
+    um único UPDATE com fator constante (normalmente só um grupo, mais o
+    das linhas novas). Linhas com pontuação desprezível são removidas.
+    Retorna o número de linhas atualizadas.
+    """
+    now = now or timezone.now()
+    half_life = getattr(settings, 'TRENDING_HALF_LIFE', 24 * 60 * 60)
+    updated = 0
+
+    with transaction.atomic():
+        # Linhas novas ainda não têm score para decair
+        updated += PostTrendingScore.objects.filter(decayed_at__isnull=True).update(
+            score=Greatest(F('pending'), 0.0), pending=0, decayed_at=now
+        )
+
+        groups = PostTrendingScore.objects.filter(
+            decayed_at__lt=now
+        ).order_by().values_list('decayed_at', flat=True).distinct()
+        for decayed_at in list(groups):
+            factor = 0.5 ** ((now - decayed_at).total_seconds() / half_life)
+            updated += PostTrendingScore.objects.filter(decayed_at=decayed_at).update(
+                # Curtidas removidas podem deixar o total negativo
+                score=Greatest(F('score') * factor + F('pending'), 0.0), pending=0, decayed_at=now
+            )
+
+        PostTrendingScore.objects.filter(
+            score__lt=getattr(settings, 'TRENDING_MIN_SCORE', 0.01), pending=0
+        ).delete()
+
+    return updated
+
+
+def trending_order():
+    """Ordenação por tendência (pendentes incluídos), posts sem pontuação por último"""
+    return (F('trending__score') + F('trending__pending')).desc(nulls_last=True)
+
+
+def trending_posts(limit=5):
+    """Posts publicados em alta, em uma única consulta"""
+    return DevlogPost.objects.filter(
+        status=DevlogPost.Status.PUBLISHED,
+        trending__isnull=False,
+    ).select_related('category').order_by(trending_order(), '-published_at')[:limit]
@@ -0,0 +1,176 @@
+# app_custom_zenith/uploads.py
+import io
+import os
+import re
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile
+from django.template.defaultfilters import filesizeformat
+from PIL import Image, UnidentifiedImageError
+
+PROGRESS_ID_RE = re.compile(r'^[0-9A-Za-z-]{8,64}$')
+
+# Intervalo mínimo entre gravações do progresso no cache
+PROGRESS_UPDATE_INTERVAL = 0.5  # segundos
+
+
+def progress_cache_key(progress_id):
+    return f'upload-progress:{progress_id}'
+
+
+def sniff_image(head):
+    """
+    Formato do Pillow (ex.: 'PNG') e dimensões (largura, altura) lidos só
+    do cabeçalho da imagem: o Image.open do Pillow é preguiçoso e não
+    decodifica os pixels. Retorna None se os bytes recebidos ainda não
+    bastam ou não são uma imagem; imagens acima do limite do próprio
+    Pillow levantam DecompressionBombError.
+    """
+    try:
+        with Image.open(io.BytesIO(head)) as image:
+            return image.format, image.size
+    except (UnidentifiedImageError, OSError, SyntaxError, ValueError):
+        return None
+
+
+def sniff_image_size(head):
+    """Dimensões (largura, altura) lidas do cabeçalho, ou None (ver sniff_image)"""
+    sniffed = sniff_image(head)
+    return sniffed[1] if sniffed else None
+
+
+def extension_matches(file_name, image_format):
+    """A extensão do nome do arquivo é uma das do formato identificado"""
+    extension = os.path.splitext(file_name or '')[1].lower()
+    return bool(extension) and Image.registered_extensions().get(extension) == image_format
+
+
+def upload_errors(request):
+    """Erros registrados pelo ImageUploadHandler, por nome de campo"""
+    return getattr(request, '_upload_errors', {})
+
+
+def add_upload_errors(form, request):
+    """Copia para o form os arquivos recusados durante o upload"""
+    errors = upload_errors(request)
+    if errors:
+        form.full_clean()
+        for field, message in errors.items():
+            form.add_error(field if field in form.fields else None, message)
+
+
+class ImageUploadHandler(FileUploadHandler):
+    """
+    Primeiro handler de upload: valida cada arquivo enquanto os chunks
+    chegam, antes de chegarem à memória/disco dos handlers seguintes.
+
+    - mais de UPLOAD_MAX_IMAGE_BYTES: arquivo descartado no chunk que
+      ultrapassa o limite;
+    - as dimensões são lidas do cabeçalho (até UPLOAD_SNIFF_BYTES) e
+      imagens com mais de UPLOAD_MAX_IMAGE_PIXELS são descartadas sem
+      decodificação, assim como arquivos que não são imagens ou cuja
+      extensão não corresponde ao formato identificado (ex.: .html).
+
+    Arquivos descartados durante o recebimento não aparecem em
+    request.FILES; os que só se revelam inválidos ao terminar (pequenos
+    demais para identificar) continuam lá. Em todos os casos o motivo fica
+    em upload_errors(request), que as views consultam antes de usar o
+    arquivo. Com ?X-Progress-ID=<id> na URL o progresso fica disponível em
+    upload_progress; ele é gravado no cache padrão, então com LocMem só o
+    worker que recebe o upload o enxerga (use Redis com vários workers).
+    """
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.progress_id = None
+        self.received = 0
+        self.total = None
+        self._reported_at = 0.0
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        self.total = content_length
+        progress_id = self.request.GET.get('X-Progress-ID') if self.request else None
+        if progress_id and PROGRESS_ID_RE.match(progress_id):
+            self.progress_id = progress_id
+            self._report(force=True)
+
+    def new_file(self, field_name, file_name, content_type, content_length, charset=None, content_type_extra=None):
+        super().new_file(field_name, file_name, content_type, content_length, charset, content_type_extra)
+        self.file_size = 0
+        self.head = b''
+        self.dimensions = None
+        self.rejected = False
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        self.file_size += len(raw_data)
+        self._report()
+
+        max_bytes = getattr(settings, 'UPLOAD_MAX_IMAGE_BYTES', 5 * 1024 * 1024)
+        if self.file_size > max_bytes:
+            self._reject(f'A imagem excede o limite de {filesizeformat(max_bytes)}.')
+
+        max_pixels = getattr(settings, 'UPLOAD_MAX_IMAGE_PIXELS', 4096 * 4096)
+        if self.dimensions is None:
+            self.head += raw_data
+            try:
+                sniffed = sniff_image(self.head)
+            except Image.DecompressionBombError:
+                self._reject(f'A imagem excede o limite de {max_pixels / 1_000_000:.1f} megapixels.')
+            if sniffed is None:
+                if len(self.head) >= getattr(settings, 'UPLOAD_SNIFF_BYTES', 256 * 1024):
+                    self._reject('O arquivo enviado não é uma imagem válida.')
+            else:
+                self.head = b''
+                image_format, self.dimensions = sniffed
+                if not extension_matches(self.file_name, image_format):
+                    self._reject('A extensão do arquivo não corresponde ao formato da imagem.')
+                width, height = self.dimensions
+                if width * height > max_pixels:
+                    self._reject(
+                        f'A imagem tem {width}x{height} pixels; o limite é de '
+                        f'{max_pixels / 1_000_000:.1f} megapixels.'
+                    )
+        return raw_data
+
+    def file_complete(self, file_size):
+        # Terminou sem ser identificado como imagem. SkipFile não vale aqui
+        # (o arquivo já foi recebido): fica registrado em upload_errors
+        if self.dimensions is None and not self.rejected:
+            self._record_error('O arquivo enviado não é uma imagem válida.')
+        self.head = b''
+        return None
+
+    def upload_complete(self):
+        if self.progress_id:
+            cache.set(
+                progress_cache_key(self.progress_id),
+                {'received': self.received, 'total': self.total, 'done': True},
+                getattr(settings, 'UPLOAD_PROGRESS_TIMEOUT', 5 * 60),
+            )
+
+    def _record_error(self, message):
+        self.rejected = True
+        if self.request is not None:
+            if not hasattr(self.request, '_upload_errors'):
+                self.request._upload_errors = {}
+            self.request._upload_errors[self.field_name] = message
+
+    def _reject(self, message):
+        self._record_error(message)
+        self.head = b''
+        raise SkipFile(message)
+
+    def _report(self, force=False):
+        if not self.progress_id:
+            return
+        now = time.monotonic()
+        if force or now - self._reported_at >= PROGRESS_UPDATE_INTERVAL:
+            self._reported_at = now
+            cache.set(
+                progress_cache_key(self.progress_id),
+                {'received': self.received, 'total': self.total, 'done': False},
+                getattr(settings, 'UPLOAD_PROGRESS_TIMEOUT', 5 * 60),
+            )
@@ -1,24 +1,42 @@
-from django.shortcuts import render, redirect, get_object_or_404
-from django.http import HttpResponseRedirect, JsonResponse
+from django.shortcuts import render, redirect, get_object_or_404, aget_object_or_404
+from django.http import HttpResponse, HttpResponseRedirect, JsonResponse, StreamingHttpResponse
 from django.urls import reverse
 from django.contrib import messages
 from django.contrib.auth import login, authenticate, logout
 from django.contrib.auth.decorators import login_required
-from django.views.decorators.http import require_POST
+from django.views.decorators.http import require_GET, require_POST
+from django import forms
 from django.contrib.auth.forms import AuthenticationForm, PasswordResetForm
 from django.db import IntegrityError
 from django.core.exceptions import ValidationError
 from .forms import Etapa1Form, Etapa2Form, DevlogPostForm, PostCommentForm
-from .models import CustomUser, UserProfile, DevlogPost, PostLike, PostComment, PostCategory 
+from .models import CustomUser, UserProfile, DevlogPost, PostLike, PostComment, PostCategory, RelatedPost
 import json
 import logging
 from datetime import datetime, timedelta
 from django.utils import timezone
 from django.db import transaction
 from django.contrib.admin.views.decorators import staff_member_required
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from .db_routers import pin_to_current_db, read_from_replica
+from .registration import check_availability, find_taken_fields, TAKEN_MESSAGES
+from .hashing import PasswordHashingBusy
+from .throttling import is_login_throttled, is_rate_limited, register_login_attempt
+from .realtime import post_channel, publish_post_event, realtime_enabled, sse_stream
+from .taskqueue import enqueue_on_commit
+from .tasks import delete_media_file
+from .feedcache import feed_cache_key, feed_cache_timeout
+from .catalog import catalog_context, get_game
+from .lore import LORE_FRAGMENTS
+from .loremap import fragment_status, get_lore_layout, unlocked_fragment_ids
+from .categories import category_registry
+from .trending import record_post_event, trending_order, trending_posts
+from .uploads import add_upload_errors, progress_cache_key, upload_errors
 
 # Novos imports
-from django.core.paginator import Paginator
+from django.core.cache import cache
+from django.core.paginator import Page, Paginator
 from django.db.models import Q
 from django.http import Http404
 
@@ -138,14 +156,49 @@ def get_base_context(request):
         'current_path': request.path,
     }
 
+async def aget_user_profile(user):
+    """
+    Obtém o perfil do usuário em views assíncronas. Se o perfil já veio
+    junto com o usuário (CachedModelBackend) não há consulta; caso contrário
+    usa o ORM assíncrono. Retorna None se o perfil não existir.
+    """
+    if CustomUser.profile.related.is_cached(user):
+        return getattr(user, 'profile', None)
+    return await UserProfile.objects.filter(user=user).afirst()
+
 def home(request):
     context = get_base_context(request)
+    context['trending_posts'] = trending_posts(limit=getattr(settings, 'TRENDING_HOME_COUNT', 3))
+    context.update(catalog_context())
     return render(request, 'index/home.html', context)
 
+def get_cached_devlog_page(posts, category_slug, page_number, per_page=10):
+    """
+    Página da listagem do devlog guardada no cache. As chaves incluem a
+    versão do feed, então publicar, agendar ou editar um post invalida
+    todas as páginas e categorias de uma vez.
+    """
+    category_key = category_slug or 'all'
+    timeout = feed_cache_timeout()
+    
+    count = cache.get_or_set(feed_cache_key('devlog-count', category_key), posts.count, timeout)
+    paginator = Paginator(range(count), per_page)
+    number = paginator.get_page(page_number).number
+    
+    start = (number - 1) * per_page
+    object_list = cache.get_or_set(
+        feed_cache_key('devlog-page', category_key, number),
+        lambda: list(posts[start:start + per_page]),
+        timeout
+    )
+    return Page(object_list, number, paginator)
+
+@read_from_replica
 def devlog(request):
     # Obter parâmetros da URL
     category_slug = request.GET.get('categoria')
     search_query = request.GET.get('q', '')
+    sort = request.GET.get('ordem', '')
     
     # Base query - apenas posts publicados
     posts = DevlogPost.objects.filter(
@@ -156,6 +209,8 @@ def devlog(request):
     if category_slug:
         posts = posts.filter(category__slug=category_slug)
     
+    page_number = request.GET.get('page')
+    
     # Aplicar busca
     if search_query:
         posts = posts.filter(
@@ -164,13 +219,20 @@ def devlog(request):
             Q(excerpt__icontains=search_query)
         )
     
-    # Paginação
-    paginator = Paginator(posts, 10)  # 10 posts por página
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Ordenação por tendência (muda a cada interação, não passa pelo cache)
+    if sort == 'trending':
+        posts = posts.order_by(trending_order(), '-published_at')
     
-    # Obter categorias ativas para os filtros
-    categories = PostCategory.objects.filter(is_active=True)
+    if search_query or sort == 'trending':
+        # Paginação
+        paginator = Paginator(posts, 10)  # 10 posts por página
+        page_obj = paginator.get_page(page_number)
+    else:
+        # Sem busca, a listagem (geral ou por categoria) vem do cache
+        page_obj = get_cached_devlog_page(posts, category_slug, page_number)
+    
+    # Categorias ativas para os filtros (registro em memória, sem consulta)
+    categories = category_registry.all()
     
     # Verificar se usuário curtiu cada post e contar likes/comentários
     for post in page_obj:
@@ -186,10 +248,12 @@ def devlog(request):
         'categories': categories,
         'current_category': category_slug,
         'search_query': search_query,
+        'current_sort': sort,
         'page_title': 'Notícias & Devlog'
     })
     return render(request, 'devlog/logs.html', context)
 
+@read_from_replica
 def devlog_post_detail(request, slug):
     """View para visualizar um post específico do devlog"""
     post = get_object_or_404(
@@ -204,6 +268,8 @@ def devlog_post_detail(request, slug):
     
     # Incrementar contador de visualizações
     post.increment_view_count()
+    if post.status == DevlogPost.Status.PUBLISHED:
+        record_post_event(post.id, 'view')
     
     # Obter comentários aprovados
     comments = post.comments.filter(is_approved=True).select_related('user__profile')
@@ -213,11 +279,19 @@ def devlog_post_detail(request, slug):
     if request.user.is_authenticated:
         user_has_liked = post.likes.filter(user=request.user).exists()
     
-    # Posts relacionados (da mesma categoria)
-    related_posts = DevlogPost.objects.filter(
-        category=post.category,
-        status=DevlogPost.Status.PUBLISHED
-    ).exclude(id=post.id).order_by('-published_at')[:3]
+    # Posts relacionados: lista pré-calculada por similaridade (related.py)
+    related_posts = [
+        entry.related for entry in RelatedPost.objects.filter(
+            post=post,
+            related__status=DevlogPost.Status.PUBLISHED
+        ).select_related('related__category').order_by('rank')[:3]
+    ]
+    if not related_posts:
+        # Post novo cuja lista ainda não foi calculada pelo worker
+        related_posts = DevlogPost.objects.filter(
+            category=post.category,
+            status=DevlogPost.Status.PUBLISHED
+        ).exclude(id=post.id).order_by('-published_at')[:3]
     
     # Contar likes e comentários
     likes_count = post.likes.count()
@@ -231,6 +305,7 @@ def devlog_post_detail(request, slug):
         'related_posts': related_posts,
         'likes_count': likes_count,
         'comments_count': comments_count,
+        'realtime_enabled': realtime_enabled(),
         'page_title': post.title
     })
     
@@ -245,24 +320,20 @@ def create_devlog_post(request):
     
     if request.method == 'POST':
         form = DevlogPostForm(request.POST, request.FILES)
+        add_upload_errors(form, request)
         if form.is_valid():
             try:
+                # O form define o status (rascunho, publicado ou agendado)
                 post = form.save(commit=False)
                 post.author = request.user
-                
-                # Definir status baseado no checkbox
-                if form.cleaned_data.get('is_published'):
-                    post.status = DevlogPost.Status.PUBLISHED
-                    if not post.published_at:
-                        post.published_at = timezone.now()
-                else:
-                    post.status = DevlogPost.Status.DRAFT
-                
                 post.save()
                 form.save_m2m()
                 
                 logger.info(f"Post criado com sucesso: {post.title} (ID: {post.id}, Slug: {post.slug})")
-                messages.success(request, 'Notícia criada com sucesso!')
+                if post.is_scheduled:
+                    messages.success(request, f'Notícia agendada para {timezone.localtime(post.published_at):%d/%m/%Y %H:%M}.')
+                else:
+                    messages.success(request, 'Notícia criada com sucesso!')
                 return redirect('devlog_post_detail', slug=post.slug)
             except Exception as e:
                 logger.error(f"Erro ao salvar post: {str(e)}", exc_info=True)
@@ -291,29 +362,29 @@ def edit_devlog_post(request, slug):
         return redirect('devlog_post_detail', slug=slug)
     
     if request.method == 'POST':
+        old_image = post.featured_image.name if post.featured_image else None
         form = DevlogPostForm(request.POST, request.FILES, instance=post)
+        add_upload_errors(form, request)
         if form.is_valid():
+            # O form define o status (rascunho, publicado ou agendado)
             updated_post = form.save(commit=False)
-            
-            # Atualizar status baseado no checkbox
-            if form.cleaned_data.get('is_published'):
-                updated_post.status = DevlogPost.Status.PUBLISHED
-                if not updated_post.published_at:
-                    updated_post.published_at = timezone.now()
-            else:
-                updated_post.status = DevlogPost.Status.DRAFT
-            
             updated_post.save()
             form.save_m2m()
             
-            messages.success(request, 'Notícia atualizada com sucesso!')
+            # Imagem trocada ou removida: libera a antiga se ninguém mais a usa
+            if old_image and old_image != updated_post.featured_image.name:
+                enqueue_on_commit(delete_media_file, name=old_image)
+            
+            if updated_post.is_scheduled:
+                messages.success(request, f'Notícia agendada para {timezone.localtime(updated_post.published_at):%d/%m/%Y %H:%M}.')
+            else:
+                messages.success(request, 'Notícia atualizada com sucesso!')
             return redirect('devlog_post_detail', slug=updated_post.slug)
         else:
             messages.error(request, 'Por favor, corrija os erros abaixo.')
     else:
-        # Configurar valor inicial do checkbox
-        initial_data = {'is_published': post.status == DevlogPost.Status.PUBLISHED}
-        form = DevlogPostForm(instance=post, initial=initial_data)
+        # O valor inicial do checkbox e do agendamento vem do form
+        form = DevlogPostForm(instance=post)
     
     context = get_base_context(request)
     context.update({
@@ -343,14 +414,7 @@ def delete_devlog_post(request, slug):
         # Salvar título para mensagem
         post_title = post.title
         
-        # Deletar imagem se existir
-        if post.featured_image:
-            try:
-                post.featured_image.delete(save=False)
-            except:
-                pass
-        
-        # Deletar o post
+        # Deletar o post (a imagem é removida em segundo plano pelo signal)
         post.delete()
         
         logger.info(f"Post excluído: {post_title}")
@@ -438,49 +502,68 @@ def profile_edit(request):
 
 @login_required
 def profile_update(request):
+    """
+    Atualiza usuário e perfil em uma única transação, com no máximo um
+    UPDATE por tabela contendo apenas os campos alterados.
+    """
     if request.method == 'POST':
         try:
             user = request.user
             profile = user.profile
             
-            # Atualiza campos do usuário (nome)
-            if 'first_name' in request.POST:
-                user.first_name = request.POST.get('first_name', '')
-                user.save(update_fields=['first_name'])
-            if 'last_name' in request.POST:
-                user.last_name = request.POST.get('last_name', '')
-                user.save(update_fields=['last_name'])
-            
-            # Atualiza campos do perfil
-            update_fields = []
-            
-            if 'role' in request.POST:
-                profile.role = request.POST.get('role', '')
-                update_fields.append('role')
+            # Campos do usuário (nome) que realmente mudaram
+            user_fields = []
+            for field in ('first_name', 'last_name'):
+                if field in request.POST:
+                    value = request.POST.get(field, '')
+                    if getattr(user, field) != value:
+                        setattr(user, field, value)
+                        user_fields.append(field)
             
-            if 'bio' in request.POST:
-                profile.bio = request.POST.get('bio', '')
-                update_fields.append('bio')
+            # Campos do perfil que realmente mudaram
+            profile_values = {}
+            for field in ('role', 'bio', 'linkedin'):
+                if field in request.POST:
+                    profile_values[field] = request.POST.get(field, '')
             
             if 'twitter' in request.POST:
                 twitter = request.POST.get('twitter', '')
                 if twitter and not twitter.startswith('@'):
                     twitter = '@' + twitter
-                profile.twitter = twitter
-                update_fields.append('twitter')
+                profile_values['twitter'] = twitter
             
-            if 'linkedin' in request.POST:
-                profile.linkedin = request.POST.get('linkedin', '')
-                update_fields.append('linkedin')
+            profile_fields = []
+            for field, value in profile_values.items():
+                if getattr(profile, field) != value:
+                    setattr(profile, field, value)
+                    profile_fields.append(field)
             
+            # Imagem recusada pelo handler de upload (tamanho, dimensões ou formato)
+            rejected = upload_errors(request).get('profile_image')
+            if rejected:
+                return JsonResponse({'status': 'error', 'message': rejected}, status=400)
+            
+            old_image = None
             if 'profile_image' in request.FILES:
+                # Mesma validação do ImageField de um form (Pillow e extensão)
+                try:
+                    image = forms.ImageField().clean(request.FILES['profile_image'])
+                except ValidationError as e:
+                    return JsonResponse({'status': 'error', 'message': e.messages[0]}, status=400)
                 if profile.profile_image:
-                    profile.profile_image.delete(save=False)
-                profile.profile_image = request.FILES['profile_image']
-                update_fields.append('profile_image')
+                    old_image = profile.profile_image.name
+                profile.profile_image = image
+                profile_fields.append('profile_image')
             
-            if update_fields:
-                profile.save(update_fields=update_fields)
+            with transaction.atomic():
+                if user_fields:
+                    user.save(update_fields=user_fields)
+                if profile_fields:
+                    profile.save(update_fields=profile_fields + ['updated_at'])
+                
+                # Remove a imagem antiga em segundo plano, depois que a troca foi gravada
+                if old_image:
+                    enqueue_on_commit(delete_media_file, name=old_image)
             
             return JsonResponse({
                 'status': 'success',
@@ -503,32 +586,34 @@ def profile_update(request):
 
 @require_POST
 @login_required
-def like_post(request, post_id):
-    """API para curtir/descurtir um post - CORRIGIDA"""
+async def like_post(request, post_id):
+    """API para curtir/descurtir um post (assíncrona)"""
+    user = await request.auser()
     logger.info(f"=== LIKE POST API CHAMADA ===")
     logger.info(f"Post ID: {post_id}")
-    logger.info(f"Usuário: {request.user.username}")
+    logger.info(f"Usuário: {user.username}")
     logger.info(f"Headers: {dict(request.headers)}")
     
     try:
-        post = get_object_or_404(DevlogPost, id=post_id)
+        post = await aget_object_or_404(DevlogPost, id=post_id)
         
         # Verificar se já curtiu
-        existing_like = PostLike.objects.filter(user=request.user, post=post).first()
+        existing_like = await PostLike.objects.filter(user=user, post=post).afirst()
         
         if existing_like:
             # Descurtir
-            existing_like.delete()
+            await existing_like.adelete()
             liked = False
             logger.info("Like removido")
         else:
             # Curtir
-            PostLike.objects.create(user=request.user, post=post)
+            await PostLike.objects.acreate(user=user, post=post)
             liked = True
             logger.info("Like adicionado")
         
         # Atualizar contagem
-        likes_count = post.likes.count()
+        likes_count = await post.likes.acount()
+        publish_post_event(post.id, likes_count=likes_count)
         
         response_data = {
             'status': 'success',
@@ -549,15 +634,16 @@ def like_post(request, post_id):
 
 @require_POST
 @login_required
-def add_comment(request, slug):  # Mude para slug em vez de post_id
-    """API para adicionar comentário"""
+async def add_comment(request, slug):  # Mude para slug em vez de post_id
+    """API para adicionar comentário (assíncrona)"""
+    user = await request.auser()
     logger.info(f"=== ADD COMMENT API CHAMADA ===")
     logger.info(f"Post slug: {slug}")
-    logger.info(f"Usuário: {request.user.username}")
+    logger.info(f"Usuário: {user.username}")
     
     try:
         # Buscar post pelo slug
-        post = get_object_or_404(DevlogPost, slug=slug)
+        post = await aget_object_or_404(DevlogPost, slug=slug)
         content = request.POST.get('content', '').strip()
         
         if not content:
@@ -573,20 +659,20 @@ def add_comment(request, slug):  # Mude para slug em vez de post_id
             }, status=400)
         
         # Criar comentário
-        comment = PostComment.objects.create(
-            user=request.user,
+        comment = await PostComment.objects.acreate(
+            user=user,
             post=post,
             content=content,
-            is_approved=request.user.is_staff
+            is_approved=user.is_staff
         )
         
         # URL do avatar
         user_avatar = '/static/images/default_profile.png'
-        try:
-            if hasattr(request.user, 'profile') and request.user.profile.profile_image:
-                user_avatar = request.user.profile.profile_image.url
-        except:
-            pass
+        profile = await aget_user_profile(user)
+        if profile and profile.profile_image:
+            user_avatar = profile.profile_image.url
+        
+        comments_count = await post.comments.filter(is_approved=True).acount()
         
         response_data = {
             'status': 'success',
@@ -594,14 +680,24 @@ def add_comment(request, slug):  # Mude para slug em vez de post_id
                 'id': comment.id,
                 'content': comment.content,
                 'created_at': comment.created_at.strftime('%d/%m/%Y %H:%M'),
-                'user_name': request.user.get_short_name(),
+                'user_name': user.get_short_name(),
                 'user_avatar': user_avatar,
                 'is_approved': comment.is_approved
             },
-            'comments_count': post.comments.filter(is_approved=True).count(),
+            'comments_count': comments_count,
             'message': 'Comentário enviado com sucesso!'
         }
         
+        # Comentários aprovados aparecem ao vivo para quem está lendo o post
+        if comment.is_approved:
+            publish_post_event(post.id, comments_count=comments_count, comments=[{
+                'id': comment.id,
+                'content': comment.content,
+                'created_at': response_data['comment']['created_at'],
+                'is_approved': True,
+                'user': {'name': user.get_short_name(), 'avatar': user_avatar}
+            }])
+        
         logger.info(f"Comentário criado: ID {comment.id}")
         return JsonResponse(response_data)
         
@@ -612,13 +708,13 @@ def add_comment(request, slug):  # Mude para slug em vez de post_id
             'message': 'Erro ao adicionar comentário'
         }, status=500)
     
-def share_post(request, post_id):
-    """API para obter URL de compartilhamento - CORRIGIDA"""
+async def share_post(request, post_id):
+    """API para obter URL de compartilhamento (assíncrona)"""
     logger.info(f"=== SHARE POST API CHAMADA ===")
     logger.info(f"Post ID: {post_id}")
     
     try:
-        post = get_object_or_404(DevlogPost, id=post_id)
+        post = await aget_object_or_404(DevlogPost, id=post_id)
         post_url = request.build_absolute_uri(post.get_absolute_url())
         
         response_data = {
@@ -638,41 +734,95 @@ def share_post(request, post_id):
             'message': 'Erro ao gerar link de compartilhamento'
         }, status=400)
 
+def serialize_comment(comment):
+    """Converte um comentário no dicionário usado pela API de comentários"""
+    # Obter URL do avatar
+    user_avatar = '/static/images/default_profile.png'
+    try:
+        if comment.user.profile and comment.user.profile.profile_image:
+            user_avatar = comment.user.profile.profile_image.url
+    except:
+        pass
+    
+    return {
+        'id': comment.id,
+        'content': comment.content,
+        'created_at': comment.created_at.strftime('%d/%m/%Y %H:%M'),
+        'is_approved': comment.is_approved,
+        'user': {
+            'name': comment.user.get_short_name(),
+            'avatar': user_avatar
+        }
+    }
+
+def stream_comments_json(comments, chunk_size):
+    """
+    Gera um array JSON de comentários em pedaços, lendo o queryset com
+    iterator() para que a memória não cresça com o número de comentários.
+    """
+    yield '['
+    buffer = []
+    first = True
+    for comment in comments.iterator(chunk_size=chunk_size):
+        item = json.dumps(serialize_comment(comment))
+        buffer.append(item if first else ',' + item)
+        first = False
+        if len(buffer) >= chunk_size:
+            yield ''.join(buffer)
+            buffer = []
+    if buffer:
+        yield ''.join(buffer)
+    yield ']'
+
+async def astream_comments_json(comments, chunk_size):
+    """Versão assíncrona de stream_comments_json (aiterator), para ASGI"""
+    yield '['
+    buffer = []
+    first = True
+    async for comment in comments.aiterator(chunk_size=chunk_size):
+        item = json.dumps(serialize_comment(comment))
+        buffer.append(item if first else ',' + item)
+        first = False
+        if len(buffer) >= chunk_size:
+            yield ''.join(buffer)
+            buffer = []
+    if buffer:
+        yield ''.join(buffer)
+    yield ']'
+
 @login_required
-def get_comments(request, post_id):
-    """API para obter comentários de um post"""
+@read_from_replica
+async def get_comments(request, post_id):
+    """
+    API para obter comentários de um post (assíncrona).
+    Com ?stream=1 a resposta é enviada em streaming (StreamingHttpResponse).
+    """
+    user = await request.auser()
     logger.info(f"=== GET COMMENTS CHAMADO ===")
     logger.info(f"Post ID: {post_id}")
     
     try:
-        post = get_object_or_404(DevlogPost, id=post_id)
+        post = await aget_object_or_404(DevlogPost, id=post_id)
         
         # Obter comentários aprovados (ou não aprovados se for staff)
-        if request.user.is_staff:
+        if user.is_staff:
             comments = post.comments.all().select_related('user__profile')
         else:
             comments = post.comments.filter(is_approved=True).select_related('user__profile')
         
-        comments_data = []
-        for comment in comments:
-            # Obter URL do avatar
-            user_avatar = '/static/images/default_profile.png'
-            try:
-                if comment.user.profile and comment.user.profile.profile_image:
-                    user_avatar = comment.user.profile.profile_image.url
-            except:
-                pass
-            
-            comments_data.append({
-                'id': comment.id,
-                'content': comment.content,
-                'created_at': comment.created_at.strftime('%d/%m/%Y %H:%M'),
-                'is_approved': comment.is_approved,
-                'user': {
-                    'name': comment.user.get_short_name(),
-                    'avatar': user_avatar
-                }
-            })
+        if request.GET.get('stream') == '1':
+            chunk_size = getattr(settings, 'COMMENTS_STREAM_CHUNK_SIZE', 200)
+            logger.info(f"Enviando comentários em streaming (lotes de {chunk_size})")
+            # Sob WSGI o Django leria um gerador assíncrono inteiro para a
+            # memória antes de enviar (async_to_sync): lá o gerador é síncrono
+            stream = astream_comments_json if isinstance(request, ASGIRequest) else stream_comments_json
+            # O corpo é lido depois que a view retorna: fixa já a réplica
+            return StreamingHttpResponse(
+                stream(pin_to_current_db(comments), chunk_size),
+                content_type='application/json'
+            )
+        
+        comments_data = [serialize_comment(comment) async for comment in comments]
         
         logger.info(f"Comentários encontrados: {len(comments_data)}")
         return JsonResponse(comments_data, safe=False)
@@ -684,6 +834,22 @@ def get_comments(request, post_id):
             'message': str(e)
         }, status=400)
 
+async def post_events(request, post_id):
+    """Stream SSE com curtidas e comentários aprovados de um post"""
+    if not realtime_enabled():
+        # 204 faz o EventSource desistir de reconectar
+        return HttpResponse(status=204)
+    post = await aget_object_or_404(DevlogPost, id=post_id, status=DevlogPost.Status.PUBLISHED)
+    
+    response = StreamingHttpResponse(
+        sse_stream(post_channel(post.id)),
+        content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    # Impede o nginx de acumular o stream em buffer
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
 @require_POST
 @login_required
 def delete_comment(request, comment_id):
@@ -729,14 +895,32 @@ def custom_login(request):
     if request.user.is_authenticated:
         return redirect('home')
     
+    status = 200
     if request.method == 'POST':
         email = request.POST.get('username')
         password = request.POST.get('password')
         logger.info(f"Tentativa de login: {email}")
         
-        user = authenticate(request, username=email, password=password)
+        # Recusa antes de calcular qualquer hash
+        if is_login_throttled(request, email):
+            logger.warning(f"Login bloqueado por excesso de tentativas: {email}")
+            messages.error(request, 'Muitas tentativas de login. Aguarde alguns minutos e tente novamente.')
+            context = get_base_context(request)
+            context['page_title'] = 'Login'
+            return render(request, 'user/login.html', context, status=429)
+        
+        try:
+            user = authenticate(request, username=email, password=password)
+        except PasswordHashingBusy:
+            logger.warning("Pool de hashing saturado durante o login")
+            user = None
+            status = 503
+        else:
+            register_login_attempt(request, email, success=user is not None)
         
-        if user is not None:
+        if status == 503:
+            messages.error(request, 'Servidor ocupado. Por favor, tente novamente em instantes.')
+        elif user is not None:
             login(request, user)
             messages.success(request, f'Bem-vindo(a) de volta, {user.get_short_name()}!')
             
@@ -756,7 +940,7 @@ def custom_login(request):
     
     context = get_base_context(request)
     context['page_title'] = 'Login'
-    return render(request, 'user/login.html', context)
+    return render(request, 'user/login.html', context, status=status)
 
 def custom_logout(request):
     logout(request)
@@ -821,14 +1005,24 @@ def processar_etapa2(request):
         
     except IntegrityError as e:
         logger.error(f"Erro de integridade: {str(e)}")
-        if 'username' in str(e):
-            form.add_error('username', 'Este nome de usuário já está em uso')
-        elif 'email' in str(e):
-            form.add_error(None, 'Este email já está cadastrado')
-        elif 'telefone' in str(e):
-            form.add_error(None, 'Este telefone já está em uso')
-        else:
+        # Descobre quais campos colidiram consultando o banco, sem depender
+        # do texto da mensagem de erro
+        taken = find_taken_fields(
+            email=dados_etapa1['email'],
+            telefone=dados_etapa1['telefone'],
+            username=form.cleaned_data['username'],
+        )
+        for field in taken:
+            form.add_error('username' if field == 'username' else None, TAKEN_MESSAGES[field])
+        if not taken:
             messages.error(request, 'Erro ao criar conta. Por favor, tente novamente.')
+    
+    except PasswordHashingBusy:
+        logger.warning("Pool de hashing saturado durante o cadastro")
+        messages.error(request, 'Servidor ocupado. Por favor, tente novamente em instantes.')
+        response = renderizar_formulario_cadastro(request, form_etapa2=form)
+        response.status_code = 503
+        return response
         
     except Exception as e:
         logger.error(f"Erro inesperado: {str(e)}", exc_info=True)
@@ -836,6 +1030,37 @@ def processar_etapa2(request):
     
     return renderizar_formulario_cadastro(request, form_etapa2=form)
 
+@require_GET
+def upload_progress(request):
+    """Progresso de um upload enviado com ?X-Progress-ID=<id>"""
+    progress = cache.get(progress_cache_key(request.GET.get('id', '')))
+    if progress is None:
+        return JsonResponse({'status': 'error', 'message': 'Upload não encontrado'}, status=404)
+    return JsonResponse({'status': 'success', **progress})
+
+@require_GET
+def registration_availability(request):
+    """API para verificar se email, telefone e username estão disponíveis"""
+    # Limitada por IP: sem isso, serviria para descobrir emails e telefones cadastrados
+    if is_rate_limited(
+        request, 'availability',
+        getattr(settings, 'AVAILABILITY_THROTTLE_LIMIT', 30),
+        getattr(settings, 'AVAILABILITY_THROTTLE_WINDOW', 60)
+    ):
+        return JsonResponse({
+            'status': 'error',
+            'message': 'Muitas verificações. Aguarde alguns instantes.'
+        }, status=429)
+    availability = check_availability(
+        email=request.GET.get('email', '').strip(),
+        telefone=request.GET.get('telefone', '').strip(),
+        username=request.GET.get('username', '').strip(),
+    )
+    return JsonResponse({
+        'status': 'success',
+        'fields': availability
+    })
+
 def criar_usuario(dados_etapa1, dados_etapa2):
     """Função melhorada com validações adicionais"""
     from datetime import datetime
@@ -871,26 +1096,28 @@ def renderizar_formulario_cadastro(request, form_etapa1=None, form_etapa2=None):
     })
     return render(request, 'user/register.html', context)
 
-def toggle_theme(request):
+async def toggle_theme(request):
+    """Alterna o tema (assíncrona)"""
     # Obter estado atual do tema
-    current_theme = request.session.get('dark_mode', False)
+    current_theme = await request.session.aget('dark_mode', False)
     new_theme = not current_theme
     
     # Atualizar na sessão
-    request.session['dark_mode'] = new_theme
+    await request.session.aset('dark_mode', new_theme)
     
     # Salvar a preferência do usuário se estiver autenticado
-    if request.user.is_authenticated:
-        try:
-            profile = request.user.profile
+    user = await request.auser()
+    if user.is_authenticated:
+        profile = await aget_user_profile(user)
+        if profile:
             profile.dark_mode = new_theme
-            profile.save(update_fields=['dark_mode'])
-        except UserProfile.DoesNotExist:
+            await profile.asave(update_fields=['dark_mode'])
+        else:
             # Cria perfil se não existir
-            UserProfile.objects.create(user=request.user, dark_mode=new_theme)
+            await UserProfile.objects.acreate(user=user, dark_mode=new_theme)
     
     # Definir sessão para durar mais tempo (1 mês)
-    request.session.set_expiry(60 * 60 * 24 * 30)
+    await request.session.aset_expiry(60 * 60 * 24 * 30)
     
     # Retornar para a página anterior ou home
     return HttpResponseRedirect(request.META.get('HTTP_REFERER', reverse('home')))
@@ -911,6 +1138,11 @@ def approve_comment(request, comment_id):
         
         # Atualizar contagem
         comments_count = comment.post.comments.filter(is_approved=True).count()
+        publish_post_event(
+            comment.post_id,
+            comments_count=comments_count,
+            comments=[serialize_comment(comment)]
+        )
         
         return JsonResponse({
             'status': 'success',
@@ -930,9 +1162,7 @@ def publish_post(request, post_id):
     
     try:
         post = get_object_or_404(DevlogPost, id=post_id)
-        post.status = DevlogPost.Status.PUBLISHED
-        if not post.published_at:
-            post.published_at = timezone.now()
+        post.schedule_publication()
         post.save()
         
         return JsonResponse({
@@ -964,51 +1194,72 @@ def archive_post(request, post_id):
         return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
     
 
+def game_page_context(slug):
+    """Contexto das páginas dos jogos: o jogo (do cache) e a versão do catálogo"""
+    game = get_game(slug)
+    if game is None:
+        raise Http404('Jogo não encontrado')
+    context = catalog_context()
+    context['game'] = game
+    return context
+
 def chama_espiral_page(request):
     """View para a página do jogo Chama Espiral"""
-    return render(request, 'gamepage/chama_espiral.html')
+    return render(request, 'gamepage/chama_espiral.html', game_page_context('chama-espiral'))
 
 def lilith_view(request):
     """
     View responsável por renderizar a página do jogo Lilith: Search Truth.
     """
-    return render(request, 'gamepage/lilith.html')
-
-def lore_portal(request, fragment_id=1):
-    # --- 1. BANCO DE DADOS (TODOS OS ITENS DESBLOQUEADOS) ---
-    fragments_db = [
-        # --- LORE ---
-        {'id': 1, 'category': 'lore', 'subcategory': 'historia', 'title': "A Origem da Chama", 'type': "Lore / História", 'status': 'unlocked', 'content': "Há milênios, quando as estrelas ainda dançavam em harmonia com a terra, nasceu a Chama Espiral. Não era apenas fogo, mas a própria essência do conhecimento cósmico...", 'related_ids': [10]},
-        {'id': 2, 'category': 'lore', 'subcategory': 'eventos', 'title': "O Grande Eclipse", 'type': "Lore / Eventos", 'status': 'unlocked', 'content': "Durante o Grande Eclipse, a Chama Espiral oscilou pela primeira vez...", 'related_ids': [1]},
-        {'id': 3, 'category': 'lore', 'subcategory': 'cronologia', 'title': "Linha do Tempo Alpha", 'type': "Lore / Cronologia", 'status': 'unlocked', 'content': "Registro temporal da primeira era...", 'related_ids': []},
+    return render(request, 'gamepage/lilith.html', game_page_context('lilith'))
 
-        # --- PERSONAGENS ---
-        {'id': 10, 'category': 'personagens', 'subcategory': 'guardioes', 'title': "Os Guardiões Ancestrais", 'type': "Personagens / Guardiões", 'status': 'unlocked', 'content': "Os primeiros a tocar a chama não foram queimados, mas transformados...", 'related_ids': [20]},
-        {'id': 11, 'category': 'personagens', 'subcategory': 'lideres', 'title': "Rei Kaelthas", 'type': "Personagens / Líderes", 'status': 'unlocked', 'content': "O último rei a unir as tribos sob a luz da Chama...", 'related_ids': []},
-        {'id': 12, 'category': 'personagens', 'subcategory': 'entidades', 'title': "O Observador", 'type': "Personagens / Entidades", 'status': 'unlocked', 'content': "Uma entidade que existe apenas nos reflexos dos espelhos do templo...", 'related_ids': []},
+def lore_map(request, fragment_id=None):
+    """
+    Mapa de constelação dos fragmentos da Chama Espiral. Posições e
+    ligações vêm do layout pré-calculado (get_lore_layout); por requisição
+    só entra o estado de desbloqueio do usuário, lido numa única consulta.
+    """
+    fragments = {fragment['id']: fragment for fragment in LORE_FRAGMENTS}
+    selected_id = fragment_id if fragment_id in fragments else LORE_FRAGMENTS[0]['id']
+    layout = get_lore_layout()
 
-        # --- LOCAIS ---
-        {'id': 20, 'category': 'locais', 'subcategory': 'templos', 'title': "Templo Ancestral", 'type': "Locais / Templos", 'status': 'unlocked', 'content': "No coração da montanha sagrada, o Templo Ancestral foi erguido...", 'related_ids': [1, 10]},
-        {'id': 21, 'category': 'locais', 'subcategory': 'ruinas', 'title': "Ruínas Esquecidas", 'type': "Locais / Ruínas", 'status': 'unlocked', 'content': "Antigas estruturas que precedem até mesmo a Chama...", 'related_ids': []},
-        {'id': 22, 'category': 'locais', 'subcategory': 'santuarios', 'title': "Santuário da Luz", 'type': "Locais / Santuários", 'status': 'unlocked', 'content': "Um local de cura e meditação...", 'related_ids': []},
+    unlocked = unlocked_fragment_ids(request.user)
+    selected = dict(fragments[selected_id], status=fragment_status(fragments[selected_id], unlocked))
 
-        # --- ARTEFATOS ---
-        {'id': 30, 'category': 'artefatos', 'subcategory': 'reliquias', 'title': "Cálice de Fogo", 'type': "Artefatos / Relíquias", 'status': 'unlocked', 'content': "O cálice usado para transportar brasas da chama original...", 'related_ids': []},
-        {'id': 31, 'category': 'artefatos', 'subcategory': 'fragmentos', 'title': "Fragmento Estelar", 'type': "Artefatos / Fragmentos", 'status': 'unlocked', 'content': "Um pedaço de estrela solidificado...", 'related_ids': []},
+    nodes = [
+        {
+            'id': node_id,
+            'title': fragments[node_id]['title'],
+            'pos_left': left,
+            'pos_top': top,
+            'status': fragment_status(fragments[node_id], unlocked),
+            'is_active': node_id == selected_id,
+        }
+        for node_id, left, top in layout['nodes']
+    ]
+    edges = [
+        {
+            'x1': nodes[i]['pos_left'], 'y1': nodes[i]['pos_top'],
+            'x2': nodes[j]['pos_left'], 'y2': nodes[j]['pos_top'],
+            'is_active': selected_id in (nodes[i]['id'], nodes[j]['id']),
+        }
+        for i, j in layout['edges']
+    ]
 
-        # --- GALERIA ---
-        {'id': 40, 'category': 'galeria', 'subcategory': 'concept_art', 'title': "Concept: Templo", 'type': "Galeria / Concept Art", 'status': 'unlocked', 'content': "Esboços originais da arquitetura do templo...", 'related_ids': []},
-        {'id': 41, 'category': 'galeria', 'subcategory': 'ilustracoes', 'title': "Batalha Final", 'type': "Galeria / Ilustrações", 'status': 'unlocked', 'content': "Representação artística da grande guerra...", 'related_ids': []},
+    ids = [node['id'] for node in nodes]
+    next_id = ids[(ids.index(selected_id) + 1) % len(ids)]
 
-        # --- PUZZLES ---
-        {'id': 50, 'category': 'puzzles', 'subcategory': 'facil', 'title': "Enigma da Porta", 'type': "Puzzles / Fácil", 'status': 'unlocked', 'content': "Fale 'amigo' e entre...", 'related_ids': []},
-        {'id': 51, 'category': 'puzzles', 'subcategory': 'medio', 'title': "Torres de Hanoi", 'type': "Puzzles / Médio", 'status': 'unlocked', 'content': "Mova os discos sem colocar um maior sobre um menor...", 'related_ids': []},
-        {'id': 52, 'category': 'puzzles', 'subcategory': 'dificil', 'title': "Cubo do Tempo", 'type': "Puzzles / Difícil", 'status': 'unlocked', 'content': "Alinhe as faces em quatro dimensões...", 'related_ids': []},
+    return render(request, 'gamepage/chama_espiralMap.html', {
+        'fragments': nodes,
+        'edges': edges,
+        'selected': selected,
+        'next_id': next_id,
+    })
 
-        # --- EXTRAS ---
-        {'id': 60, 'category': 'extras', 'subcategory': 'curiosidades', 'title': "Easter Egg #1", 'type': "Extras / Curiosidades", 'status': 'unlocked', 'content': "Os desenvolvedores esconderam suas iniciais nas estrelas...", 'related_ids': []},
-        {'id': 61, 'category': 'extras', 'subcategory': 'referencias', 'title': "Inspirações", 'type': "Extras / Referências", 'status': 'unlocked', 'content': "Baseado em mitologias antigas...", 'related_ids': []},
-    ]
+@read_from_replica
+def lore_portal(request, fragment_id=1):
+    # --- 1. BANCO DE DADOS (TODOS OS ITENS DESBLOQUEADOS) ---
+    fragments_db = LORE_FRAGMENTS
 
     # --- 2. LÓGICA DE SELEÇÃO ---
     try:
@@ -0,0 +1,147 @@
+# app_custom_zenith/warmup.py
+import logging
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.sessions.backends.base import SessionBase
+from django.template.loader import get_template, render_to_string
+from django.test import RequestFactory
+from django.urls import get_resolver, reverse
+
+from .categories import category_registry
+from .invalidation import invalidation_bus
+from .models import DevlogPost
+from .trending import trending_posts
+
+logger = logging.getLogger(__name__)
+
+TEMPLATES_DIR = Path(__file__).resolve().parent / 'templates'
+
+# Páginas públicas mais visitadas logo após um deploy
+WARMUP_VIEWS = ('home', 'devlog', 'lore_portal', 'lore_map')
+
+
+def _request(path='/'):
+    """Requisição anônima para renderizar views sem passar pelos middlewares"""
+    request = RequestFactory().get(path)
+    request.user = AnonymousUser()
+    # Sessão em memória: nada é gravado no banco durante o aquecimento
+    request.session = SessionBase()
+    return request
+
+
+def compile_templates():
+    """Compila os templates do app (o loader com cache guarda o resultado)"""
+    names = sorted(
+        path.relative_to(TEMPLATES_DIR).as_posix()
+        for path in TEMPLATES_DIR.rglob('*.html')
+    )
+    for name in names:
+        get_template(name)
+    return len(names)
+
+
+def prime_url_resolver():
+    """Popula o resolver de URLs, que normalmente só é montado no primeiro reverse()"""
+    resolver = get_resolver()
+    resolver.reverse_dict
+    for name in WARMUP_VIEWS:
+        reverse(name)
+    return len(resolver.reverse_dict)
+
+
+def prime_app_caches():
+    """Registro de categorias, referência do barramento e primeira página do devlog"""
+    from .views import get_cached_devlog_page
+
+    invalidation_bus.check(force=True)
+    categories = category_registry.all()
+
+    posts = DevlogPost.objects.filter(
+        status=DevlogPost.Status.PUBLISHED
+    ).select_related('category', 'author').order_by('-published_at', '-created_at')
+    get_cached_devlog_page(posts, None, 1)
+    for category in categories:
+        get_cached_devlog_page(posts.filter(category__slug=category.slug), category.slug, 1)
+    return len(categories) + 1
+
+
+def prerender_views():
+    """Executa as views públicas uma vez (consultas, templates e filtros)"""
+    from . import views
+
+    for name in WARMUP_VIEWS:
+        getattr(views, name)(_request(reverse(name)))
+    return len(WARMUP_VIEWS)
+
+
+def prerender_posts(limit):
+    """
+    Renderiza a página dos posts mais acessados (em alta e mais recentes)
+    sem contar visualizações. O corpo de cada post fica no cache de
+    fragmentos do template.
+    """
+    from .views import get_base_context
+
+    published = DevlogPost.objects.filter(
+        status=DevlogPost.Status.PUBLISHED
+    ).select_related('author', 'category')
+    posts = {post.id: post for post in trending_posts(limit)}
+    for post in published.order_by('-published_at')[:limit]:
+        if len(posts) >= limit:
+            break
+        posts.setdefault(post.id, post)
+
+    for post in posts.values():
+        request = _request(post.get_absolute_url())
+        context = get_base_context(request)
+        context.update({
+            'post': post,
+            'comments': [],
+            'related_posts': [],
+            'likes_count': 0,
+            'comments_count': 0,
+            'page_title': post.title,
+        })
+        render_to_string('devlog/post_detail.html', context, request)
+    return len(posts)
+
+
+def warm_up(posts=None):
+    """
+    Aquece o worker antes da primeira requisição. Retorna a lista de
+    etapas (nome, itens, segundos).
+    """
+    if posts is None:
+        posts = getattr(settings, 'WARMUP_POSTS', 10)
+
+    steps = (
+        ('templates', compile_templates),
+        ('urls', prime_url_resolver),
+        ('caches', prime_app_caches),
+        ('views', prerender_views),
+        ('posts', lambda: prerender_posts(posts)),
+    )
+    results = []
+    for name, step in steps:
+        start = time.perf_counter()
+        count = step()
+        results.append((name, count, time.perf_counter() - start))
+    return results
+
+
+def warm_up_on_startup():
+    """Chamado pelo wsgi/asgi quando WARMUP_ON_STARTUP está ativo"""
+    if not getattr(settings, 'WARMUP_ON_STARTUP', False):
+        return
+    try:
+        results = warm_up()
+    except Exception:
+        # Um worker frio é melhor que um worker que não sobe
+        logger.exception('Erro no aquecimento do worker')
+        return
+    logger.info('Worker aquecido: ' + ', '.join(
+        f'{name} {count} em {elapsed * 1000:.0f}ms' for name, count, elapsed in results
+    ))
@@ -12,5 +12,12 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'zenithPixels.settings')
+# Streams SSE (post_events) só são servidos sob ASGI
+os.environ.setdefault('REALTIME_ENABLED', 'true')
 
 application = get_asgi_application()
+
+# Aquecimento opcional do worker (WARMUP_ON_STARTUP) antes da primeira requisição
+from app_custom_zenith.warmup import warm_up_on_startup  # noqa: E402
+
+warm_up_on_startup()
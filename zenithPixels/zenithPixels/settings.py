@@ -32,14 +32,27 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'app_custom_zenith.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'app_custom_zenith.middleware.InvalidationMiddleware',
+    'app_custom_zenith.middleware.ReplicaPinningMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Compressão de respostas (gzip/brotli)
+COMPRESSION_MIN_SIZE = 1024  # bytes
+COMPRESSION_EXCLUDED_TYPES = ('text/event-stream',)
+# Tipos comprimidos com brotli; os demais (HTML com token CSRF) usam o gzip com
+# enchimento aleatório do Django (mitigação do BREACH)
+COMPRESSION_BROTLI_TYPES = (
+    'application/json', 'application/feed+json', 'application/rss+xml', 'application/atom+xml',
+    'application/xml', 'text/css', 'text/javascript', 'application/javascript', 'image/svg+xml',
+)
+
 ROOT_URLCONF = 'zenithPixels.urls'
 
 TEMPLATES = [
@@ -63,12 +76,118 @@ WSGI_APPLICATION = 'zenithPixels.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# Configurada por variáveis de ambiente:
+#   DB_ENGINE=postgres  -> PostgreSQL (DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT)
+#   DB_ENGINE=sqlite    -> SQLite ajustado para concorrência (padrão)
+DB_ENGINE = os.environ.get('DB_ENGINE', 'sqlite')
+
+if DB_ENGINE == 'postgres':
+    DB_POOL = os.environ.get('DB_POOL', 'false').lower() in ('1', 'true', 'yes')
+
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DB_NAME', 'zenithpixels'),
+            'USER': os.environ.get('DB_USER', 'postgres'),
+            'PASSWORD': os.environ.get('DB_PASSWORD', ''),
+            'HOST': os.environ.get('DB_HOST', 'localhost'),
+            'PORT': os.environ.get('DB_PORT', '5432'),
+            # Conexões persistentes não podem ser usadas junto com o pool
+            'CONN_MAX_AGE': 0 if DB_POOL else int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {},
+        }
     }
-}
+
+    if DB_POOL:
+        # Pool nativo do Django (requer psycopg 3 com o extra "pool")
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', 2)),
+            'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', 10)),
+            'timeout': int(os.environ.get('DB_POOL_TIMEOUT', 10)),
+        }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('DB_NAME', BASE_DIR / 'db.sqlite3'),
+            'OPTIONS': {
+                # Espera pelo lock em vez de falhar com "database is locked". É a
+                # única configuração da espera: o sqlite3 do Python aplica como
+                # busy_timeout, então o init_command não define outro
+                'timeout': int(os.environ.get('DB_SQLITE_TIMEOUT', 20)),
+                # Pega o lock de escrita no início da transação (evita deadlocks de upgrade)
+                'transaction_mode': 'IMMEDIATE',
+                'init_command': (
+                    'PRAGMA journal_mode=WAL;'
+                    'PRAGMA synchronous=NORMAL;'
+                    'PRAGMA mmap_size=134217728;'
+                ),
+            },
+        }
+    }
+
+# Réplicas de leitura (opcional):
+#   DB_REPLICA_HOST=...  -> réplica PostgreSQL (demais dados iguais ao primário)
+#   DB_REPLICA_NAME=...  -> réplica SQLite local, ex.: cópia de db.sqlite3
+#                           (python manage.py migrate --database=replica)
+DATABASE_REPLICAS = []
+
+if os.environ.get('DB_REPLICA_HOST') or os.environ.get('DB_REPLICA_NAME'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'OPTIONS': dict(DATABASES['default']['OPTIONS']),
+        # Nos testes a réplica espelha o banco padrão
+        'TEST': {'MIRROR': 'default'},
+    }
+    if os.environ.get('DB_REPLICA_HOST'):
+        DATABASES['replica']['HOST'] = os.environ['DB_REPLICA_HOST']
+    if os.environ.get('DB_REPLICA_NAME'):
+        DATABASES['replica']['NAME'] = os.environ['DB_REPLICA_NAME']
+    DATABASE_REPLICAS = ['replica']
+
+DATABASE_ROUTERS = ['app_custom_zenith.db_routers.PrimaryReplicaRouter']
+
+# Segundos em que o usuário lê do primário após escrever (read-your-writes)
+REPLICA_STICKY_SECONDS = 5
+
+# Cache
+# REDIS_URL ativa um cache compartilhado entre os workers; sem ele cada
+# processo usa um cache em memória local.
+REDIS_URL = os.environ.get('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'zenithpixels',
+        }
+    }
+
+# Sessões no cache. Com SESSION_WRITE_THROUGH=true elas também são gravadas
+# no banco (cached_db); é o padrão quando o cache não é compartilhado.
+SESSION_WRITE_THROUGH = os.environ.get(
+    'SESSION_WRITE_THROUGH', 'false' if REDIS_URL else 'true'
+).lower() in ('1', 'true', 'yes')
+
+if SESSION_WRITE_THROUGH:
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+else:
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
+
+# Usuário autenticado (e perfil) servido do cache
+AUTHENTICATION_BACKENDS = ['app_custom_zenith.backends.CachedModelBackend']
+USER_CACHE_TIMEOUT = 300  # segundos
+
+# Intervalo mínimo entre gravações de last_login de um mesmo usuário
+LAST_LOGIN_UPDATE_INTERVAL = 15 * 60  # segundos
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -90,6 +209,24 @@ AUTH_PASSWORD_VALIDATORS = [
 
 
 
+# Hashing de senhas em um pool limitado (0 = executa na thread da requisição)
+PASSWORD_HASHING_WORKERS = int(os.environ.get('PASSWORD_HASHING_WORKERS', 4))
+PASSWORD_HASHING_QUEUE_SIZE = int(os.environ.get('PASSWORD_HASHING_QUEUE_SIZE', 16))
+
+# Limite de tentativas de login
+LOGIN_THROTTLE_WINDOW = 300  # segundos
+LOGIN_THROTTLE_IP_LIMIT = 30  # tentativas por IP na janela
+LOGIN_THROTTLE_ACCOUNT_LIMIT = 5  # falhas por conta e IP na janela
+
+# Limite da verificação de disponibilidade do cadastro (email, telefone, username)
+AVAILABILITY_THROTTLE_LIMIT = 30  # consultas por IP na janela
+AVAILABILITY_THROTTLE_WINDOW = 60  # segundos
+
+# Proxies reversos (IPs ou redes, ex.: "127.0.0.1,10.0.0.0/8") cujo X-Forwarded-For é
+# usado para descobrir o IP do cliente (throttling); vazio = usa REMOTE_ADDR
+TRUSTED_PROXIES = [proxy for proxy in os.environ.get('TRUSTED_PROXIES', '').split(',') if proxy.strip()]
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -111,7 +248,101 @@ STATIC_URL = '/static/'
 STATICFILES_DIRS = [
     os.path.join(BASE_DIR, 'static'),
 ]
+STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')  # destino do collectstatic
+
+# Uploads gravados pelo hash do conteúdo (imagens iguais ocupam um único arquivo)
+STORAGES = {
+    'default': {'BACKEND': 'app_custom_zenith.storage.ContentAddressedStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+MEDIA_GC_GRACE = 24 * 60 * 60  # segundos; arquivos mais novos não são removidos (python manage.py gc_media)
+
+# Uploads de imagens validados durante o recebimento (app_custom_zenith.uploads)
+FILE_UPLOAD_HANDLERS = [
+    'app_custom_zenith.uploads.ImageUploadHandler',
+    'django.core.files.uploadhandler.MemoryFileUploadHandler',
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
+UPLOAD_MAX_IMAGE_BYTES = 5 * 1024 * 1024
+UPLOAD_MAX_IMAGE_PIXELS = 4096 * 4096
+UPLOAD_SNIFF_BYTES = 256 * 1024  # bytes lidos no máximo para achar as dimensões
+UPLOAD_PROGRESS_TIMEOUT = 5 * 60  # segundos que o progresso fica consultável (no cache padrão: com LocMem, só no worker do upload)
+
+# Placeholder das imagens enviadas (python manage.py backfill_image_metadata para as antigas)
+IMAGE_PLACEHOLDER_SIZE = 16  # pixels do maior lado da miniatura borrada
+
+# Variantes das artes de static/img para a tag {% picture %} (python manage.py build_image_variants)
+IMAGE_VARIANT_WIDTHS = (320, 640, 960, 1280, 1920)  # larguras geradas, limitadas à do original
+IMAGE_VARIANTS_DIR = 'variants'  # subpasta de static/img com as variantes e o manifest.json
+
+# Fragmentos da equipe e dos jogos (home e páginas dos jogos), invalidados ao salvar no admin
+CATALOG_CACHE_TIMEOUT = 24 * 60 * 60  # segundos
+
+# Mapa de constelação da lore (layout pré-calculado por python manage.py build_lore_map
+# a cada mudança de ids ou ligações em lore.py; rode de novo se mudar os valores abaixo)
+LORE_MAP_PATH = os.path.join(BASE_DIR, 'app_custom_zenith', 'lore_layout.json')
+LORE_MAP_ITERATIONS = 200  # passos do relaxamento por forças
+LORE_MAP_MARGIN = 8  # porcentagem livre nas bordas do mapa
+
+# Entrega de mídia/estáticos (app_custom_zenith.fileserving):
+#   django     -> o próprio Django serve (sendfile via wsgi.file_wrapper, ranges, .br/.gz)
+#   x-accel    -> nginx transfere o arquivo (location interna MEDIA_ACCEL_PREFIX + media|static)
+#   x-sendfile -> Apache/lighttpd com mod_xsendfile
+MEDIA_SERVE_MODE = os.environ.get('MEDIA_SERVE_MODE', 'django')
+MEDIA_ACCEL_PREFIX = '/_protected/'
+MEDIA_MAX_AGE = 24 * 60 * 60  # segundos
+STATIC_MAX_AGE = 7 * 24 * 60 * 60  # segundos
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Comentários: tamanho do lote usado no modo streaming de get_comments
+COMMENTS_STREAM_CHUNK_SIZE = 200
+
+# Atualizações ao vivo (SSE) de curtidas e comentários. Só funcionam sob ASGI
+# (o asgi.py liga REALTIME_ENABLED): sob WSGI cada stream prenderia um worker
+# para sempre. O InProcessBroker só alcança os leitores do mesmo processo;
+# com mais de um worker ASGI use um broker compartilhado.
+REALTIME_ENABLED = os.environ.get('REALTIME_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+REALTIME_BROKER = 'app_custom_zenith.realtime.InProcessBroker'
+REALTIME_COALESCE_INTERVAL = 0.5  # segundos entre eventos agrupados
+REALTIME_HEARTBEAT = 15  # segundos
+
+# Fila de tarefas em segundo plano (python manage.py run_tasks)
+TASK_MAX_ATTEMPTS = 5
+TASK_RETRY_BACKOFF = 30  # segundos; dobra a cada nova tentativa
+TASK_LOCK_TIMEOUT = 10 * 60  # segundos até uma tarefa travada voltar para a fila
+TASK_POLL_INTERVAL = 2  # segundos entre verificações do worker
+
+# Posts agendados (python manage.py publish_scheduled) e cache da listagem/feeds
+SCHEDULED_PUBLISH_INTERVAL = 30  # segundos entre verificações do agendador
+FEED_CACHE_TIMEOUT = 60 * 60  # segundos; publicar ou editar invalida antes
+
+# Feeds RSS/Atom/JSON do devlog
+FEED_MAX_ITEMS = 30
+FEED_MAX_AGE = 5 * 60  # segundos que leitores podem reutilizar o feed sem revalidar
+
+# Sitemap (python manage.py build_sitemaps; também atualizado pelo worker após edições)
+SITE_URL = os.environ.get('SITE_URL', 'http://localhost:8000')
+SITEMAP_ROOT = os.path.join(BASE_DIR, 'sitemaps')
+SITEMAP_CHUNK_SIZE = 5000  # faixa de ids de posts por arquivo
+SITEMAP_REBUILD_DELAY = 60  # segundos; edições nesse intervalo geram uma única atualização
+
+# Posts relacionados pré-calculados (python manage.py rebuild_related_posts)
+RELATED_POSTS_COUNT = 6  # vizinhos guardados por post
+RELATED_POSTS_CATEGORY_BONUS = 0.1  # somado à similaridade de posts da mesma categoria
+
+# Posts em alta: pontuação com decaimento exponencial (python manage.py decay_trending)
+TRENDING_EVENT_WEIGHTS = {'view': 1, 'like': 5, 'comment': 8}
+TRENDING_HALF_LIFE = 24 * 60 * 60  # segundos para a pontuação cair pela metade
+TRENDING_DECAY_INTERVAL = 5 * 60  # segundos entre execuções do decaimento
+TRENDING_MIN_SCORE = 0.01  # pontuações menores são removidas da tabela
+TRENDING_HOME_COUNT = 3  # posts no widget da página inicial
+
+# Barramento de invalidação dos caches em memória (categorias, etc.) entre workers
+INVALIDATION_CHECK_INTERVAL = 2  # segundos; defasagem máxima entre workers
+
+# Aquecimento dos workers: templates, URLs, caches e posts mais acessados (python manage.py warm_up)
+WARMUP_ON_STARTUP = os.environ.get('WARMUP_ON_STARTUP', 'false').lower() in ('1', 'true', 'yes')
+WARMUP_POSTS = 10  # posts pré-renderizados no aquecimento
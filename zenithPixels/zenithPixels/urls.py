@@ -1,7 +1,5 @@
 from django.contrib import admin
 from django.urls import path
-from django.conf.urls.static import static
-from django.conf import settings
 from app_custom_zenith.views import (
     home, 
     devlog, 
@@ -27,7 +25,14 @@ from app_custom_zenith.views import (
     lilith_view,
     chama_espiral_page,
     lore_portal, 
+    lore_map,
+    registration_availability,
+    upload_progress,
+    post_events,
 )
+from app_custom_zenith.feeds import devlog_feed
+from app_custom_zenith.sitemaps import sitemap_index, sitemap_section
+from app_custom_zenith.fileserving import file_urlpatterns
 
 urlpatterns = [
     # Página inicial
@@ -37,6 +42,8 @@ urlpatterns = [
     path('chama_espiral/', chama_espiral_page, name='chama_espiral'),
     path('chama-espiral/lore/', lore_portal, name='lore_portal'),
     path('chama-espiral/lore/<int:fragment_id>/', lore_portal, name='lore_detail'),
+    path('chama-espiral/mapa/', lore_map, name='lore_map'),
+    path('chama-espiral/mapa/<int:fragment_id>/', lore_map, name='lore_map_detail'),
     
     # Rota do Lilith
     path('games/lilith/', lilith_view, name='lilith_page'),
@@ -48,6 +55,8 @@ urlpatterns = [
     # Cadastro
     path('cadastro/', cadastro_usuario, name='cadastro_usuario'),
     path('cadastro/etapa2/', cadastro_usuario, name='cadastro_etapa2'),
+    path('api/cadastro/disponibilidade/', registration_availability, name='registration_availability'),
+    path('api/upload/progresso/', upload_progress, name='upload_progress'),
     
     # Perfil
     path('profile/', profile, name='profile'),
@@ -57,6 +66,10 @@ urlpatterns = [
     # Notícias/Devlog
     path('noticias/', devlog, name='devlog'),
     path('noticias/criar/', create_devlog_post, name='create_devlog_post'),
+    
+    # Feeds (feed_format: rss, atom ou json)
+    path('noticias/feed/<str:feed_format>/', devlog_feed, name='devlog_feed'),
+    path('noticias/categoria/<slug:category_slug>/feed/<str:feed_format>/', devlog_feed, name='devlog_category_feed'),
     path('noticias/editar/<slug:slug>/', edit_devlog_post, name='edit_devlog_post'),
     path('noticias/excluir/<slug:slug>/', delete_devlog_post, name='delete_devlog_post'),
     path('noticias/<slug:slug>/', devlog_post_detail, name='devlog_post_detail'),
@@ -68,6 +81,7 @@ urlpatterns = [
     path('api/post/<int:post_id>/like/', like_post, name='like_post'),
     path('api/post/<int:post_id>/share/', share_post, name='share_post'),
     path('api/post/<int:post_id>/comments/', get_comments, name='get_comments'),
+    path('api/post/<int:post_id>/events/', post_events, name='post_events'),
     
     # API - Moderação
     path('api/comment/<int:comment_id>/delete/', delete_comment, name='delete_comment'),
@@ -75,6 +89,10 @@ urlpatterns = [
     path('api/post/<int:post_id>/publish/', publish_post, name='publish_post'),
     path('api/post/<int:post_id>/archive/', archive_post, name='archive_post'),
     
+    # Sitemap (arquivos gerados por build_sitemaps / worker de tarefas)
+    path('sitemap.xml', sitemap_index, name='sitemap_index'),
+    path('sitemaps/<slug:name>.xml', sitemap_section, name='sitemap_section'),
+    
     # Funcionalidades
     path('toggle-theme/', toggle_theme, name='toggle_theme'),
     
@@ -82,6 +100,6 @@ urlpatterns = [
     path('admin/', admin.site.urls),
 ]
 
-if settings.DEBUG:
-    urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+# Mídia e estáticos: em produção o nginx/Apache transfere os arquivos
+# (MEDIA_SERVE_MODE); sem servidor na frente o Django serve com sendfile e ranges
+urlpatterns += file_urlpatterns()
\ No newline at end of file
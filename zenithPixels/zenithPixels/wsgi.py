@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'zenithPixels.settings')
 
 application = get_wsgi_application()
+
+# Aquecimento opcional do worker (WARMUP_ON_STARTUP) antes da primeira requisição
+from app_custom_zenith.warmup import warm_up_on_startup  # noqa: E402
+
+warm_up_on_startup()